@@ -23,8 +23,14 @@ if config.config_file_name is not None:
 from app.core.config import settings
 from app.core.db import Base
 
+from app.infra.persistence.models.entity_state import EntityState
 from app.infra.persistence.models.event import Event
+from app.infra.persistence.models.event_retention_watermark import EventRetentionWatermark
+from app.infra.persistence.models.event_rollup import EventRollup
+from app.infra.persistence.models.event_sketch import EventSketch
 from app.infra.persistence.models.outbox import OutboxMessage
+from app.infra.persistence.models.outbox_archive import OutboxArchivedMessage
+from app.infra.persistence.models.outbox_dead_letter import OutboxDeadLetter
 target_metadata = Base.metadata
 
 
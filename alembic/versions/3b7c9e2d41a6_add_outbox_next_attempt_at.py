@@ -0,0 +1,37 @@
+"""add outbox next_attempt_at
+
+Revision ID: 3b7c9e2d41a6
+Revises: fde5a468e49a
+Create Date: 2026-10-19 09:12:41.508113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7c9e2d41a6'
+down_revision: Union[str, None] = 'fde5a468e49a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows become due immediately; new rows get an explicit value from the application.
+    op.add_column(
+        'outbox_messages',
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        'ix_outbox_messages_status_next_attempt_at',
+        'outbox_messages',
+        ['status', 'next_attempt_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_messages_status_next_attempt_at', table_name='outbox_messages')
+    op.drop_column('outbox_messages', 'next_attempt_at')
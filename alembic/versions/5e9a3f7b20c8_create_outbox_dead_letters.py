@@ -0,0 +1,58 @@
+"""create outbox dead letters
+
+Revision ID: 5e9a3f7b20c8
+Revises: c41e08b9a7d2
+Create Date: 2026-10-19 12:48:53.380215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9a3f7b20c8'
+down_revision: Union[str, None] = 'c41e08b9a7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('outbox_messages', sa.Column('last_error', sa.Text(), nullable=True))
+    op.add_column('outbox_messages_archive', sa.Column('last_error', sa.Text(), nullable=True))
+    op.create_table('outbox_dead_letters',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('topic', sa.Text(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_attempt_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('dead_lettered_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_dead_letters_topic_dead_lettered_at', 'outbox_dead_letters', ['topic', 'dead_lettered_at'], unique=False)
+
+    # Messages previously flagged as failed move to the dead-letter table.
+    op.execute(
+        "INSERT INTO outbox_dead_letters "
+        "(id, topic, payload, attempts, last_error, created_at, last_attempt_at, dead_lettered_at) "
+        "SELECT id, topic, payload, attempts, NULL, created_at, next_attempt_at, now() "
+        "FROM outbox_messages WHERE status = 'failed'"
+    )
+    op.execute("DELETE FROM outbox_messages WHERE status = 'failed'")
+
+
+def downgrade() -> None:
+    op.execute(
+        "INSERT INTO outbox_messages "
+        "(id, topic, payload, status, attempts, next_attempt_at, published_at, created_at) "
+        "SELECT id, topic, payload, 'failed', attempts, last_attempt_at, NULL, created_at "
+        "FROM outbox_dead_letters"
+    )
+    op.drop_index('ix_outbox_dead_letters_topic_dead_lettered_at', table_name='outbox_dead_letters')
+    op.drop_table('outbox_dead_letters')
+    op.drop_column('outbox_messages_archive', 'last_error')
+    op.drop_column('outbox_messages', 'last_error')
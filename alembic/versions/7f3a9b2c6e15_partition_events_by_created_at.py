@@ -0,0 +1,111 @@
+"""partition events by created_at
+
+Revision ID: 7f3a9b2c6e15
+Revises: e2b8d6c47f19
+Create Date: 2026-10-19 16:42:10.518337
+
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3a9b2c6e15'
+down_revision: Union[str, None] = 'e2b8d6c47f19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EVENT_INDEXES = {
+    'ix_events_service': ['service'],
+    'ix_events_source_event_id': ['source_event_id'],
+    'ix_events_deduplication_key': ['deduplication_key'],
+}
+
+
+def _event_columns():
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('service', sa.Text(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('normalized_payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('source_event_id', sa.UUID(), nullable=True),
+        sa.Column('deduplication_key', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    ]
+
+
+def _legacy_boundary() -> datetime:
+    # End of tomorrow (UTC): the CHECK constraint below already applies to inserts while
+    # the rest of the migration runs, so leave at least a day of headroom.
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return today + timedelta(days=2)
+
+
+def upgrade() -> None:
+    # The existing table becomes the first partition, covering everything up to the
+    # boundary, so no rows are copied. Partitions are named after their UTC start date.
+    # Once its newest rows pass EVENTS_RETENTION_DAYS the partition manager expires all
+    # pre-migration history at once, as this single partition.
+    boundary = _legacy_boundary().isoformat()
+
+    # With a validated constraint matching the partition bound, ATTACH PARTITION skips
+    # scanning the table. Validating in its own transaction only takes a SHARE UPDATE
+    # EXCLUSIVE lock, so ingest keeps writing during the scan.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "ALTER TABLE events ADD CONSTRAINT events_legacy_created_at_check "
+            f"CHECK (created_at < '{boundary}') NOT VALID"
+        )
+        op.execute("ALTER TABLE events VALIDATE CONSTRAINT events_legacy_created_at_check")
+
+    op.execute("SET LOCAL TIME ZONE 'UTC'")
+    op.execute("ALTER TABLE events RENAME TO events_legacy")
+    op.execute("ALTER TABLE events_legacy DROP CONSTRAINT events_pkey")
+    # Renamed rather than dropped: ATTACH PARTITION adopts matching indexes instead of
+    # rebuilding them.
+    for name in EVENT_INDEXES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name.replace('ix_events', 'ix_events_legacy')}")
+
+    # A primary key on a partitioned table has to include the partition key.
+    op.create_table('events',
+    *_event_columns(),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)',
+    )
+    for name, columns in EVENT_INDEXES.items():
+        op.create_index(name, 'events', columns, unique=False)
+    op.create_index('ix_events_created_at', 'events', ['created_at'], unique=False)
+
+    op.execute(f"""
+        DO $$
+        DECLARE
+            boundary timestamptz := '{boundary}';
+            day_start timestamptz;
+        BEGIN
+            EXECUTE 'ALTER TABLE events ATTACH PARTITION events_legacy '
+                || 'FOR VALUES FROM (MINVALUE) TO (' || quote_literal(boundary) || ')';
+            FOR i IN 0..7 LOOP
+                day_start := boundary + i * interval '1 day';
+                EXECUTE 'CREATE TABLE ' || quote_ident('events_p' || to_char(day_start, 'YYYYMMDD'))
+                    || ' PARTITION OF events FOR VALUES FROM (' || quote_literal(day_start)
+                    || ') TO (' || quote_literal(day_start + interval '1 day') || ')';
+            END LOOP;
+        END $$;
+    """)
+    # Rows past the newest partition land here instead of failing to insert.
+    op.execute("CREATE TABLE events_default PARTITION OF events DEFAULT")
+
+
+def downgrade() -> None:
+    op.create_table('events_unpartitioned', *_event_columns())
+    op.execute("INSERT INTO events_unpartitioned SELECT * FROM events")
+    op.drop_table('events')
+    op.rename_table('events_unpartitioned', 'events')
+    op.create_primary_key('events_pkey', 'events', ['id'])
+    for name, columns in EVENT_INDEXES.items():
+        op.create_index(name, 'events', columns, unique=False)
@@ -0,0 +1,48 @@
+"""outbox partial pending index
+
+Revision ID: 8d2f6a1c57e3
+Revises: 3b7c9e2d41a6
+Create Date: 2026-10-19 10:03:17.226904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f6a1c57e3'
+down_revision: Union[str, None] = '3b7c9e2d41a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The worker polls "status = 'pending' AND next_attempt_at <= now ORDER BY next_attempt_at, created_at".
+    # A partial index over pending rows serves that query directly and never contains sent rows.
+    op.create_index(
+        'ix_outbox_messages_pending_due',
+        'outbox_messages',
+        ['next_attempt_at', 'created_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    # None of these are used by any query, but every insert and status update pays for them.
+    op.drop_index('ix_outbox_messages_status_next_attempt_at', table_name='outbox_messages')
+    op.drop_index(op.f('ix_outbox_messages_status'), table_name='outbox_messages')
+    op.drop_index(op.f('ix_outbox_messages_attempts'), table_name='outbox_messages')
+    op.drop_index(op.f('ix_outbox_messages_topic'), table_name='outbox_messages')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_outbox_messages_topic'), 'outbox_messages', ['topic'], unique=False)
+    op.create_index(op.f('ix_outbox_messages_attempts'), 'outbox_messages', ['attempts'], unique=False)
+    op.create_index(op.f('ix_outbox_messages_status'), 'outbox_messages', ['status'], unique=False)
+    op.create_index(
+        'ix_outbox_messages_status_next_attempt_at',
+        'outbox_messages',
+        ['status', 'next_attempt_at'],
+        unique=False,
+    )
+    op.drop_index('ix_outbox_messages_pending_due', table_name='outbox_messages')
@@ -0,0 +1,37 @@
+"""create event rollups
+
+Revision ID: a3d9f5c21b70
+Revises: f1c6b84a9e37
+Create Date: 2026-10-19 21:05:37.512904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9f5c21b70'
+down_revision: Union[str, None] = 'f1c6b84a9e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('event_rollups',
+    sa.Column('service', sa.Text(), nullable=False),
+    sa.Column('bucket_seconds', sa.Integer(), nullable=False),
+    sa.Column('key', sa.Text(), nullable=False),
+    sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.Column('value_count', sa.BigInteger(), nullable=False),
+    sa.Column('value_sum', sa.Double(), nullable=False),
+    sa.Column('value_min', sa.Double(), nullable=True),
+    sa.Column('value_max', sa.Double(), nullable=True),
+    sa.PrimaryKeyConstraint('service', 'bucket_seconds', 'key', 'bucket')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('event_rollups')
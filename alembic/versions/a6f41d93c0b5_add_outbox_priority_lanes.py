@@ -0,0 +1,46 @@
+"""add outbox priority lanes
+
+Revision ID: a6f41d93c0b5
+Revises: 5e9a3f7b20c8
+Create Date: 2026-10-19 14:05:32.671940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6f41d93c0b5'
+down_revision: Union[str, None] = '5e9a3f7b20c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing messages land in the normal lane (Priority.NORMAL == 1).
+    for table in ('outbox_messages', 'outbox_messages_archive', 'outbox_dead_letters'):
+        op.add_column(table, sa.Column('priority', sa.SmallInteger(), server_default='1', nullable=False))
+
+    op.drop_index('ix_outbox_messages_pending_due', table_name='outbox_messages')
+    op.create_index(
+        'ix_outbox_messages_pending_due',
+        'outbox_messages',
+        ['priority', 'next_attempt_at', 'created_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_messages_pending_due', table_name='outbox_messages')
+    op.create_index(
+        'ix_outbox_messages_pending_due',
+        'outbox_messages',
+        ['next_attempt_at', 'created_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    for table in ('outbox_dead_letters', 'outbox_messages_archive', 'outbox_messages'):
+        op.drop_column(table, 'priority')
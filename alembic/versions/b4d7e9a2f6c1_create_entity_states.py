@@ -0,0 +1,35 @@
+"""create entity states
+
+Revision ID: b4d7e9a2f6c1
+Revises: e8b1f4a6c2d9
+Create Date: 2026-10-19 23:48:12.381905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d7e9a2f6c1'
+down_revision: Union[str, None] = 'e8b1f4a6c2d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('entity_states',
+    sa.Column('service', sa.Text(), nullable=False),
+    sa.Column('entity_key', sa.Text(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('event_id', sa.UUID(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('service', 'entity_key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('entity_states')
@@ -0,0 +1,41 @@
+"""events keyset indexes
+
+Revision ID: b8e4c2a9d713
+Revises: 7f3a9b2c6e15
+Create Date: 2026-10-19 17:35:02.264819
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4c2a9d713'
+down_revision: Union[str, None] = '7f3a9b2c6e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SINGLE_COLUMN_INDEXES = {
+    'ix_events_created_at': 'created_at',
+    'ix_events_service': 'service',
+    'ix_events_source_event_id': 'source_event_id',
+    'ix_events_deduplication_key': 'deduplication_key',
+}
+
+
+def upgrade() -> None:
+    op.create_index('ix_events_created_at_id', 'events', ['created_at', 'id'], unique=False)
+    for column in ('service', 'source_event_id', 'deduplication_key'):
+        op.create_index(f'ix_events_{column}_created_at_id', 'events', [column, 'created_at', 'id'], unique=False)
+    for name in SINGLE_COLUMN_INDEXES:
+        op.drop_index(name, table_name='events')
+
+
+def downgrade() -> None:
+    for name, column in SINGLE_COLUMN_INDEXES.items():
+        op.create_index(name, 'events', [column], unique=False)
+    for column in ('service', 'source_event_id', 'deduplication_key'):
+        op.drop_index(f'ix_events_{column}_created_at_id', table_name='events')
+    op.drop_index('ix_events_created_at_id', table_name='events')
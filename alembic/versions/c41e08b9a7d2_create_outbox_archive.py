@@ -0,0 +1,48 @@
+"""create outbox archive
+
+Revision ID: c41e08b9a7d2
+Revises: 8d2f6a1c57e3
+Create Date: 2026-10-19 11:26:05.913472
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e08b9a7d2'
+down_revision: Union[str, None] = '8d2f6a1c57e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox_messages_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('topic', sa.Text(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('status', sa.Text(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_messages_archive_topic_created_at', 'outbox_messages_archive', ['topic', 'created_at'], unique=False)
+    op.create_index(
+        'ix_outbox_messages_done_created_at',
+        'outbox_messages',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status <> 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_messages_done_created_at', table_name='outbox_messages')
+    op.drop_index('ix_outbox_messages_archive_topic_created_at', table_name='outbox_messages_archive')
+    op.drop_table('outbox_messages_archive')
@@ -0,0 +1,36 @@
+"""create event sketches
+
+Revision ID: c6e2a8d49f13
+Revises: a3d9f5c21b70
+Create Date: 2026-10-19 21:48:09.227651
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e2a8d49f13'
+down_revision: Union[str, None] = 'a3d9f5c21b70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('event_sketches',
+    sa.Column('service', sa.Text(), nullable=False),
+    sa.Column('kind', sa.Text(), nullable=False),
+    sa.Column('field', sa.Text(), nullable=False),
+    sa.Column('bucket_seconds', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('replica', sa.Text(), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('service', 'kind', 'field', 'bucket_seconds', 'bucket', 'replica')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('event_sketches')
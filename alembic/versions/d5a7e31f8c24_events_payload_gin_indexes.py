@@ -0,0 +1,38 @@
+"""events payload gin indexes
+
+Revision ID: d5a7e31f8c24
+Revises: b8e4c2a9d713
+Create Date: 2026-10-19 18:52:47.731905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a7e31f8c24'
+down_revision: Union[str, None] = 'b8e4c2a9d713'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SERVICES = ('energy', 'health', 'transport', 'security')
+
+
+def upgrade() -> None:
+    for service in SERVICES:
+        op.create_index(
+            f'ix_events_{service}_normalized_payload',
+            'events',
+            ['normalized_payload'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'normalized_payload': 'jsonb_path_ops'},
+            postgresql_where=sa.text(f"service = '{service}'"),
+        )
+
+
+def downgrade() -> None:
+    for service in SERVICES:
+        op.drop_index(f'ix_events_{service}_normalized_payload', table_name='events')
@@ -0,0 +1,39 @@
+"""add outbox coalescing
+
+Revision ID: e2b8d6c47f19
+Revises: a6f41d93c0b5
+Create Date: 2026-10-19 15:21:48.104276
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8d6c47f19'
+down_revision: Union[str, None] = 'a6f41d93c0b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('outbox_messages', 'outbox_messages_archive', 'outbox_dead_letters'):
+        op.add_column(table, sa.Column('dedup_key', sa.Text(), nullable=True))
+        op.add_column(table, sa.Column('coalesced_count', sa.Integer(), server_default='1', nullable=False))
+
+    op.create_index(
+        'ix_outbox_messages_pending_dedup_key',
+        'outbox_messages',
+        ['topic', 'dedup_key'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending' AND dedup_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_messages_pending_dedup_key', table_name='outbox_messages')
+    for table in ('outbox_dead_letters', 'outbox_messages_archive', 'outbox_messages'):
+        op.drop_column(table, 'coalesced_count')
+        op.drop_column(table, 'dedup_key')
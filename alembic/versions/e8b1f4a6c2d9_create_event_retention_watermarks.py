@@ -0,0 +1,30 @@
+"""create event retention watermarks
+
+Revision ID: e8b1f4a6c2d9
+Revises: c6e2a8d49f13
+Create Date: 2026-10-19 22:31:54.604118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b1f4a6c2d9'
+down_revision: Union[str, None] = 'c6e2a8d49f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('event_retention_watermarks',
+    sa.Column('service', sa.Text(), nullable=False),
+    sa.Column('processed_until', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('service')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('event_retention_watermarks')
@@ -0,0 +1,33 @@
+"""events payload nullable
+
+Revision ID: f1c6b84a9e37
+Revises: d5a7e31f8c24
+Create Date: 2026-10-19 19:40:13.084562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c6b84a9e37'
+down_revision: Union[str, None] = 'd5a7e31f8c24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows keep both copies; only new events are stored compactly.
+    op.alter_column('events', 'payload',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("UPDATE events SET payload = normalized_payload WHERE payload IS NULL")
+    op.alter_column('events', 'payload',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               nullable=False)
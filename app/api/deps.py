@@ -0,0 +1,36 @@
+import re
+import time
+
+from fastapi import Header, HTTPException
+
+from app.core.config import settings
+from app.core.db import ReadSessionLocal, SessionLocal, engine, read_engine, replica_caught_up
+
+LSN_PATTERN = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+LSN_POLL_SECONDS = 0.05
+
+
+def get_read_db(x_min_lsn: str | None = Header(default=None)):
+    """Session on the read replica.
+
+    A client that sends the ``X-Commit-LSN`` of its own write back as ``X-Min-LSN``
+    is served by the replica once it has replayed that far, or by the primary if it
+    has not within ``READ_YOUR_WRITES_TIMEOUT_SECONDS``.
+    """
+    if x_min_lsn is not None and not LSN_PATTERN.match(x_min_lsn):
+        raise HTTPException(status_code=400, detail=f"Invalid X-Min-LSN {x_min_lsn!r}")
+
+    db = ReadSessionLocal()
+    if x_min_lsn and read_engine is not engine:
+        deadline = time.monotonic() + settings.READ_YOUR_WRITES_TIMEOUT_SECONDS
+        while not replica_caught_up(db, x_min_lsn):
+            db.rollback()
+            if time.monotonic() >= deadline:
+                db.close()
+                db = SessionLocal()
+                break
+            time.sleep(LSN_POLL_SECONDS)
+    try:
+        yield db
+    finally:
+        db.close()
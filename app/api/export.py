@@ -0,0 +1,65 @@
+import csv
+import io
+import os
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+from app.api.schemas import EventOut
+from app.core.serialization import json_dumps
+
+EXPORT_BATCH_SIZE = int(os.getenv("EVENTS_EXPORT_BATCH_SIZE", "1000"))
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+CSV_COLUMNS = list(EventOut.model_fields)
+
+
+def _ndjson_rows(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json_dumps(row) + "\n"
+
+
+def _csv_value(value):
+    if isinstance(value, dict):
+        return json_dumps(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_rows(rows: Iterable[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for row in rows:
+        writer.writerow([_csv_value(row[column]) for column in CSV_COLUMNS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def stream_export(db: Session, query: Select, fmt: str, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """Stream the rows of ``query`` as NDJSON or CSV text chunks.
+
+    Rows are fetched ``batch_size`` at a time through a server-side cursor and each
+    chunk holds one batch, so memory use does not grow with the size of the export.
+    The session is closed once the stream ends or the client disconnects.
+    """
+    lines = _ndjson_rows if fmt == "ndjson" else _csv_rows
+    try:
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        chunk = []
+        for line in lines(dict(row._mapping) for row in result):
+            chunk.append(line)
+            if len(chunk) >= batch_size:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
+    finally:
+        db.close()
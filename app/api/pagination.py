@@ -0,0 +1,37 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Tuple
+
+from sqlalchemy import Select, tuple_
+
+from app.infra.persistence.models.event import Event
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, event_id: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(event_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, event_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(event_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor {cursor!r}") from e
+
+
+def after_cursor(query: Select, cursor: str | None) -> Select:
+    """Order ``query`` newest first by (created_at, id) and start it after ``cursor``.
+
+    The row-value comparison is served by an index on (created_at, id), so every page
+    costs the same however deep it is.
+    """
+    if cursor:
+        created_at, event_id = decode_cursor(cursor)
+        query = query.where(tuple_(Event.created_at, Event.id) < tuple_(created_at, event_id))
+    return query.order_by(Event.created_at.desc(), Event.id.desc())
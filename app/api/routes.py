@@ -1,13 +1,27 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+import uuid
+from datetime import datetime
+from typing import List, Literal
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 
+from app.application.field_query import payload_filter
 from app.application.ingest import ingest_event
-from app.core.db import get_db
-from app.api.schemas import EventOut, IngestResponse
+from app.application.lineage import get_lineage
+from app.application.rollups import query_rollups
+from app.application.sketches import DISTINCT_FIELDS, TOP_FIELDS, distinct_count, top_items
+from app.core.config import settings
+from app.api.deps import get_read_db
+from app.core.db import current_lsn, engine, get_db, pool_stats, read_engine
+from app.core.serialization import json_dumps_bytes
+from app.api.export import MEDIA_TYPES, stream_export
+from app.api.pagination import NEXT_CURSOR_HEADER, after_cursor, encode_cursor
+from app.api.schemas import DistinctCountOut, EventLineageOut, EventOut, IngestResponse, StatsBucketOut, TopItemOut
+from app.infra.outbox.relay import RELAY_ENABLED, OutboxRelay
 from app.infra.persistence.models.event import Event
 
+COMMIT_LSN_HEADER = "X-Commit-LSN"
 
 router = APIRouter()
 
@@ -16,32 +30,209 @@ def health_check():
     return {"status": "ok"}
 
 
+@router.get("/health/db")
+def database_health():
+    pools = {"primary": pool_stats(engine)}
+    if read_engine is not engine:
+        pools["read"] = pool_stats(read_engine)
+    return pools
+
+
 @router.post("/ingest/{service}", response_model=IngestResponse)
 def ingest(
     service: str,
     payload: dict,
+    background_tasks: BackgroundTasks,
+    response: Response,
     db: Session = Depends(get_db),
     dedupe_key: str | None = None,
 ) -> IngestResponse:
+    relay = OutboxRelay(background_tasks.add_task) if RELAY_ENABLED else None
     try:
-        base, derived_events = ingest_event(service, payload, db, dedupe_key)
+        base, derived_events = ingest_event(service, payload, db, dedupe_key, relay=relay)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    # Sent back as X-Min-LSN, this lets the client read its own write from the replica.
+    lsn = current_lsn(db) if settings.DATABASE_READ_URL else None
+    if lsn:
+        response.headers[COMMIT_LSN_HEADER] = lsn
+
     return IngestResponse(
-        stored_event_id=base.id,
+        stored_event_id=base.id if base is not None else None,
         derived_events=[event.id for event in derived_events],
     )
 
 
+def _filter_events(
+    query: Select,
+    service: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    source_event_id: uuid.UUID | None = None,
+    deduplication_key: str | None = None,
+) -> Select:
+    if service:
+        query = query.where(Event.service == service)
+    # Bounds on created_at, the partition key, let PostgreSQL skip partitions outside the window.
+    if since:
+        query = query.where(Event.created_at >= since)
+    if until:
+        query = query.where(Event.created_at < until)
+    if source_event_id:
+        query = query.where(Event.source_event_id == source_event_id)
+    if deduplication_key:
+        query = query.where(Event.deduplication_key == deduplication_key)
+    return query
+
+
+# Columns of EventOut, selected as plain tuples for the read path. The raw payload is
+# rebuilt in SQL for events stored without it.
+EVENT_OUT_COLUMNS = [
+    Event.raw_payload.label("payload") if name == "payload" else getattr(Event, name)
+    for name in EventOut.model_fields
+]
+SEARCH_PARAMS = {"service", "limit", "cursor", "since", "until"}
+
+
+def _event_page(db: Session, query: Select, limit: int, cursor: str | None, offset: int = 0) -> Response:
+    try:
+        query = after_cursor(query, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if offset and not cursor:
+        query = query.offset(offset)
+
+    # Rows come from typed columns and already match EventOut, so they are encoded in one
+    # pass instead of being validated per row and again through response_model.
+    rows = db.execute(query.limit(limit)).all()
+    headers = {}
+    if rows and len(rows) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return Response(
+        content=json_dumps_bytes([row._asdict() for row in rows]),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
 @router.get("/events", response_model=List[EventOut])
 def get_events(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = 100,
     offset: int = 0,
-) -> List[EventOut]:
+    cursor: str | None = None,
+    service: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    source_event_id: uuid.UUID | None = None,
+    deduplication_key: str | None = None,
+) -> Response:
+    if limit > 100:
+        raise HTTPException(status_code=400, detail="Limit must be less than or equal to 100")
+
+    query = _filter_events(select(*EVENT_OUT_COLUMNS), service, since, until, source_event_id, deduplication_key)
+    return _event_page(db, query, limit, cursor, offset)
+
+
+@router.get("/events/search", response_model=List[EventOut])
+def search_events(
+    request: Request,
+    service: str,
+    db: Session = Depends(get_read_db),
+    limit: int = 100,
+    cursor: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Response:
     if limit > 100:
         raise HTTPException(status_code=400, detail="Limit must be less than or equal to 100")
 
-    events = db.execute(select(Event).order_by(Event.created_at.desc()).limit(limit).offset(offset)).scalars().all()
-    return [EventOut.model_validate(event) for event in events]
\ No newline at end of file
+    fields = {name: value for name, value in request.query_params.items() if name not in SEARCH_PARAMS}
+    try:
+        document = payload_filter(service, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Containment on the whole document is served by the service's partial GIN index.
+    query = _filter_events(select(*EVENT_OUT_COLUMNS), service, since, until)
+    return _event_page(db, query.where(Event.normalized_payload.contains(document)), limit, cursor)
+
+
+@router.get("/events/{event_id}/lineage", response_model=EventLineageOut)
+def get_event_lineage(event_id: uuid.UUID, db: Session = Depends(get_read_db)) -> Response:
+    tree = get_lineage(db, event_id)
+    if tree is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return Response(content=json_dumps_bytes(tree), media_type="application/json")
+
+
+@router.get("/events/export")
+def export_events(
+    db: Session = Depends(get_read_db),
+    format: Literal["ndjson", "csv"] = "ndjson",
+    service: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> StreamingResponse:
+    query = _filter_events(select(*EVENT_OUT_COLUMNS), service, since, until)
+    query = query.order_by(Event.created_at.asc(), Event.id.asc())
+    return StreamingResponse(
+        stream_export(db, query, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="events.{format}"'},
+    )
+
+
+@router.get("/stats", response_model=List[StatsBucketOut])
+def get_stats(
+    service: str,
+    db: Session = Depends(get_read_db),
+    interval: Literal["minute", "hour"] = "minute",
+    key: str | None = None,
+    by_key: bool = False,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int = 1000,
+) -> Response:
+    if limit > 1000:
+        raise HTTPException(status_code=400, detail="Limit must be less than or equal to 1000")
+    rows = query_rollups(db, service, interval, key, by_key, since, until, limit)
+    return Response(content=json_dumps_bytes([row._asdict() for row in rows]), media_type="application/json")
+
+
+@router.get("/stats/distinct", response_model=DistinctCountOut)
+def get_distinct_count(
+    service: str,
+    field: str,
+    db: Session = Depends(get_read_db),
+    interval: Literal["hour", "day"] = "hour",
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> DistinctCountOut:
+    if field not in DISTINCT_FIELDS.get(service, ()):
+        raise HTTPException(status_code=400, detail=f"Distinct values of {service}.{field} are not tracked")
+    return DistinctCountOut(
+        service=service, field=field, distinct=distinct_count(db, service, field, interval, since, until)
+    )
+
+
+@router.get("/stats/top", response_model=List[TopItemOut])
+def get_top_items(
+    service: str,
+    field: str,
+    db: Session = Depends(get_read_db),
+    k: int = 10,
+    interval: Literal["hour", "day"] = "day",
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> List[TopItemOut]:
+    if k > 100:
+        raise HTTPException(status_code=400, detail="k must be less than or equal to 100")
+    if field not in [top.field for top in TOP_FIELDS.get(service, ())]:
+        raise HTTPException(status_code=400, detail=f"Top values of {service}.{field} are not tracked")
+    return [
+        TopItemOut(item=item, count=count, error=error)
+        for item, count, error in top_items(db, service, field, k, interval, since, until)
+    ]
+
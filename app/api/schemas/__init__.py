@@ -5,7 +5,7 @@ from pydantic import BaseModel, ConfigDict, Field
 
 
 class IngestResponse(BaseModel):
-    stored_event_id: UUID = Field(..., description="The ID of the stored event")
+    stored_event_id: UUID | None = Field(..., description="The ID of the stored event, or null if the service's persistence policy did not store it")
     derived_events: List[UUID] = Field(..., description="The IDs of the derived events")
 
 
@@ -19,4 +19,31 @@ class EventOut(BaseModel):
     source_event_id: UUID | None = Field(None, description="The ID of the source event (optional)")
     created_at: datetime = Field(..., description="The timestamp of the event creation")
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EventLineageOut(EventOut):
+    children: List["EventLineageOut"] = Field(default_factory=list, description="Events derived from this event")
+
+
+class StatsBucketOut(BaseModel):
+    bucket: datetime = Field(..., description="Start of the time bucket (UTC)")
+    key: str = Field(..., description="Rollup key value, or empty for the whole service")
+    count: int = Field(..., description="Number of events in the bucket")
+    sum: float = Field(..., description="Sum of the service's rollup value")
+    avg: float | None = Field(None, description="Average rollup value over events that carried one")
+    min: float | None = Field(None, description="Smallest rollup value")
+    max: float | None = Field(None, description="Largest rollup value")
+
+
+class DistinctCountOut(BaseModel):
+    service: str = Field(..., description="The service whose events were counted")
+    field: str = Field(..., description="The normalized payload field")
+    distinct: int = Field(..., description="Approximate number of distinct values (HyperLogLog)")
+
+
+class TopItemOut(BaseModel):
+    item: str = Field(..., description="The field value")
+    count: float = Field(..., description="Approximate weight of the value, an overestimate by at most error")
+    error: float = Field(..., description="Upper bound of the overestimate")
+
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from concurrent.futures import Executor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Iterator, List, Sequence, Set, Tuple
+
+from sqlalchemy import Row, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.application.ingest import derived_event
+from app.application.rollups import write_rollups
+from app.application.sketches import write_sketches
+from app.domain.events.types import DerivedEventSpec, NormalizedEvent
+from app.domain.orchestration.registry import registry
+from app.infra.outbox.enqueue import build_notification
+from app.infra.persistence.models.event import Event
+from app.infra.persistence.models.outbox import OutboxMessage
+from app.infra.persistence.repositories.event_repo import EventRepository
+from app.infra.persistence.repositories.outbox_repo import OutboxRepository
+
+BACKFILL_BATCH_SIZE = int(os.getenv("EVENTS_BACKFILL_BATCH_SIZE", "1000"))
+
+# (service, timestamp, payload, normalized_payload): plain values so rows pickle cheaply
+# on their way to the process pool.
+EvaluationRow = Tuple[str, datetime, dict, dict]
+
+
+@dataclass
+class BackfillStats:
+    scanned: int = 0
+    derived: int = 0
+    existing: int = 0
+
+
+@dataclass
+class BackfillCheckpoint:
+    """Scope of a backfill run and the (created_at, id) of the last base event it finished."""
+
+    service: str
+    since: datetime | None = None
+    until: datetime | None = None
+    last_created_at: datetime | None = None
+    last_id: uuid.UUID | None = None
+    stats: BackfillStats = field(default_factory=BackfillStats)
+
+    def save(self, path: str) -> None:
+        """Write the checkpoint atomically, so a crash never leaves a torn file behind."""
+        data = asdict(self)
+        for key in ("since", "until", "last_created_at"):
+            data[key] = data[key].isoformat() if data[key] else None
+        data["last_id"] = str(self.last_id) if self.last_id else None
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> BackfillCheckpoint:
+        with open(path) as f:
+            data = json.load(f)
+        for key in ("since", "until", "last_created_at"):
+            data[key] = datetime.fromisoformat(data[key]) if data[key] else None
+        data["last_id"] = uuid.UUID(data["last_id"]) if data["last_id"] else None
+        data["stats"] = BackfillStats(**data["stats"])
+        return cls(**data)
+
+    def same_scope(self, other: BackfillCheckpoint) -> bool:
+        return (self.service, self.since, self.until) == (other.service, other.since, other.until)
+
+
+def stream_base_events(db: Session, checkpoint: BackfillCheckpoint, batch_size: int) -> Iterator[List[Row]]:
+    """Yield batches of base events in scope, oldest first, after the checkpoint position.
+
+    Each batch is a fresh keyset query on (created_at, id) served by
+    ``ix_events_service_created_at_id``, so batch cost stays flat however far the run
+    has got and no cursor is held open between batches.
+    """
+    query = select(
+        Event.id, Event.service, Event.timestamp, Event.raw_payload.label("payload"),
+        Event.normalized_payload, Event.created_at,
+    ).where(Event.service == checkpoint.service, Event.source_event_id.is_(None))
+    if checkpoint.since:
+        query = query.where(Event.created_at >= checkpoint.since)
+    if checkpoint.until:
+        query = query.where(Event.created_at < checkpoint.until)
+    query = query.order_by(Event.created_at, Event.id).limit(batch_size)
+
+    position = (checkpoint.last_created_at, checkpoint.last_id)
+    while True:
+        page = query
+        if position[0] is not None:
+            page = page.where(tuple_(Event.created_at, Event.id) > tuple_(*position))
+        rows = db.execute(page).all()
+        if not rows:
+            return
+        yield rows
+        position = (rows[-1].created_at, rows[-1].id)
+
+
+def evaluate_rows(rows: Sequence[EvaluationRow]) -> List[List[DerivedEventSpec]]:
+    """Run each row through its service's registered ``RuleEvaluator``.
+
+    Module level so it can be shipped to a process pool.
+    """
+    results = []
+    for service, timestamp, payload, normalized_payload in rows:
+        event = NormalizedEvent(
+            service=service,
+            timestamp=timestamp,
+            raw_payload=payload,
+            normalized_payload=normalized_payload or {},
+        )
+        results.append(registry.get(service).rule_evaluator().evaluate(event))
+    return results
+
+
+def _evaluate(rows: List[EvaluationRow], executor: Executor | None, workers: int) -> List[List[DerivedEventSpec]]:
+    if executor is None or workers <= 1:
+        return evaluate_rows(rows)
+    size = -(-len(rows) // workers)
+    chunks = [rows[start:start + size] for start in range(0, len(rows), size)]
+    return [specs for chunk in executor.map(evaluate_rows, chunks) for specs in chunk]
+
+
+def _existing_derived(db: Session, base_ids: List[uuid.UUID]) -> Set[Tuple[uuid.UUID, str, str | None]]:
+    rows = db.execute(
+        select(Event.source_event_id, Event.service, Event.deduplication_key).where(Event.source_event_id.in_(base_ids))
+    ).all()
+    return {tuple(row) for row in rows}
+
+
+def run_backfill(
+    db: Session,
+    checkpoint: BackfillCheckpoint,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    executor: Executor | None = None,
+    workers: int = 1,
+    dry_run: bool = False,
+    enqueue: bool = False,
+    on_batch: Callable[[BackfillCheckpoint], None] | None = None,
+) -> BackfillStats:
+    """Re-evaluate stored base events and write the derived events the rules now produce.
+
+    Derived events the base event already has (same service and deduplication key)
+    are counted as ``existing`` and not written again, so re-running a batch after a
+    crash between commit and checkpoint is harmless. Derived events keep their base
+    event's ``timestamp``; ``created_at`` is the time of the backfill. With ``enqueue``
+    each one also gets a pending outbox message. New derived events are rolled up and
+    sketched in the same transaction as they are written. ``on_batch`` is called with the
+    advanced checkpoint after every committed batch; in ``dry_run`` nothing is written
+    and the counts report what would have been.
+    """
+    stats = checkpoint.stats
+    for rows in stream_base_events(db, checkpoint, batch_size):
+        evaluated = _evaluate(
+            [(row.service, row.timestamp, row.payload, row.normalized_payload) for row in rows], executor, workers
+        )
+        existing = _existing_derived(db, [row.id for row in rows])
+
+        derived_events: List[Event] = []
+        messages: List[OutboxMessage] = []
+        now = datetime.now(timezone.utc)
+        for row, specs in zip(rows, evaluated):
+            for spec in specs:
+                event = derived_event(spec, row.id, row.timestamp)
+                if (row.id, event.service, event.deduplication_key) in existing:
+                    stats.existing += 1
+                    continue
+                derived_events.append(event)
+                if enqueue:
+                    messages.append(
+                        build_notification(spec.service, spec.payload, spec.priority, spec.deduplication_key, now=now)
+                    )
+
+        stats.scanned += len(rows)
+        stats.derived += len(derived_events)
+        if dry_run:
+            db.rollback()
+        else:
+            EventRepository(db).add_many(derived_events)
+            OutboxRepository(db).add_many(messages)
+            write_rollups(db, derived_events)
+            write_sketches(db, derived_events)
+            db.commit()
+
+        checkpoint.last_created_at, checkpoint.last_id = rows[-1].created_at, rows[-1].id
+        if on_batch:
+            on_batch(checkpoint)
+    return stats
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.application.ingest import derived_event
+from app.application.rollups import write_rollups
+from app.application.sketches import write_sketches
+from app.core.serialization import json_loads
+from app.domain.events.types import DerivedEventSpec
+from app.domain.orchestration.registry import registry
+from app.infra.outbox.enqueue import build_notification
+from app.infra.persistence.models.event import Event
+from app.infra.persistence.payload_storage import compact_payloads
+from app.infra.persistence.repositories.event_repo import EventRepository
+from app.infra.persistence.repositories.outbox_repo import OutboxRepository
+
+IMPORT_CHUNK_SIZE = int(os.getenv("EVENTS_IMPORT_CHUNK_SIZE", "10000"))
+
+FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}
+
+
+@dataclass
+class ImportOptions:
+    """How records of one file become events; picklable so workers receive a copy.
+
+    ``dedupe_key`` is a ``str.format`` template over the record's fields plus ``file``
+    and ``line``, e.g. ``"{meter_id}-{read_at}"``. ``timestamp_field`` names the field
+    holding the reading's time (ISO 8601 or Unix seconds).
+    """
+
+    service: str
+    file: str = ""
+    dedupe_key: str | None = None
+    timestamp_field: str | None = None
+    evaluate: bool = False
+    enqueue: bool = False
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    derived: int = 0
+    bytes_read: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def records_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+
+# (dedupe_key, timestamp, payload, normalized_payload, derived specs)
+NormalizedRecord = Tuple[str | None, datetime | None, dict | None, dict, List[DerivedEventSpec]]
+
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Cannot tell the format of {path!r}; expected one of {', '.join(FORMATS)}")
+    return FORMATS[ext]
+
+
+def read_records(path: str, fmt: str, stats: ImportStats) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Stream ``(line, record)`` pairs from an NDJSON or CSV file, counting bytes into ``stats``.
+
+    The file is read line by line in binary mode, so memory use does not depend on its
+    size. ``line`` is the record's 1-based physical line in the file, counting blank
+    lines and the CSV header; for a CSV record spanning lines it is the last one.
+    Empty CSV cells become None, the way a missing NDJSON key reads.
+    """
+    with open(path, "rb") as f:
+        def lines() -> Iterator[bytes]:
+            for line in f:
+                stats.bytes_read += len(line)
+                yield line
+
+        if fmt == "ndjson":
+            for number, line in enumerate(lines(), 1):
+                if line.strip():
+                    yield number, json_loads(line)
+        else:
+            reader = csv.DictReader(line.decode() for line in lines())
+            for row in reader:
+                yield reader.line_num, {key: value if value != "" else None for key, value in row.items()}
+
+
+def _chunks(records: Iterable[Tuple[int, Dict[str, Any]]], size: int) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+    iterator = iter(records)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _timestamp(value: Any) -> datetime:
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc)
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def normalize_chunk(options: ImportOptions, records: List[Tuple[int, Dict[str, Any]]]) -> List[NormalizedRecord]:
+    """Normalize (and with ``options.evaluate``, evaluate) one chunk of ``(line, record)`` pairs.
+
+    Module level so it can be shipped to a process pool.
+    """
+    factory = registry.get(options.service)
+    normalizer = factory.normalizer()
+    evaluator = factory.rule_evaluator() if options.evaluate else None
+    results = []
+    for line, record in records:
+        dedupe_key = None
+        if options.dedupe_key:
+            try:
+                dedupe_key = options.dedupe_key.format(file=options.file, line=line, **record)
+            except KeyError as e:
+                raise ValueError(f"{options.file}:{line}: dedupe key field {e} is missing") from e
+        normalized = normalizer.normalize(record)
+        timestamp = None
+        if options.timestamp_field and record.get(options.timestamp_field) is not None:
+            timestamp = _timestamp(record[options.timestamp_field])
+            normalized.timestamp = timestamp
+        specs = evaluator.evaluate(normalized) if evaluator else []
+        payload, normalized_payload = compact_payloads(normalized.raw_payload, normalized.normalized_payload)
+        results.append((dedupe_key, timestamp, payload, normalized_payload, specs))
+    return results
+
+
+def _normalized_chunks(
+    chunks: Iterable[List[Tuple[int, Dict[str, Any]]]],
+    options: ImportOptions,
+    executor: Executor | None,
+    window: int,
+) -> Iterator[List[NormalizedRecord]]:
+    # At most ``window`` chunks are in flight, so a fast reader cannot pull the whole
+    # file into memory ahead of the database. Results come back in file order.
+    if executor is None:
+        for records in chunks:
+            yield normalize_chunk(options, records)
+        return
+    pending = deque()
+    for records in chunks:
+        pending.append(executor.submit(normalize_chunk, options, records))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _existing_keys(db: Session, keys: List[str]) -> set:
+    if not keys:
+        return set()
+    return set(
+        db.execute(
+            select(Event.deduplication_key).where(Event.deduplication_key.in_(keys), Event.source_event_id.is_(None))
+        ).scalars()
+    )
+
+
+def load_chunk(db: Session, records: List[NormalizedRecord], options: ImportOptions, stats: ImportStats) -> None:
+    """Write one normalized chunk in a single transaction.
+
+    Records whose dedupe key is already stored, or repeated earlier in the chunk, are
+    counted as duplicates and skipped; since every chunk commits before the next one
+    is checked, duplicates across chunks of the same file are caught too.
+    """
+    seen = _existing_keys(db, [record[0] for record in records if record[0]])
+    base_events: List[Event] = []
+    kept: List[NormalizedRecord] = []
+    for record in records:
+        dedupe_key, timestamp, payload, normalized_payload, _ = record
+        if dedupe_key:
+            if dedupe_key in seen:
+                stats.duplicates += 1
+                continue
+            seen.add(dedupe_key)
+        base_events.append(
+            Event(
+                service=options.service,
+                timestamp=timestamp,
+                payload=payload,
+                normalized_payload=normalized_payload,
+                source_event_id=None,
+                deduplication_key=dedupe_key,
+            )
+        )
+        kept.append(record)
+    EventRepository(db).add_many(base_events)
+
+    derived_events: List[Event] = []
+    messages = []
+    now = datetime.now(timezone.utc)
+    for base, (_, _, _, _, specs) in zip(base_events, kept):
+        for spec in specs:
+            derived_events.append(derived_event(spec, base.id, base.timestamp))
+            if options.enqueue:
+                messages.append(
+                    build_notification(spec.service, spec.payload, spec.priority, spec.deduplication_key, now=now)
+                )
+    EventRepository(db).add_many(derived_events)
+    OutboxRepository(db).add_many(messages)
+    # In the chunk's transaction, so a rerun that skips duplicates does not count them twice.
+    write_rollups(db, [*base_events, *derived_events])
+    write_sketches(db, [*base_events, *derived_events])
+    db.commit()
+
+    stats.imported += len(base_events)
+    stats.derived += len(derived_events)
+
+
+def run_import(
+    db: Session,
+    path: str,
+    options: ImportOptions,
+    fmt: str | None = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    executor: Executor | None = None,
+    window: int = 2,
+    on_chunk: Callable[[ImportStats], None] | None = None,
+) -> ImportStats:
+    """Load every record of ``path`` as a base event of ``options.service``.
+
+    Chunks of ``chunk_size`` records are normalized through the service's registered
+    factory (in ``executor`` when given) and written with the repositories' bulk path,
+    which uses ``COPY`` for chunks this size on Postgres. Each chunk is its own
+    transaction, so an interrupted import keeps what it committed and, with a dedupe
+    key, can simply be run again.
+    """
+    stats = ImportStats()
+    records = read_records(path, fmt or detect_format(path), stats)
+    for chunk in _normalized_chunks(_chunks(records, chunk_size), options, executor, window):
+        stats.read += len(chunk)
+        load_chunk(db, chunk, options, stats)
+        if on_chunk:
+            on_chunk(stats)
+    return stats
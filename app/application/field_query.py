@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from app.domain.orchestration.registry import registry
+from app.infra.persistence.models.event import PAYLOAD_KEY_FIELDS
+
+
+def payload_filter(service: str, fields: Dict[str, str]) -> Dict[str, Any]:
+    """Turn query-string field filters into a containment document for normalized_payload.
+
+    Values go through the service's normalizer so they get the type they are stored
+    with: ``patient_id=123`` matches ``{"patient_id": 123}``, not ``"123"``.
+    """
+    allowed = PAYLOAD_KEY_FIELDS.get(service)
+    if allowed is None:
+        raise ValueError(f"Service {service!r} has no indexed payload fields")
+    if not fields:
+        raise ValueError(f"At least one field filter is required, expected some of {list(allowed)}")
+    unknown = sorted(set(fields) - set(allowed))
+    if unknown:
+        raise ValueError(f"Fields {unknown} are not indexed for {service!r}, expected some of {list(allowed)}")
+
+    normalized = registry.get(service).normalizer().normalize(dict(fields)).normalized_payload
+    return {name: normalized[name] for name in fields}
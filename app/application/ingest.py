@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
 from typing import List, Tuple
 import uuid
 
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.domain.events.types import NormalizedEvent
-from app.domain.orchestration.factories.base import EventComponentsFactory
+from app.application.rollups import ROLLUPS_ENABLED, rollup_accumulator
+from app.application.sampling import entity_key, should_store
+from app.application.sketches import SKETCHES_ENABLED, sketch_accumulator
+from app.domain.events.types import DerivedEventSpec
 from app.domain.orchestration.registry import registry
-from app.infra.outbox.enqueue import enqueue_notification
+from app.infra.outbox.enqueue import build_notification
+from app.infra.outbox.relay import OutboxRelay
 from app.infra.persistence.models.event import Event
+from app.infra.persistence.payload_storage import compact_payloads
+from app.infra.persistence.repositories.entity_state_repo import EntityStateRepository
+from app.infra.persistence.repositories.event_repo import EventRepository
+from app.infra.persistence.repositories.outbox_repo import OutboxRepository
 
 
 def ingest_event(
@@ -18,52 +25,95 @@ def ingest_event(
     payload: dict,
     db: Session,
     dedupe_key: str | None = None,
-) -> Tuple[Event, List[Event]]:
+    relay: OutboxRelay | None = None,
+) -> Tuple[Event | None, List[Event]]:
+    """Normalize, store and evaluate one event; return its base event and derived events.
+
+    The base event is None when the service's persistence policy did not store it.
+    """
     if dedupe_key:
-        existing = db.execute(select(Event).where(Event.deduplication_key == dedupe_key)).scalar_one_or_none()
+        existing, derived = EventRepository(db).find_with_derived(dedupe_key)
         if existing:
-            derived = db.execute(select(Event).where(Event.source_event_id == existing.id)).scalars().all()
             return existing, derived
     
     factory = registry.get(service)
     normalized = factory.normalizer().normalize(payload)
 
+    policy = factory.persistence_policy()
+    payload, normalized_payload = compact_payloads(normalized.raw_payload, normalized.normalized_payload)
     base = Event(
         service=normalized.service,
         timestamp=normalized.timestamp,
-        payload=normalized.raw_payload,
-        normalized_payload=normalized.normalized_payload,
+        payload=payload,
+        normalized_payload=normalized_payload,
         source_event_id=None,
         deduplication_key=dedupe_key,
     )
-    db.add(base)
-    db.flush()
+    derived_specs = factory.rule_evaluator().evaluate(normalized)
+    # Events with a dedupe key are always stored, or a retry could not find them and
+    # would write its derived events and notifications again. Events with derived events
+    # are stored too, since a derived event without source_event_id reads as a base event.
+    stored = bool(dedupe_key) or bool(derived_specs) or should_store(
+        policy, normalized.service, normalized.normalized_payload, normalized.timestamp
+    )
+    if stored:
+        EventRepository(db).add(base)
+    else:
+        # Never written: only kept in memory for the rollups and sketches below.
+        base.created_at = datetime.now(timezone.utc)
+    base_id = base.id if stored else None
+    key = entity_key(policy, normalized.normalized_payload)
+    if key is not None:
+        EntityStateRepository(db).upsert(normalized.service, key, normalized.normalized_payload, normalized.timestamp, base_id)
 
-    derived_events = _persist_derived_events(normalized, factory, base.id, db)
+    derived_events = _persist_derived_events(derived_specs, base_id, db, relay)
 
     db.commit()
-    db.refresh(base)
+    if relay:
+        relay.flush()
+    if stored:
+        db.refresh(base)
     for derived in derived_events:
-        db.refresh(derived)
+        # Batches that took the bulk path come back detached with their values resolved.
+        if derived in db:
+            db.refresh(derived)
+    # Rollups and sketches count every event, stored or not.
+    if ROLLUPS_ENABLED:
+        rollup_accumulator.add_events([base, *derived_events])
+    if SKETCHES_ENABLED:
+        sketch_accumulator.add_events([base, *derived_events])
 
-    return base, derived_events
+    return (base if stored else None), derived_events
 
 
-def _persist_derived_events(normalized: NormalizedEvent, factory: EventComponentsFactory, base_id: uuid.UUID | None, db: Session) -> List[Event]:
-    derived_specs = factory.rule_evaluator().evaluate(normalized)
-    derived_events = []
-    for spec in derived_specs:
-        derived = Event(
-            service=spec.service,
-            payload=spec.payload,
-            normalized_payload=None,
-            source_event_id=base_id,
-            deduplication_key=spec.deduplication_key if spec.deduplication_key else None,
-        )
-        db.add(derived)
-        db.flush()
-        derived_events.append(derived)
-
-        enqueue_notification(db, spec.service, spec.payload)
+def derived_event(spec: DerivedEventSpec, base_id: uuid.UUID | None, timestamp: datetime | None = None) -> Event:
+    """Build the event row for a derived event spec; ``timestamp`` defaults to now."""
+    return Event(
+        service=spec.service,
+        timestamp=timestamp,
+        payload=spec.payload,
+        normalized_payload=None,
+        source_event_id=base_id,
+        deduplication_key=spec.deduplication_key if spec.deduplication_key else None,
+    )
+
+
+def _persist_derived_events(
+    derived_specs: List[DerivedEventSpec],
+    base_id: uuid.UUID,
+    db: Session,
+    relay: OutboxRelay | None = None,
+) -> List[Event]:
+    derived_events = EventRepository(db).add_many(derived_event(spec, base_id) for spec in derived_specs)
+
+    now = datetime.now(timezone.utc)
+    next_attempt_at = now + (relay.grace if relay else timedelta(0))
+    messages = OutboxRepository(db).add_many(
+        build_notification(spec.service, spec.payload, spec.priority, spec.deduplication_key, next_attempt_at, now)
+        for spec in derived_specs
+    )
+    if relay:
+        for msg in messages:
+            relay.track(msg.id)
 
     return derived_events
\ No newline at end of file
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.infra.persistence.repositories.event_repo import EventRepository
+
+LINEAGE_MAX_DEPTH = int(os.getenv("EVENTS_LINEAGE_MAX_DEPTH", "10"))
+LINEAGE_CACHE_SIZE = int(os.getenv("EVENTS_LINEAGE_CACHE_SIZE", "1024"))
+LINEAGE_CACHE_TTL_SECONDS = float(os.getenv("EVENTS_LINEAGE_CACHE_TTL_SECONDS", "60"))
+
+
+class LRUCache:
+    """Thread-safe mapping that evicts the least recently used entry past ``maxsize``.
+
+    With ``ttl`` set, entries also expire that many seconds after they were stored.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            expires_at, value = self._entries[key]
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = self._clock() + self.ttl if self.ttl else float("inf")
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Ingest writes derived events in the same transaction as their source, but committed
+# trees still change: app.tools.backfill adds branches, downsampling deletes events and
+# partition expiry drops them. Those run in other processes, so entries expire after a
+# short TTL instead of being invalidated.
+lineage_cache = LRUCache(LINEAGE_CACHE_SIZE, ttl=LINEAGE_CACHE_TTL_SECONDS)
+
+
+def get_lineage(db: Session, event_id: uuid.UUID, max_depth: int = LINEAGE_MAX_DEPTH) -> Dict[str, Any] | None:
+    """Return the event as a tree of nested ``children``, or None if it does not exist."""
+    key = (event_id, max_depth)
+    cached = lineage_cache.get(key)
+    if cached is not None:
+        return cached
+
+    rows = EventRepository(db).lineage(event_id, max_depth)
+    if not rows:
+        return None
+
+    nodes = {}
+    for row in rows:
+        node = {name: value for name, value in row._asdict().items() if name != "depth"}
+        node["children"] = []
+        nodes[row.id] = node
+        if row.depth > 0:
+            nodes[row.source_event_id]["children"].append(node)
+
+    tree = nodes[event_id]
+    lineage_cache.put(key, tree)
+    return tree
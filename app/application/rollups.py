@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from sqlalchemy import Row, case, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal
+from app.infra.persistence.bulk import INSERT_CHUNK_SIZE
+from app.infra.persistence.models.event import Event
+from app.infra.persistence.models.event_rollup import EventRollup
+
+ROLLUPS_ENABLED = os.getenv("EVENTS_ROLLUPS_ENABLED", "true").lower() in ("1", "true", "yes")
+ROLLUP_FLUSH_SECONDS = float(os.getenv("EVENTS_ROLLUP_FLUSH_SECONDS", "5.0"))
+
+# Bucket widths every event is counted into; GET /stats serves these intervals.
+ROLLUP_INTERVALS = {"minute": 60, "hour": 3600}
+
+
+@dataclass(frozen=True)
+class RollupField:
+    """Which payload fields of a service are rolled up: a grouping key and a numeric value."""
+
+    key: str | None = None
+    value: str | None = None
+
+
+# Services not listed here are still counted, in their service-wide row only.
+ROLLUP_FIELDS: Dict[str, RollupField] = {
+    "energy": RollupField(key="neighborhood", value="energy"),
+    "health": RollupField(key="alert"),
+    "transport": RollupField(key="bus_id"),
+    "security": RollupField(key="alert"),
+}
+
+CellKey = Tuple[str, int, str, datetime]
+
+
+@dataclass
+class RollupCell:
+    count: int = 0
+    value_count: int = 0
+    value_sum: float = 0.0
+    value_min: float | None = None
+    value_max: float | None = None
+
+    def add(self, value: float | None) -> None:
+        self.count += 1
+        if value is None:
+            return
+        self.value_count += 1
+        self.value_sum += value
+        self.value_min = value if self.value_min is None else min(self.value_min, value)
+        self.value_max = value if self.value_max is None else max(self.value_max, value)
+
+    def merge(self, other: RollupCell) -> None:
+        self.count += other.count
+        self.value_count += other.value_count
+        self.value_sum += other.value_sum
+        for name, pick in (("value_min", min), ("value_max", max)):
+            mine, theirs = getattr(self, name), getattr(other, name)
+            setattr(self, name, theirs if mine is None else mine if theirs is None else pick(mine, theirs))
+
+
+def bucket_start(timestamp: datetime, seconds: int) -> datetime:
+    """Start of the ``seconds``-wide UTC bucket holding ``timestamp``; naive times are UTC."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    epoch = int(timestamp.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % seconds, timezone.utc)
+
+
+def _numeric(value) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+class RollupAccumulator:
+    """Thread-safe in-memory rollup cells waiting to be flushed."""
+
+    def __init__(self) -> None:
+        self._cells: Dict[CellKey, RollupCell] = {}
+        self._lock = threading.Lock()
+
+    def add(self, service: str, timestamp: datetime, payload: dict | None) -> None:
+        payload = payload or {}
+        fields = ROLLUP_FIELDS.get(service, RollupField())
+        value = _numeric(payload.get(fields.value)) if fields.value else None
+        keys = [""]
+        if fields.key and payload.get(fields.key) is not None:
+            keys.append(str(payload[fields.key]))
+        with self._lock:
+            for seconds in ROLLUP_INTERVALS.values():
+                bucket = bucket_start(timestamp, seconds)
+                for key in keys:
+                    self._cells.setdefault((service, seconds, key, bucket), RollupCell()).add(value)
+
+    def add_events(self, events: Iterable[Event]) -> None:
+        for event in events:
+            payload = event.normalized_payload if event.normalized_payload is not None else event.payload
+            self.add(event.service, event.timestamp or event.created_at, payload)
+
+    def drain(self) -> Dict[CellKey, RollupCell]:
+        with self._lock:
+            cells, self._cells = self._cells, {}
+        return cells
+
+    def merge(self, cells: Dict[CellKey, RollupCell]) -> None:
+        """Put drained cells back, e.g. after a failed flush."""
+        with self._lock:
+            for key, cell in cells.items():
+                self._cells.setdefault(key, RollupCell()).merge(cell)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+
+rollup_accumulator = RollupAccumulator()
+
+
+def _extreme(column, incoming, pick_incoming):
+    # NULL-aware min/max that behaves the same on PostgreSQL and SQLite.
+    return case(
+        (incoming.is_(None), column),
+        (column.is_(None), incoming),
+        (pick_incoming, incoming),
+        else_=column,
+    )
+
+
+def upsert_rollups(db: Session, cells: Dict[CellKey, RollupCell]) -> int:
+    """Add ``cells`` onto the stored rollups with multi-row ``INSERT ... ON CONFLICT`` statements.
+
+    Rows are written in primary key order so concurrent flushes from several API
+    processes lock them in the same order and cannot deadlock. The caller owns the
+    transaction.
+    """
+    if not cells:
+        return 0
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    rows = [
+        {
+            "service": service,
+            "bucket_seconds": seconds,
+            "key": key,
+            "bucket": bucket,
+            "count": cell.count,
+            "value_count": cell.value_count,
+            "value_sum": cell.value_sum,
+            "value_min": cell.value_min,
+            "value_max": cell.value_max,
+        }
+        for (service, seconds, key, bucket), cell in sorted(cells.items(), key=lambda item: item[0])
+    ]
+    stored = EventRollup.__table__.c
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        stmt = dialect.insert(EventRollup).values(rows[start:start + INSERT_CHUNK_SIZE])
+        incoming = stmt.excluded
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["service", "bucket_seconds", "key", "bucket"],
+                set_={
+                    "count": stored.count + incoming.count,
+                    "value_count": stored.value_count + incoming.value_count,
+                    "value_sum": stored.value_sum + incoming.value_sum,
+                    "value_min": _extreme(stored.value_min, incoming.value_min, incoming.value_min < stored.value_min),
+                    "value_max": _extreme(stored.value_max, incoming.value_max, incoming.value_max > stored.value_max),
+                },
+            )
+        )
+    return len(rows)
+
+
+def query_rollups(
+    db: Session,
+    service: str,
+    interval: str = "minute",
+    key: str | None = None,
+    by_key: bool = False,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int = 1000,
+) -> List[Row]:
+    """Read rollup rows of one service, oldest bucket first.
+
+    Without ``key`` or ``by_key`` the service-wide rows are returned; ``key`` picks one
+    key and ``by_key`` returns every key. ``avg`` is over events that carried a value.
+    """
+    query = select(
+        EventRollup.bucket,
+        EventRollup.key,
+        EventRollup.count,
+        EventRollup.value_sum.label("sum"),
+        case(
+            (EventRollup.value_count > 0, EventRollup.value_sum / EventRollup.value_count),
+            else_=None,
+        ).label("avg"),
+        EventRollup.value_min.label("min"),
+        EventRollup.value_max.label("max"),
+    ).where(EventRollup.service == service, EventRollup.bucket_seconds == ROLLUP_INTERVALS[interval])
+    if by_key:
+        query = query.where(EventRollup.key != "")
+    else:
+        query = query.where(EventRollup.key == (key or ""))
+    if since:
+        query = query.where(EventRollup.bucket >= bucket_start(since, ROLLUP_INTERVALS[interval]))
+    if until:
+        query = query.where(EventRollup.bucket < until)
+    return db.execute(query.order_by(EventRollup.bucket, EventRollup.key).limit(limit)).all()
+
+
+def flush_rollups(
+    accumulator: RollupAccumulator = rollup_accumulator,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> int:
+    """Write everything accumulated so far; on failure the cells are kept for the next flush."""
+    cells = accumulator.drain()
+    if not cells:
+        return 0
+    db = session_factory()
+    try:
+        written = upsert_rollups(db, cells)
+        db.commit()
+        return written
+    except Exception as e:
+        print(f"Error flushing event rollups: {e}")
+        db.rollback()
+        accumulator.merge(cells)
+        return 0
+    finally:
+        db.close()
+
+
+def write_rollups(db: Session, events: Iterable[Event]) -> int:
+    """Roll ``events`` straight onto ``event_rollups``, for tools that write events outside ingest.
+
+    The caller owns the transaction, so the counts commit together with the events.
+    """
+    if not ROLLUPS_ENABLED:
+        return 0
+    accumulator = RollupAccumulator()
+    accumulator.add_events(events)
+    return upsert_rollups(db, accumulator.drain())
+
+
+class BackgroundFlusher:
+    """Daemon thread calling ``flush`` every ``interval`` seconds, and once more on stop."""
+
+    def __init__(self, flush: Callable[[], object], interval: float = ROLLUP_FLUSH_SECONDS, name: str = "rollup-flusher"):
+        self._flush = flush
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._flush()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread and flush what is left."""
+        self._stop.set()
+        self._thread.join()
+        self._flush()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Dict, Tuple
+
+from app.application.rollups import bucket_start
+from app.domain.orchestration.persistence import DISCARD, FULL, STATE, PersistencePolicy
+
+
+def entity_key(policy: PersistencePolicy, payload: dict | None) -> str | None:
+    """The payload's ``state_key`` value as text, or None when the policy or payload has none."""
+    if not policy.state_key or not payload or payload.get(policy.state_key) is None:
+        return None
+    return str(payload[policy.state_key])
+
+
+class EventSampler:
+    """Thread-safe record of what a sampled policy kept so far, in this process.
+
+    Each API process samples on its own: with N processes a 1-in-``sample_every``
+    policy keeps about one in ``sample_every`` events overall, while a time-based one
+    keeps up to N events per key and bucket.
+    """
+
+    def __init__(self) -> None:
+        self._counts: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[str, str], datetime] = {}
+        self._lock = threading.Lock()
+
+    def keep(self, service: str, policy: PersistencePolicy, key: str | None, timestamp: datetime) -> bool:
+        with self._lock:
+            if policy.sample_every:
+                count = self._counts.get(service, 0)
+                self._counts[service] = count + 1
+                return count % policy.sample_every == 0
+            bucket = bucket_start(timestamp, policy.sample_seconds)
+            scope = (service, key or "")
+            if self._buckets.get(scope) == bucket:
+                return False
+            self._buckets[scope] = bucket
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._buckets.clear()
+
+
+event_sampler = EventSampler()
+
+
+def should_store(
+    policy: PersistencePolicy,
+    service: str,
+    payload: dict | None,
+    timestamp: datetime,
+    sampler: EventSampler = event_sampler,
+) -> bool:
+    """Whether the base event gets an ``events`` row under ``policy``.
+
+    Time-based sampling keeps the first event per key in each bucket of the event's
+    own timestamp, so the kept rows line up with the downsampling buckets.
+    """
+    if policy.mode == FULL:
+        return True
+    if policy.mode in (STATE, DISCARD):
+        return False
+    return sampler.keep(service, policy, entity_key(policy, payload), timestamp)
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.application.rollups import bucket_start
+from app.core.db import SessionLocal
+from app.core.sketches import HyperLogLog, SpaceSaving
+from app.infra.persistence.models.event import Event
+from app.infra.persistence.models.event_sketch import EventSketch
+
+SKETCHES_ENABLED = os.getenv("EVENTS_SKETCHES_ENABLED", "true").lower() in ("1", "true", "yes")
+SKETCH_FLUSH_SECONDS = float(os.getenv("EVENTS_SKETCH_FLUSH_SECONDS", "10.0"))
+HLL_PRECISION = int(os.getenv("EVENTS_SKETCH_HLL_PRECISION", "12"))
+TOP_CAPACITY = int(os.getenv("EVENTS_SKETCH_TOP_CAPACITY", "100"))
+# Hostname alone is not enough: several API workers can share a container.
+SKETCH_REPLICA_ID = os.getenv("EVENTS_SKETCH_REPLICA_ID") or f"{socket.gethostname()}-{os.getpid()}"
+
+SKETCH_INTERVALS = {"hour": 3600, "day": 86400}
+
+DISTINCT = "distinct"
+TOP = "top"
+
+
+@dataclass(frozen=True)
+class TopField:
+    """Payload field ranked by a top-K sketch, weighted by ``weight`` or by event count."""
+
+    field: str
+    weight: str | None = None
+
+
+DISTINCT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "energy": ("neighborhood",),
+    "health": ("patient_id",),
+    "transport": ("bus_id",),
+    "security": ("camera_trigger",),
+}
+TOP_FIELDS: Dict[str, Tuple[TopField, ...]] = {
+    "energy": (TopField("neighborhood", weight="energy"),),
+    "transport": (TopField("bus_id"),),
+    "security": (TopField("camera_trigger"),),
+}
+
+SketchKey = Tuple[str, str, str, int, datetime]
+Sketch = HyperLogLog | SpaceSaving
+
+
+def _new_sketch(kind: str) -> Sketch:
+    return HyperLogLog(HLL_PRECISION) if kind == DISTINCT else SpaceSaving(TOP_CAPACITY)
+
+
+def _decode(kind: str, data: bytes) -> Sketch:
+    return HyperLogLog.from_bytes(data) if kind == DISTINCT else SpaceSaving.from_bytes(data)
+
+
+def _weight(value) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+class SketchAccumulator:
+    """Thread-safe in-memory sketches of the current process, waiting to be flushed."""
+
+    def __init__(self) -> None:
+        self._sketches: Dict[SketchKey, Sketch] = {}
+        self._lock = threading.Lock()
+
+    def _sketch(self, service: str, kind: str, field: str, seconds: int, bucket: datetime) -> Sketch:
+        key = (service, kind, field, seconds, bucket)
+        if key not in self._sketches:
+            self._sketches[key] = _new_sketch(kind)
+        return self._sketches[key]
+
+    def add(self, service: str, timestamp: datetime, payload: dict | None) -> None:
+        payload = payload or {}
+        with self._lock:
+            for seconds in SKETCH_INTERVALS.values():
+                bucket = bucket_start(timestamp, seconds)
+                for field in DISTINCT_FIELDS.get(service, ()):
+                    if payload.get(field) is not None:
+                        self._sketch(service, DISTINCT, field, seconds, bucket).add(payload[field])
+                for top in TOP_FIELDS.get(service, ()):
+                    if payload.get(top.field) is None:
+                        continue
+                    weight = _weight(payload.get(top.weight)) if top.weight else 1.0
+                    if weight is not None:
+                        self._sketch(service, TOP, top.field, seconds, bucket).add(str(payload[top.field]), weight)
+
+    def add_events(self, events: Iterable[Event]) -> None:
+        for event in events:
+            payload = event.normalized_payload if event.normalized_payload is not None else event.payload
+            self.add(event.service, event.timestamp or event.created_at, payload)
+
+    def drain(self) -> Dict[SketchKey, Sketch]:
+        with self._lock:
+            sketches, self._sketches = self._sketches, {}
+        return sketches
+
+    def merge(self, sketches: Dict[SketchKey, Sketch]) -> None:
+        """Put drained sketches back, e.g. after a failed flush."""
+        with self._lock:
+            for key, sketch in sketches.items():
+                if key in self._sketches:
+                    sketch.merge(self._sketches[key])
+                self._sketches[key] = sketch
+
+    def __len__(self) -> int:
+        return len(self._sketches)
+
+
+sketch_accumulator = SketchAccumulator()
+
+
+def store_sketches(db: Session, sketches: Dict[SketchKey, Sketch], replica: str = SKETCH_REPLICA_ID) -> int:
+    """Merge ``sketches`` into this replica's stored rows and write them back.
+
+    Only this replica writes its rows, so reading and replacing them needs no locking.
+    The caller owns the transaction.
+    """
+    if not sketches:
+        return 0
+    key_columns = (EventSketch.service, EventSketch.kind, EventSketch.field, EventSketch.bucket_seconds, EventSketch.bucket)
+    stored = db.execute(
+        select(*key_columns, EventSketch.data).where(
+            EventSketch.replica == replica, tuple_(*key_columns).in_(list(sketches))
+        )
+    ).all()
+    for row in stored:
+        key = (row.service, row.kind, row.field, row.bucket_seconds, bucket_start(row.bucket, row.bucket_seconds))
+        if key in sketches:
+            sketches[key].merge(_decode(row.kind, row.data))
+
+    now = datetime.now(timezone.utc)
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(EventSketch).values([
+        {
+            "service": service,
+            "kind": kind,
+            "field": field,
+            "bucket_seconds": seconds,
+            "bucket": bucket,
+            "replica": replica,
+            "data": sketch.to_bytes(),
+            "updated_at": now,
+        }
+        for (service, kind, field, seconds, bucket), sketch in sketches.items()
+    ])
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["service", "kind", "field", "bucket_seconds", "bucket", "replica"],
+            set_={"data": stmt.excluded.data, "updated_at": stmt.excluded.updated_at},
+        )
+    )
+    return len(sketches)
+
+
+def flush_sketches(
+    accumulator: SketchAccumulator = sketch_accumulator,
+    session_factory: Callable[[], Session] = SessionLocal,
+    replica: str = SKETCH_REPLICA_ID,
+) -> int:
+    """Write everything accumulated so far; on failure the sketches are kept for the next flush."""
+    sketches = accumulator.drain()
+    if not sketches:
+        return 0
+    db = session_factory()
+    try:
+        written = store_sketches(db, sketches, replica)
+        db.commit()
+        return written
+    except Exception as e:
+        print(f"Error flushing event sketches: {e}")
+        db.rollback()
+        accumulator.merge(sketches)
+        return 0
+    finally:
+        db.close()
+
+
+def write_sketches(db: Session, events: Iterable[Event], replica: str = SKETCH_REPLICA_ID) -> int:
+    """Add ``events`` straight into ``replica``'s stored sketches, for tools that write events outside ingest.
+
+    The caller owns the transaction, so the sketches commit together with the events.
+    """
+    if not SKETCHES_ENABLED:
+        return 0
+    accumulator = SketchAccumulator()
+    accumulator.add_events(events)
+    return store_sketches(db, accumulator.drain(), replica)
+
+
+def merged_sketch(
+    db: Session,
+    service: str,
+    kind: str,
+    field: str,
+    interval: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Sketch | None:
+    """Merge the stored sketches of every replica and bucket in [since, until).
+
+    ``since`` defaults to the start of the current bucket; it is rounded down to a
+    bucket boundary, so the answer covers whole buckets.
+    """
+    seconds = SKETCH_INTERVALS[interval]
+    since = bucket_start(since or datetime.now(timezone.utc), seconds)
+    query = select(EventSketch.data).where(
+        EventSketch.service == service,
+        EventSketch.kind == kind,
+        EventSketch.field == field,
+        EventSketch.bucket_seconds == seconds,
+        EventSketch.bucket >= since,
+    )
+    if until:
+        query = query.where(EventSketch.bucket < until)
+    merged = None
+    for data in db.execute(query).scalars():
+        sketch = _decode(kind, data)
+        if merged is None:
+            merged = sketch
+        else:
+            merged.merge(sketch)
+    return merged
+
+
+def distinct_count(db: Session, service: str, field: str, interval: str = "hour",
+                   since: datetime | None = None, until: datetime | None = None) -> int:
+    sketch = merged_sketch(db, service, DISTINCT, field, interval, since, until)
+    return sketch.estimate() if sketch else 0
+
+
+def top_items(db: Session, service: str, field: str, k: int = 10, interval: str = "day",
+              since: datetime | None = None, until: datetime | None = None) -> List[Tuple[str, float, float]]:
+    sketch = merged_sketch(db, service, TOP, field, interval, since, until)
+    return sketch.top(k) if sketch else []
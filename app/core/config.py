@@ -4,6 +4,22 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
     DATABASE_URL: str
+    # Optional streaming replica for query endpoints; reads use the primary when unset.
+    DATABASE_READ_URL: str | None = None
+    # How long a read carrying X-Min-LSN waits for the replica before using the primary.
+    READ_YOUR_WRITES_TIMEOUT_SECONDS: float = 0.5
 
+    # Database profile shared by every engine the API and the background processes create.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int | None = None
+    DB_APPLICATION_NAME: str = "smartcity-orchestrator"
+    # Safe behind PgBouncer in transaction pooling mode: no session-level settings and no
+    # server-side prepared statements.
+    DB_PGBOUNCER_MODE: bool = False
 
-settings = Settings()
\ No newline at end of file
+
+settings = Settings()
@@ -1,17 +1,100 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event, make_url, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
+from app.core.serialization import json_dumps, json_loads
+
 
 class Base(DeclarativeBase):
     pass
 
-engine = create_engine(settings.DATABASE_URL)
+
+def engine_options(url: str, application_name: str | None = None) -> Dict[str, Any]:
+    """Keyword arguments for ``create_engine`` following the configured database profile."""
+    options: Dict[str, Any] = {"json_serializer": json_dumps, "json_deserializer": json_loads}
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "postgresql":
+        return options
+
+    connect_args: Dict[str, Any] = {"application_name": application_name or settings.DB_APPLICATION_NAME}
+    if settings.DB_STATEMENT_TIMEOUT_MS and not settings.DB_PGBOUNCER_MODE:
+        # PgBouncer rejects unknown startup parameters; create_db_engine sets it per transaction instead.
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    if settings.DB_PGBOUNCER_MODE and parsed.get_driver_name() == "psycopg":
+        # A prepared statement lives on one server connection; the next transaction may get another.
+        connect_args["prepare_threshold"] = None
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    return options
+
+
+def create_db_engine(url: str, application_name: str | None = None) -> Engine:
+    engine = create_engine(url, **engine_options(url, application_name))
+    if engine.dialect.name == "postgresql" and settings.DB_PGBOUNCER_MODE and settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = int(settings.DB_STATEMENT_TIMEOUT_MS)
+
+        @event.listens_for(engine, "begin")
+        def set_statement_timeout(connection):
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout}")
+    return engine
+
+
+def pool_stats(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return stats
+
+
+engine = create_db_engine(settings.DATABASE_URL, f"{settings.DB_APPLICATION_NAME}-api")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Query endpoints read from the replica when one is configured, otherwise from the primary.
+read_engine = (
+    create_db_engine(settings.DATABASE_READ_URL, f"{settings.DB_APPLICATION_NAME}-api-read")
+    if settings.DATABASE_READ_URL
+    else engine
+)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def current_lsn(db: Session) -> str | None:
+    """WAL position of the primary after the session's last commit, or None off PostgreSQL."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    return db.execute(text("SELECT pg_current_wal_lsn()::text")).scalar_one()
+
+
+def replica_caught_up(db: Session, lsn: str) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    # pg_last_wal_replay_lsn() is NULL on a primary, which has every write by definition.
+    return db.execute(
+        text("SELECT COALESCE(pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn), true)"),
+        {"lsn": lsn},
+    ).scalar_one()
+
@@ -0,0 +1,45 @@
+import json
+import re
+from typing import Any
+
+import orjson
+
+# Python's json module turns non-string keys into strings; keep that behaviour.
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# orjson only handles 64-bit integers: it refuses to encode larger ones and decodes them
+# as floats. Such documents are valid JSON (and jsonb) and go through the json module.
+_LONG_NUMBER = re.compile(rb"\d{20}")
+
+
+def _stdlib_dumps(value: Any, sort_keys: bool = False) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys)
+
+
+def json_dumps(value: Any) -> str:
+    try:
+        return orjson.dumps(value, option=_OPTIONS).decode()
+    except orjson.JSONEncodeError:
+        return _stdlib_dumps(value)
+
+
+def json_dumps_bytes(value: Any) -> bytes:
+    try:
+        return orjson.dumps(value, option=_OPTIONS)
+    except orjson.JSONEncodeError:
+        return _stdlib_dumps(value).encode()
+
+
+def json_loads(value: str | bytes) -> Any:
+    data = value.encode() if isinstance(value, str) else value
+    if _LONG_NUMBER.search(data):
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def canonical_json(value: Any) -> bytes:
+    """Encoding with sorted keys, for comparing documents without caring about key order."""
+    try:
+        return orjson.dumps(value, option=_OPTIONS | orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        return _stdlib_dumps(value, sort_keys=True).encode()
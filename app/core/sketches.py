@@ -0,0 +1,118 @@
+"""
+Mergeable streaming sketches with a compact byte encoding.
+
+Both sketches hash and merge deterministically, so summaries built by different
+processes over different events combine into the summary of all of them.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+from typing import Dict, Hashable, List, Tuple
+
+from app.core.serialization import json_dumps_bytes, json_loads
+
+
+def _hash64(value: Hashable) -> int:
+    # Python's hash() is salted per process; sketches from different replicas must agree.
+    return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """Distinct-count estimator in ``2 ** precision`` one-byte registers.
+
+    The standard error is about ``1.04 / sqrt(2 ** precision)``: 1.6% at the default
+    precision of 12, which encodes to 4 KiB.
+    """
+
+    def __init__(self, precision: int = 12, registers: bytearray | None = None):
+        if not 4 <= precision <= 16:
+            raise ValueError(f"precision must be between 4 and 16, got {precision}")
+        self.precision = precision
+        self.registers = registers if registers is not None else bytearray(1 << precision)
+
+    def add(self, value: Hashable) -> None:
+        h = _hash64(value)
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: HyperLogLog) -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are still empty.
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+    def to_bytes(self) -> bytes:
+        return bytes([self.precision]) + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> HyperLogLog:
+        return cls(precision=data[0], registers=bytearray(data[1:]))
+
+
+class SpaceSaving:
+    """Weighted top-K summary keeping at most ``capacity`` counters.
+
+    Counts are overestimates by at most the reported ``error``; any item whose true
+    weight exceeds ``total / capacity`` is guaranteed to be tracked. Keep
+    ``capacity`` several times larger than the K you ask for.
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.counters: Dict[str, Tuple[float, float]] = {}
+
+    def add(self, item: str, weight: float = 1.0) -> None:
+        if item in self.counters:
+            count, error = self.counters[item]
+            self.counters[item] = (count + weight, error)
+        elif len(self.counters) < self.capacity:
+            self.counters[item] = (weight, 0.0)
+        else:
+            victim = min(self.counters, key=lambda key: self.counters[key][0])
+            floor, _ = self.counters.pop(victim)
+            self.counters[item] = (floor + weight, floor)
+
+    def _floor(self) -> float:
+        # What an untracked item may have had: the smallest counter once the summary is full.
+        if len(self.counters) < self.capacity:
+            return 0.0
+        return min(count for count, _ in self.counters.values())
+
+    def merge(self, other: SpaceSaving) -> None:
+        mine, theirs = self._floor(), other._floor()
+        merged = {}
+        for item in self.counters.keys() | other.counters.keys():
+            count_a, error_a = self.counters.get(item, (mine, mine))
+            count_b, error_b = other.counters.get(item, (theirs, theirs))
+            merged[item] = (count_a + count_b, error_a + error_b)
+        self.capacity = max(self.capacity, other.capacity)
+        kept = sorted(merged.items(), key=lambda entry: entry[1][0], reverse=True)[: self.capacity]
+        self.counters = dict(kept)
+
+    def top(self, k: int) -> List[Tuple[str, float, float]]:
+        """The ``k`` heaviest items as (item, count, error), heaviest first."""
+        ranked = sorted(self.counters.items(), key=lambda entry: (-entry[1][0], entry[0]))
+        return [(item, count, error) for item, (count, error) in ranked[:k]]
+
+    def to_bytes(self) -> bytes:
+        return json_dumps_bytes([self.capacity, [[item, count, error] for item, (count, error) in self.counters.items()]])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> SpaceSaving:
+        capacity, counters = json_loads(data)
+        sketch = cls(capacity)
+        sketch.counters = {item: (count, error) for item, count, error in counters}
+        return sketch
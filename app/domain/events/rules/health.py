@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import List
 
 from app.domain.events.rules.base import RuleEvaluator
-from app.domain.events.types import DerivedEventSpec, NormalizedEvent
+from app.domain.events.types import DerivedEventSpec, NormalizedEvent, Priority
 
 
 class HealthRuleEvaluator(RuleEvaluator):
@@ -21,7 +21,8 @@ class HealthRuleEvaluator(RuleEvaluator):
                     "location": p.get("location"),
                     "patient_id": p.get("patient_id"),
                 },
-                deduplication_key=f"health_emergency_{p.get('patient_id')}"
+                deduplication_key=f"health_emergency_{p.get('patient_id')}",
+                priority=Priority.HIGH,
             ),
             DerivedEventSpec(
                 service="security",
@@ -32,6 +33,7 @@ class HealthRuleEvaluator(RuleEvaluator):
                     "location": p.get("location"),
                     "patient_id": p.get("patient_id"),
                 },
-                deduplication_key=f"health_emergency_{p.get('patient_id')}"
+                deduplication_key=f"health_emergency_{p.get('patient_id')}",
+                priority=Priority.HIGH,
             ),
         ]
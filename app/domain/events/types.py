@@ -2,9 +2,18 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+from enum import IntEnum
 from typing import Any, Dict, Optional
 
 
+class Priority(IntEnum):
+    """Delivery lane of a derived event; lower values are drained first."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
 @dataclass
 class NormalizedEvent:
     service: str
@@ -18,3 +27,4 @@ class DerivedEventSpec:
     service: str
     payload: Dict[str, Any]
     deduplication_key: Optional[str] = None
+    priority: Priority = Priority.NORMAL
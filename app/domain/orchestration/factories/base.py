@@ -4,6 +4,7 @@ from abc import ABC, abstractmethod
 
 from app.domain.events.normalization.base import EventNormalizer
 from app.domain.events.rules.base import RuleEvaluator
+from app.domain.orchestration.persistence import FULL_PERSISTENCE, PersistencePolicy
 
 
 class EventComponentsFactory(ABC):
@@ -14,3 +15,6 @@ class EventComponentsFactory(ABC):
     @abstractmethod
     def rule_evaluator(self) -> RuleEvaluator:
         raise NotImplementedError
+
+    def persistence_policy(self) -> PersistencePolicy:
+        return FULL_PERSISTENCE
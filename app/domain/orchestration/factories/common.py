@@ -11,6 +11,7 @@ from app.domain.orchestration.factories.base import EventComponentsFactory
 from app.domain.events.normalization.pydantic import PydanticEventNormalizer
 from app.domain.events.normalization.base import EventNormalizer
 from app.domain.events.rules.base import RuleEvaluator
+from app.domain.orchestration.persistence import FULL_PERSISTENCE, PersistencePolicy
 
 
 class NoopRuleEvaluator(RuleEvaluator):
@@ -19,12 +20,16 @@ class NoopRuleEvaluator(RuleEvaluator):
 
 
 class SimpleComponentsFactory(EventComponentsFactory):
-    def __init__(self, service: str, schema: Type[BaseModel]):
+    def __init__(self, service: str, schema: Type[BaseModel], persistence: PersistencePolicy = FULL_PERSISTENCE):
         self._service = service
         self._schema = schema
+        self._persistence = persistence
 
     def normalizer(self) -> EventNormalizer:
         return PydanticEventNormalizer(service=self._service, schema=self._schema)
 
     def rule_evaluator(self) -> RuleEvaluator:
         return NoopRuleEvaluator()
+
+    def persistence_policy(self) -> PersistencePolicy:
+        return self._persistence
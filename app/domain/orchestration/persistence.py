@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+FULL = "full"
+SAMPLED = "sampled"
+STATE = "state"
+DISCARD = "discard"
+MODES = (FULL, SAMPLED, STATE, DISCARD)
+
+
+@dataclass(frozen=True)
+class PersistencePolicy:
+    """Which ingested base events of a service get an ``events`` row.
+
+    - ``full``: every event.
+    - ``sampled``: one in ``sample_every`` events, or at most one per ``sample_seconds``
+      ``state_key`` value and UTC bucket of that many seconds (per service without a key).
+    - ``state``: none; only the latest state per ``state_key`` value is kept.
+    - ``discard``: none; the event is only evaluated and counted in the rollups.
+
+    With ``state_key`` set, every event also upserts its entity's latest state,
+    whatever the mode. Derived events are always stored, and so are base events that
+    have derived events or were sent with a dedupe key.
+    """
+
+    mode: str = FULL
+    sample_every: int | None = None
+    sample_seconds: int | None = None
+    state_key: str | None = None
+
+    def __post_init__(self):
+        if self.mode not in MODES:
+            raise ValueError(f"Invalid persistence mode {self.mode!r}, expected one of {MODES}")
+        if self.mode == SAMPLED and (self.sample_every is None) == (self.sample_seconds is None):
+            raise ValueError("A sampled policy needs exactly one of sample_every or sample_seconds")
+        if self.mode == STATE and not self.state_key:
+            raise ValueError("A state-only policy needs a state_key")
+
+
+FULL_PERSISTENCE = PersistencePolicy()
@@ -8,6 +8,7 @@ from app.domain.orchestration.factories.passthrough_factory import (
 )
 from app.domain.events.normalization.payloads import SecurityPayload, TransportPayload
 from app.domain.orchestration.factories.common import SimpleComponentsFactory
+from app.domain.orchestration.persistence import SAMPLED, PersistencePolicy
 
 
 class FactoryRegistry:
@@ -15,7 +16,13 @@ class FactoryRegistry:
         self._factories: dict[str, EventComponentsFactory] = {
             "health": HealthEventComponentsFactory(),
             "energy": EnergyEventComponentsFactory(),
-            "transport": SimpleComponentsFactory(service="transport", schema=TransportPayload),
+            # Buses ping every few seconds: keep each bus's latest position plus one
+            # ping per bus every 15 seconds as history.
+            "transport": SimpleComponentsFactory(
+                service="transport",
+                schema=TransportPayload,
+                persistence=PersistencePolicy(mode=SAMPLED, sample_seconds=15, state_key="bus_id"),
+            ),
             "security": SimpleComponentsFactory(service="security", schema=SecurityPayload),
         }
 
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How long a service's base events are kept at full resolution, and what happens after.
+
+    Events older than ``raw_days`` are thinned to the latest one per ``key_field`` value
+    per ``downsample_seconds`` bucket, e.g. the last position of each bus per minute.
+    Without ``downsample_seconds`` they are deleted outright. Events with derived
+    events are always kept, so lineage stays intact.
+    """
+
+    raw_days: int
+    downsample_seconds: int | None = None
+    key_field: str | None = None
+
+
+# Services not listed keep every event until its partition expires.
+RETENTION_POLICIES: Dict[str, RetentionPolicy] = {
+    "transport": RetentionPolicy(raw_days=3, downsample_seconds=60, key_field="bus_id"),
+}
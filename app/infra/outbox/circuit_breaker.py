@@ -0,0 +1,117 @@
+import os
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Callable, Dict, List
+
+FAILURE_THRESHOLD = int(os.getenv("OUTBOX_BREAKER_FAILURE_THRESHOLD", "5"))
+RESET_SECONDS = float(os.getenv("OUTBOX_BREAKER_RESET_SECONDS", "30.0"))
+HALF_OPEN_MAX_CALLS = int(os.getenv("OUTBOX_BREAKER_HALF_OPEN_MAX_CALLS", "1"))
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+TransitionListener = Callable[[str, BreakerState, BreakerState], None]
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for a single topic.
+
+    ``failure_threshold`` consecutive failures open the breaker. After ``reset_timeout``
+    it goes half-open and lets ``half_open_max_calls`` probes through: a successful
+    probe closes it again, a failed one re-opens it.
+    """
+
+    def __init__(
+        self,
+        topic: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: timedelta = timedelta(seconds=RESET_SECONDS),
+        half_open_max_calls: int = HALF_OPEN_MAX_CALLS,
+        on_transition: TransitionListener | None = None,
+    ):
+        self.topic = topic
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_at: datetime | None = None
+        self._half_open_calls = 0
+        self._on_transition = on_transition
+
+    def _transition(self, state: BreakerState, now: datetime) -> None:
+        previous, self.state = self.state, state
+        if state == BreakerState.OPEN:
+            self.opened_at = now
+        if state == BreakerState.HALF_OPEN:
+            self._half_open_calls = 0
+        if state == BreakerState.CLOSED:
+            self.failures = 0
+        if self._on_transition:
+            self._on_transition(self.topic, previous, state)
+
+    def current_state(self, now: datetime) -> BreakerState:
+        if self.state == BreakerState.OPEN and now >= self.opened_at + self.reset_timeout:
+            self._transition(BreakerState.HALF_OPEN, now)
+        return self.state
+
+    def allow_request(self, now: datetime) -> bool:
+        state = self.current_state(now)
+        if state == BreakerState.CLOSED:
+            return True
+        if state == BreakerState.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+        return False
+
+    def record_success(self, now: datetime) -> None:
+        if self.state == BreakerState.HALF_OPEN:
+            self._transition(BreakerState.CLOSED, now)
+        self.failures = 0
+
+    def record_failure(self, now: datetime) -> None:
+        self.failures += 1
+        if self.state == BreakerState.HALF_OPEN or (
+            self.state == BreakerState.CLOSED and self.failures >= self.failure_threshold
+        ):
+            self._transition(BreakerState.OPEN, now)
+
+
+class CircuitBreakerRegistry:
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: timedelta = timedelta(seconds=RESET_SECONDS),
+        half_open_max_calls: int = HALF_OPEN_MAX_CALLS,
+        on_transition: TransitionListener | None = None,
+    ):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._half_open_max_calls = half_open_max_calls
+        self._on_transition = on_transition
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, topic: str) -> CircuitBreaker:
+        if topic not in self._breakers:
+            self._breakers[topic] = CircuitBreaker(
+                topic,
+                failure_threshold=self._failure_threshold,
+                reset_timeout=self._reset_timeout,
+                half_open_max_calls=self._half_open_max_calls,
+                on_transition=self._on_transition,
+            )
+        return self._breakers[topic]
+
+    def open_topics(self, now: datetime) -> List[str]:
+        return sorted(
+            topic
+            for topic, breaker in self._breakers.items()
+            if breaker.current_state(now) == BreakerState.OPEN
+        )
+
+    def states(self, now: datetime) -> Dict[str, BreakerState]:
+        return {topic: breaker.current_state(now) for topic, breaker in self._breakers.items()}
@@ -0,0 +1,78 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.infra.persistence.models.outbox import OutboxMessage
+
+
+def outgoing_payload(msg: OutboxMessage) -> dict:
+    if msg.coalesced_count > 1:
+        return {**msg.payload, "coalesced_count": msg.coalesced_count}
+    return msg.payload
+
+
+def coalesce_messages(db: Session, msgs: List[OutboxMessage], now: datetime) -> List[OutboxMessage]:
+    """Collapse due pending messages that share a topic and dedup key into one message.
+
+    For every key present in ``msgs`` all due duplicates are considered, not only the
+    ones in the batch. The most recent message survives with the summed count and the
+    most urgent priority of its group; the others are marked ``coalesced`` in one
+    UPDATE. Returns the batch with each group replaced by its survivor.
+    """
+    keys = {(msg.topic, msg.dedup_key) for msg in msgs if msg.dedup_key}
+    if not keys:
+        return msgs
+
+    rows = db.execute(
+        select(
+            OutboxMessage.id,
+            OutboxMessage.topic,
+            OutboxMessage.dedup_key,
+            OutboxMessage.priority,
+            OutboxMessage.coalesced_count,
+        )
+        .where(
+            OutboxMessage.status == "pending",
+            OutboxMessage.next_attempt_at <= now,
+            OutboxMessage.topic.in_({topic for topic, _ in keys}),
+            OutboxMessage.dedup_key.in_({key for _, key in keys}),
+        )
+        .order_by(OutboxMessage.created_at.desc(), OutboxMessage.id.desc())
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    groups: Dict[Tuple[str, str], list] = defaultdict(list)
+    for row in rows:
+        if (row.topic, row.dedup_key) in keys:
+            groups[(row.topic, row.dedup_key)].append(row)
+
+    survivors = {}
+    collapsed = []
+    for key, group in groups.items():
+        if len(group) < 2:
+            continue
+        latest, duplicates = group[0], group[1:]
+        survivor = db.get(OutboxMessage, latest.id)
+        survivor.coalesced_count = sum(row.coalesced_count for row in group)
+        survivor.priority = min(row.priority for row in group)
+        survivors[key] = survivor
+        collapsed.extend(row.id for row in duplicates)
+
+    if not collapsed:
+        return msgs
+
+    db.execute(update(OutboxMessage).where(OutboxMessage.id.in_(collapsed)).values(status="coalesced"))
+
+    batch, seen = [], set()
+    for msg in msgs:
+        key = (msg.topic, msg.dedup_key)
+        if key in survivors:
+            if key not in seen:
+                seen.add(key)
+                batch.append(survivors[key])
+            continue
+        batch.append(msg)
+    return batch
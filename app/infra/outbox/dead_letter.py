@@ -0,0 +1,128 @@
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Sequence
+
+from sqlalchemy import delete, func, insert, literal, null, select
+from sqlalchemy.orm import Session
+
+from app.infra.persistence.models.outbox import OutboxMessage
+from app.infra.persistence.models.outbox_dead_letter import OutboxDeadLetter
+
+REPLAY_CHUNK_SIZE = int(os.getenv("OUTBOX_REPLAY_CHUNK_SIZE", "1000"))
+
+
+def dead_letter_messages(db: Session, ids: Sequence[uuid.UUID], now: datetime) -> int:
+    """Move the given outbox messages into the dead-letter table.
+
+    Pending changes are flushed first so the copied rows carry the final attempt count
+    and error. The caller owns the transaction.
+    """
+    if not ids:
+        return 0
+
+    db.flush()
+    db.execute(
+        insert(OutboxDeadLetter).from_select(
+            [
+                "id", "topic", "payload", "priority", "dedup_key", "coalesced_count",
+                "attempts", "last_error", "created_at", "last_attempt_at", "dead_lettered_at",
+            ],
+            select(
+                OutboxMessage.id,
+                OutboxMessage.topic,
+                OutboxMessage.payload,
+                OutboxMessage.priority,
+                OutboxMessage.dedup_key,
+                OutboxMessage.coalesced_count,
+                OutboxMessage.attempts,
+                OutboxMessage.last_error,
+                OutboxMessage.created_at,
+                literal(now, OutboxDeadLetter.last_attempt_at.type),
+                literal(now, OutboxDeadLetter.dead_lettered_at.type),
+            ).where(OutboxMessage.id.in_(ids)),
+        )
+    )
+    db.execute(delete(OutboxMessage).where(OutboxMessage.id.in_(ids)))
+    return len(ids)
+
+
+def _dead_letter_filter(topic: str | None, since: datetime | None, until: datetime | None) -> list:
+    conditions = []
+    if topic:
+        conditions.append(OutboxDeadLetter.topic == topic)
+    if since:
+        conditions.append(OutboxDeadLetter.dead_lettered_at >= since)
+    if until:
+        conditions.append(OutboxDeadLetter.dead_lettered_at < until)
+    return conditions
+
+
+def count_dead_letters(
+    db: Session,
+    topic: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> int:
+    return db.execute(
+        select(func.count()).select_from(OutboxDeadLetter).where(*_dead_letter_filter(topic, since, until))
+    ).scalar_one()
+
+
+def replay_dead_letters(
+    db: Session,
+    topic: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    chunk_size: int = REPLAY_CHUNK_SIZE,
+    now: datetime | None = None,
+) -> int:
+    """Re-enqueue dead-lettered messages as fresh pending outbox messages.
+
+    Rows are copied back with INSERT ... SELECT and removed from the dead-letter table
+    one committed chunk at a time, keeping their original id and created_at.
+    """
+    now = now or datetime.now(timezone.utc)
+    conditions = _dead_letter_filter(topic, since, until)
+
+    replayed = 0
+    while True:
+        ids = db.execute(
+            select(OutboxDeadLetter.id)
+            .where(*conditions)
+            .order_by(OutboxDeadLetter.dead_lettered_at.asc())
+            .limit(chunk_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not ids:
+            break
+
+        db.execute(
+            insert(OutboxMessage).from_select(
+                [
+                    "id", "topic", "payload", "priority", "dedup_key", "coalesced_count",
+                    "status", "attempts", "last_error", "next_attempt_at", "published_at", "created_at",
+                ],
+                select(
+                    OutboxDeadLetter.id,
+                    OutboxDeadLetter.topic,
+                    OutboxDeadLetter.payload,
+                    OutboxDeadLetter.priority,
+                    OutboxDeadLetter.dedup_key,
+                    OutboxDeadLetter.coalesced_count,
+                    literal("pending"),
+                    literal(0),
+                    null(),
+                    literal(now, OutboxMessage.next_attempt_at.type),
+                    null(),
+                    OutboxDeadLetter.created_at,
+                ).where(OutboxDeadLetter.id.in_(ids)),
+            )
+        )
+        db.execute(delete(OutboxDeadLetter).where(OutboxDeadLetter.id.in_(ids)))
+        db.commit()
+
+        replayed += len(ids)
+        if len(ids) < chunk_size:
+            break
+    return replayed
@@ -1,21 +1,45 @@
 from sqlalchemy.orm import Session
+from app.domain.events.types import Priority
 from app.infra.persistence.models.outbox import OutboxMessage
-from datetime import datetime, timezone
+from app.infra.persistence.repositories.outbox_repo import OutboxRepository
+from datetime import datetime, timedelta, timezone
 
 
 def topic_for_service(service: str) -> str:
     return f"event.{service}"
 
 
-def enqueue_notification(db: Session, service: str, payload: dict) -> OutboxMessage:
-    msg = OutboxMessage(
+def build_notification(
+    service: str,
+    payload: dict,
+    priority: Priority = Priority.NORMAL,
+    dedup_key: str | None = None,
+    next_attempt_at: datetime | None = None,
+    now: datetime | None = None,
+) -> OutboxMessage:
+    now = now or datetime.now(timezone.utc)
+    return OutboxMessage(
         topic=topic_for_service(service),
         payload=payload,
+        priority=int(priority),
+        dedup_key=dedup_key,
+        coalesced_count=1,
         status="pending",
         attempts=0,
+        next_attempt_at=next_attempt_at or now,
         published_at=None,
-        created_at=datetime.now(timezone.utc)
+        created_at=now
     )
-    db.add(msg)
-    db.commit()
-    return msg
\ No newline at end of file
+
+
+def enqueue_notification(
+    db: Session,
+    service: str,
+    payload: dict,
+    priority: Priority = Priority.NORMAL,
+    delay: timedelta = timedelta(0),
+    dedup_key: str | None = None,
+) -> OutboxMessage:
+    now = datetime.now(timezone.utc)
+    msg = build_notification(service, payload, priority, dedup_key, next_attempt_at=now + delay, now=now)
+    return OutboxRepository(db).add(msg)
@@ -0,0 +1,75 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+
+# Port for the Prometheus text endpoint (GET /metrics); unset disables it.
+METRICS_PORT = os.getenv("OUTBOX_METRICS_PORT")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape_label(value: str) -> str:
+    # Topics come from client-chosen service names; the text format needs these escaped.
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Minimal thread-safe counters and gauges rendered in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._types: Dict[str, str] = {}
+        self._values: Dict[Tuple[str, Labels], float] = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._types.setdefault(name, "counter")
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._types.setdefault(name, "gauge")
+            self._values[key] = value
+
+    def value(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._values.get((name, tuple(sorted(labels.items()))), 0.0)
+
+    def render(self) -> str:
+        with self._lock:
+            lines = []
+            for name in sorted(self._types):
+                lines.append(f"# TYPE {name} {self._types[name]}")
+                for (metric, labels), value in sorted(self._values.items()):
+                    if metric != name:
+                        continue
+                    label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels)
+                    lines.append(f"{name}{{{label_text}}} {value:g}" if label_text else f"{name} {value:g}")
+            return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def serve_metrics(port: int, registry: MetricsRegistry = metrics) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
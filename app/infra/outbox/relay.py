@@ -0,0 +1,88 @@
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Sequence
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal
+from app.infra.outbox.circuit_breaker import CircuitBreakerRegistry
+from app.infra.outbox.coalescing import outgoing_payload
+from app.infra.outbox.worker import publish
+from app.infra.persistence.models.outbox import OutboxMessage
+
+RELAY_ENABLED = os.getenv("OUTBOX_RELAY_ENABLED", "false").lower() in ("1", "true", "yes")
+# How long the polling worker leaves a freshly enqueued message to the relay.
+RELAY_GRACE_SECONDS = float(os.getenv("OUTBOX_RELAY_GRACE_SECONDS", "5.0"))
+
+# Per-topic breakers of this API process, so a failing sink is not hit on every ingest.
+relay_breakers = CircuitBreakerRegistry()
+
+
+def relay_messages(
+    ids: Sequence[uuid.UUID],
+    session_factory: Callable[[], Session] = SessionLocal,
+    breakers: CircuitBreakerRegistry | None = relay_breakers,
+) -> int:
+    """Publish the given committed outbox messages and mark the delivered ones as sent.
+
+    Messages that fail here, or whose topic's breaker is open, are left untouched for
+    the polling worker, which picks them up once their grace period is over.
+    """
+    db = session_factory()
+    try:
+        msgs = db.execute(
+            select(OutboxMessage)
+            .where(OutboxMessage.id.in_(ids), OutboxMessage.status == "pending")
+            .order_by(OutboxMessage.priority.asc(), OutboxMessage.created_at.asc())
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+
+        sent = []
+        now = datetime.now(timezone.utc)
+        for msg in msgs:
+            breaker = breakers.get(msg.topic) if breakers else None
+            if breaker and not breaker.allow_request(now):
+                continue
+            try:
+                publish(msg.topic, outgoing_payload(msg))
+                sent.append(msg.id)
+                if breaker:
+                    breaker.record_success(now)
+            except Exception as e:
+                if breaker:
+                    breaker.record_failure(now)
+                print(f"Relay failed to publish message {msg.id}, leaving it to the worker: {e}")
+
+        if sent:
+            db.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.id.in_(sent))
+                .values(status="sent", published_at=datetime.now(timezone.utc))
+            )
+        db.commit()
+        return len(sent)
+    except Exception as e:
+        print(f"Error relaying outbox messages: {e}")
+        db.rollback()
+        return 0
+    finally:
+        db.close()
+
+
+class OutboxRelay:
+    """Collects the outbox messages of one ingest and hands them to ``schedule`` after commit."""
+
+    def __init__(self, schedule: Callable[..., Any], grace: timedelta = timedelta(seconds=RELAY_GRACE_SECONDS)):
+        self._schedule = schedule
+        self._ids: List[uuid.UUID] = []
+        self.grace = grace
+
+    def track(self, msg_id: uuid.UUID) -> None:
+        self._ids.append(msg_id)
+
+    def flush(self) -> None:
+        if self._ids:
+            self._schedule(relay_messages, list(self._ids))
+            self._ids.clear()
@@ -0,0 +1,122 @@
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.db import create_db_engine
+from app.infra.persistence.models.outbox import OutboxMessage
+from app.infra.persistence.models.outbox_archive import OutboxArchivedMessage
+
+RETENTION_DAYS = float(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+# Per-topic overrides, e.g. "event.transport=1,event.security=30"
+RETENTION_TOPIC_DAYS = os.getenv("OUTBOX_RETENTION_TOPIC_DAYS", "")
+ARCHIVE_CHUNK_SIZE = int(os.getenv("OUTBOX_ARCHIVE_CHUNK_SIZE", "1000"))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("OUTBOX_ARCHIVE_INTERVAL_SECONDS", "300"))
+
+TERMINAL_STATUSES = ("sent", "failed", "coalesced")
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    default: timedelta
+    per_topic: Dict[str, timedelta] = field(default_factory=dict)
+
+    def for_topic(self, topic: str) -> timedelta:
+        return self.per_topic.get(topic, self.default)
+
+
+def parse_topic_retention(spec: str) -> Dict[str, timedelta]:
+    per_topic: Dict[str, timedelta] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        topic, sep, days = item.partition("=")
+        if not sep or not topic.strip():
+            raise ValueError(f"Invalid retention override {item!r}, expected 'topic=days'")
+        per_topic[topic.strip()] = timedelta(days=float(days))
+    return per_topic
+
+
+def policy_from_env() -> RetentionPolicy:
+    return RetentionPolicy(
+        default=timedelta(days=RETENTION_DAYS),
+        per_topic=parse_topic_retention(RETENTION_TOPIC_DAYS),
+    )
+
+
+def _archive_chunk(db: Session, conditions: list, now: datetime, chunk_size: int) -> int:
+    ids: List = db.execute(
+        select(OutboxMessage.id)
+        .where(OutboxMessage.status.in_(TERMINAL_STATUSES), *conditions)
+        .order_by(OutboxMessage.created_at.asc())
+        .limit(chunk_size)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not ids:
+        return 0
+
+    columns = [column.name for column in OutboxMessage.__table__.columns]
+    db.execute(
+        insert(OutboxArchivedMessage).from_select(
+            columns + ["archived_at"],
+            select(*OutboxMessage.__table__.columns, literal(now, OutboxArchivedMessage.archived_at.type))
+            .where(OutboxMessage.id.in_(ids)),
+        )
+    )
+    db.execute(delete(OutboxMessage).where(OutboxMessage.id.in_(ids)))
+    db.commit()
+    return len(ids)
+
+
+def archive_expired_messages(
+    db: Session,
+    policy: RetentionPolicy,
+    now: datetime | None = None,
+    chunk_size: int = ARCHIVE_CHUNK_SIZE,
+) -> int:
+    """Move finished messages past their topic's retention into the archive table.
+
+    Each chunk is committed on its own so locks and transaction size stay bounded.
+    """
+    now = now or datetime.now(timezone.utc)
+    passes = [
+        [OutboxMessage.topic == topic, OutboxMessage.created_at < now - retention]
+        for topic, retention in policy.per_topic.items()
+    ]
+    passes.append([OutboxMessage.topic.not_in(list(policy.per_topic)), OutboxMessage.created_at < now - policy.default])
+
+    archived = 0
+    for conditions in passes:
+        while True:
+            moved = _archive_chunk(db, conditions, now, chunk_size)
+            archived += moved
+            if moved < chunk_size:
+                break
+    return archived
+
+
+def main() -> None:
+    engine = create_db_engine(settings.DATABASE_URL, f"{settings.DB_APPLICATION_NAME}-outbox-retention")
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    policy = policy_from_env()
+
+    print("Starting outbox retention archiver")
+    while True:
+        db = SessionLocal()
+        try:
+            archived = archive_expired_messages(db, policy)
+            if archived:
+                print(f"Archived {archived} outbox messages")
+        except Exception as e:
+            print(f"Error archiving outbox messages: {e}")
+            db.rollback()
+        finally:
+            db.close()
+        time.sleep(ARCHIVE_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from typing import Callable, Dict, List
+
+from app.infra.outbox.metrics import METRICS_PORT
+from app.infra.outbox.worker import WorkerShard, run_worker
+
+WORKERS = int(os.getenv("OUTBOX_WORKERS", str(os.cpu_count() or 1)))
+# Optional explicit topic groups, one worker each, e.g. "event.transport;event.security,event.health".
+# The remaining OUTBOX_WORKERS (at least one) split every other topic into hash partitions
+# of the message id; without groups all workers do.
+SHARD_TOPICS = os.getenv("OUTBOX_SHARD_TOPICS", "")
+SHUTDOWN_TIMEOUT_SECONDS = float(os.getenv("OUTBOX_SHUTDOWN_TIMEOUT_SECONDS", "30.0"))
+RESTART_DELAY_SECONDS = float(os.getenv("OUTBOX_RESTART_DELAY_SECONDS", "1.0"))
+
+
+def build_shards(workers: int, topic_spec: str = "") -> List[WorkerShard]:
+    if not 1 <= workers <= 256:
+        raise ValueError("OUTBOX_WORKERS must be between 1 and 256")
+    groups = [
+        tuple(topic.strip() for topic in group.split(",") if topic.strip())
+        for group in topic_spec.split(";")
+        if group.strip()
+    ]
+    if not groups:
+        return [WorkerShard(index=i, count=workers) for i in range(workers)]
+    shards = [WorkerShard(index=i, topics=topics) for i, topics in enumerate(groups)]
+    # Topics nobody listed, e.g. new passthrough services, still need a worker.
+    listed = tuple(topic for group in groups for topic in group)
+    rest = max(1, workers - len(groups))
+    shards += [
+        WorkerShard(index=len(groups) + i, count=rest, excluded_topics=listed, partition=i)
+        for i in range(rest)
+    ]
+    return shards
+
+
+def _worker_process(shard: WorkerShard) -> None:
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    # Ctrl+C reaches the whole process group; let the supervisor decide when to stop.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    metrics_port = int(METRICS_PORT) + shard.index if METRICS_PORT else None
+    run_worker(stop, shard=shard, metrics_port=metrics_port)
+
+
+class Supervisor:
+    """Runs one worker process per shard, restarts crashed ones and stops them gracefully.
+
+    On ``stop`` every child gets SIGTERM, finishes and commits its in-flight batch and
+    exits; children still running after ``shutdown_timeout`` are killed.
+    """
+
+    def __init__(
+        self,
+        shards: List[WorkerShard],
+        spawn: Callable[[WorkerShard], multiprocessing.Process] | None = None,
+        shutdown_timeout: float = SHUTDOWN_TIMEOUT_SECONDS,
+        restart_delay: float = RESTART_DELAY_SECONDS,
+    ):
+        self._shards = shards
+        self._spawn = spawn or self._spawn_process
+        self._shutdown_timeout = shutdown_timeout
+        self._restart_delay = restart_delay
+        self._children: Dict[int, multiprocessing.Process] = {}
+        self.stopping = threading.Event()
+        self.restarts = 0
+
+    @staticmethod
+    def _spawn_process(shard: WorkerShard) -> multiprocessing.Process:
+        process = multiprocessing.Process(
+            target=_worker_process,
+            args=(shard,),
+            name=f"outbox-worker-{shard.index}",
+        )
+        process.start()
+        return process
+
+    def start(self) -> None:
+        for shard in self._shards:
+            self._children[shard.index] = self._spawn(shard)
+
+    def check_children(self) -> None:
+        for shard in self._shards:
+            child = self._children[shard.index]
+            if child.is_alive() or self.stopping.is_set():
+                continue
+            print(f"Outbox worker {shard.index} exited with code {child.exitcode}, restarting")
+            self.restarts += 1
+            self._children[shard.index] = self._spawn(shard)
+
+    def run(self) -> None:
+        self.start()
+        while not self.stopping.wait(self._restart_delay):
+            self.check_children()
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        self.stopping.set()
+        for child in self._children.values():
+            if child.is_alive():
+                child.terminate()
+        deadline = time.monotonic() + self._shutdown_timeout
+        for child in self._children.values():
+            child.join(max(0.0, deadline - time.monotonic()))
+            if child.is_alive():
+                print(f"{child.name} did not stop within {self._shutdown_timeout}s, killing it")
+                child.kill()
+                child.join()
+
+
+def main() -> None:
+    shards = build_shards(WORKERS, SHARD_TOPICS)
+    supervisor = Supervisor(shards)
+    signal.signal(signal.SIGTERM, lambda signum, frame: supervisor.stopping.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: supervisor.stopping.set())
+
+    print(f"Starting outbox supervisor with {len(shards)} workers")
+    supervisor.run()
+    print("Outbox supervisor stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,268 @@
 import os
-import time
-from datetime import datetime, timezone
+import random
+import signal
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Sequence, Tuple
 
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Text, and_, cast, func, select
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.core.db import create_db_engine
+from app.domain.events.types import Priority
+from app.infra.outbox.circuit_breaker import BreakerState, CircuitBreakerRegistry
+from app.infra.outbox.coalescing import coalesce_messages, outgoing_payload
+from app.infra.outbox.dead_letter import dead_letter_messages
+from app.infra.outbox.metrics import METRICS_PORT, metrics, serve_metrics
 from app.infra.persistence.models.outbox import OutboxMessage
 
 POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "1.0"))
 BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
 MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+BACKOFF_BASE_SECONDS = float(os.getenv("OUTBOX_BACKOFF_BASE_SECONDS", "2.0"))
+BACKOFF_MAX_SECONDS = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", "300.0"))
+# Share of each batch reserved for a priority lane, e.g. "high=6,normal=3,low=1"
+LANE_WEIGHTS = os.getenv("OUTBOX_LANE_WEIGHTS", "high=6,normal=3,low=1")
+COALESCE_ENABLED = os.getenv("OUTBOX_COALESCE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class WorkerShard:
+    """Slice of the outbox owned by one worker process.
+
+    Either an explicit set of topics, or one of ``count`` hash partitions of the
+    message id (by its first two hex digits, so the filter works on any dialect),
+    optionally restricted to topics outside ``excluded_topics``. ``partition``
+    picks the hash partition and defaults to ``index``.
+    """
+
+    index: int = 0
+    count: int = 1
+    topics: Tuple[str, ...] = ()
+    excluded_topics: Tuple[str, ...] = ()
+    partition: int | None = None
+
+    def condition(self):
+        if self.topics:
+            return OutboxMessage.topic.in_(self.topics)
+        clauses = []
+        if self.excluded_topics:
+            clauses.append(OutboxMessage.topic.not_in(self.excluded_topics))
+        if self.count > 1:
+            partition = self.index if self.partition is None else self.partition
+            buckets = [f"{bucket:02x}" for bucket in range(256) if bucket % self.count == partition]
+            clauses.append(func.substr(cast(OutboxMessage.id, Text), 1, 2).in_(buckets))
+        return and_(*clauses) if clauses else None
 
 
 def publish(topic: str, payload: dict) -> None:
     print(f"Publishing message to topic: {topic} with payload: {payload}")
 
 
-def main() -> None:
-    engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+def backoff_delay(
+    attempts: int,
+    base: float = BACKOFF_BASE_SECONDS,
+    cap: float = BACKOFF_MAX_SECONDS,
+    rng: Callable[[], float] = random.random,
+) -> timedelta:
+    # Exponential backoff with "equal jitter": half of the window is fixed so a
+    # broken sink is never retried immediately, the other half is randomized so
+    # messages that failed together do not come back together.
+    window = min(cap, base * (2 ** max(attempts - 1, 0)))
+    return timedelta(seconds=window / 2 + rng() * window / 2)
+
+
+def parse_lane_weights(spec: str) -> Dict[Priority, int]:
+    weights = {lane: 0 for lane in Priority}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, sep, weight = item.partition("=")
+        if not sep or name.strip().upper() not in Priority.__members__:
+            raise ValueError(f"Invalid lane weight {item!r}, expected e.g. 'high=6'")
+        weights[Priority[name.strip().upper()]] = int(weight)
+    if not any(weights.values()):
+        raise ValueError("At least one lane needs a positive weight")
+    return weights
+
+
+def lane_quotas(limit: int, weights: Dict[Priority, int]) -> Dict[Priority, int]:
+    # Every weighted lane is guaranteed one slot so it cannot be starved; the rest
+    # of the batch is split by weight and the rounding remainder goes to the most
+    # urgent lanes.
+    quotas = {lane: 0 for lane in weights}
+    weighted = [lane for lane in sorted(weights) if weights[lane] > 0]
+    for lane in weighted[:limit]:
+        quotas[lane] = 1
+
+    remaining = limit - sum(quotas.values())
+    total = sum(weights[lane] for lane in weighted)
+    for lane in weighted:
+        quotas[lane] += remaining * weights[lane] // total
+    for lane in weighted:
+        if sum(quotas.values()) >= limit:
+            break
+        quotas[lane] += 1
+    return quotas
+
+
+def _fetch_lane(
+    db: Session,
+    lane: Priority,
+    now: datetime,
+    offset: int,
+    limit: int,
+    filters: list,
+) -> List[OutboxMessage]:
+    if limit <= 0:
+        return []
+    return db.execute(
+        select(OutboxMessage)
+        .where(
+            OutboxMessage.status == "pending",
+            OutboxMessage.priority == int(lane),
+            OutboxMessage.next_attempt_at <= now,
+            *filters,
+        )
+        .order_by(OutboxMessage.next_attempt_at.asc(), OutboxMessage.created_at.asc())
+        .offset(offset)
+        .limit(limit)
+        # Rows claimed by another worker are skipped rather than published twice.
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+
+
+def fetch_due_messages(
+    db: Session,
+    now: datetime,
+    limit: int = BATCH_SIZE,
+    weights: Dict[Priority, int] | None = None,
+    exclude_topics: Sequence[str] = (),
+    shard: WorkerShard | None = None,
+) -> List[OutboxMessage]:
+    """Fetch due messages lane by lane using weighted fair sharing.
+
+    Each lane first gets its weighted share of the batch; slots a lane cannot fill are
+    handed to the other lanes in priority order. The result is ordered by priority,
+    then by age. Messages for ``exclude_topics`` or outside ``shard`` are skipped.
+    """
+    filters = []
+    if exclude_topics:
+        filters.append(OutboxMessage.topic.not_in(exclude_topics))
+    if shard is not None and shard.condition() is not None:
+        filters.append(shard.condition())
+
+    quotas = lane_quotas(limit, weights or parse_lane_weights(LANE_WEIGHTS))
+    batch = {lane: _fetch_lane(db, lane, now, 0, quotas[lane], filters) for lane in sorted(quotas)}
+
+    for lane in sorted(quotas):
+        spare = limit - sum(len(msgs) for msgs in batch.values())
+        if spare <= 0:
+            break
+        if len(batch[lane]) < quotas[lane]:
+            continue
+        batch[lane] += _fetch_lane(db, lane, now, len(batch[lane]), spare, filters)
+
+    return [msg for lane in sorted(batch) for msg in batch[lane]]
+
+
+def record_breaker_transition(topic: str, previous: BreakerState, state: BreakerState) -> None:
+    metrics.inc("outbox_circuit_breaker_transitions_total", topic=topic, from_state=previous.value, to_state=state.value)
+    print(f"Circuit breaker for {topic}: {previous.value} -> {state.value}")
+
+
+def export_breaker_states(breakers: CircuitBreakerRegistry, now: datetime) -> None:
+    for topic, current in breakers.states(now).items():
+        for state in BreakerState:
+            metrics.set("outbox_circuit_breaker_state", 1.0 if state == current else 0.0, topic=topic, state=state.value)
+
+
+def process_batch(
+    db: Session,
+    now: datetime | None = None,
+    breakers: CircuitBreakerRegistry | None = None,
+    shard: WorkerShard | None = None,
+) -> int:
+    now = now or datetime.now(timezone.utc)
+    open_topics = breakers.open_topics(now) if breakers else []
+    msgs = fetch_due_messages(db, now, exclude_topics=open_topics, shard=shard)
+    if COALESCE_ENABLED:
+        msgs = coalesce_messages(db, msgs, now)
+    exhausted = []
+
+    for msg in msgs:
+        breaker = breakers.get(msg.topic) if breakers else None
+        if breaker and not breaker.allow_request(now):
+            # Left pending without consuming an attempt; the topic is skipped by the
+            # fetch query until its breaker lets probes through again.
+            continue
+
+        try:
+            publish(msg.topic, outgoing_payload(msg))
+            msg.status = "sent"
+            msg.published_at = datetime.now(timezone.utc)
+            metrics.inc("outbox_messages_published_total", topic=msg.topic)
+            if breaker:
+                breaker.record_success(now)
+        except Exception as e:
+            metrics.inc("outbox_publish_failures_total", topic=msg.topic)
+            if breaker:
+                breaker.record_failure(now)
+            msg.attempts += 1
+            msg.last_error = repr(e)
+            if msg.attempts >= MAX_ATTEMPTS:
+                exhausted.append(msg.id)
+            else:
+                msg.next_attempt_at = now + backoff_delay(msg.attempts)
+            print(f"Failed to publish message {msg.id} (attempt {msg.attempts}): {e}")
+
+    dead_letter_messages(db, exhausted, now)
+    db.commit()
+    if breakers:
+        export_breaker_states(breakers, now)
+    return len(msgs)
+
+
+def run_worker(
+    stop: threading.Event,
+    shard: WorkerShard | None = None,
+    metrics_port: int | None = None,
+) -> None:
+    """Poll and publish until ``stop`` is set.
+
+    ``stop`` is only checked between batches, so a batch that has started is always
+    published and committed before the worker exits.
+    """
+    name = f"{settings.DB_APPLICATION_NAME}-outbox-worker"
+    engine = create_db_engine(settings.DATABASE_URL, f"{name}-{shard.index}" if shard else name)
     SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
-    print("Starting outbox worker")
-    while True:
+    breakers = CircuitBreakerRegistry(on_transition=record_breaker_transition)
+    if metrics_port:
+        serve_metrics(metrics_port)
+
+    print(f"Starting outbox worker {shard or ''}".rstrip())
+    while not stop.is_set():
         db = SessionLocal()
         try:
-            msgs = db.execute(
-                select(OutboxMessage)
-                .where(OutboxMessage.status == "pending")
-                .order_by(OutboxMessage.created_at.asc())
-                .limit(BATCH_SIZE)
-            ).scalars().all()
-
-            if not msgs:
-                time.sleep(POLL_SECONDS)
-                continue
-
-            for msg in msgs:
-                if msg.attempts >= MAX_ATTEMPTS:
-                    msg.status = "failed"
-                    continue
-
-                try:
-                    publish(msg.topic, msg.payload)
-                    msg.status = "sent"
-                    msg.published_at = datetime.now(timezone.utc)
-                except Exception as e:
-                    msg.attempts += 1
-
-            db.commit()
+            process_batch(db, breakers=breakers, shard=shard)
         except Exception as e:
             print(f"Error processing outbox messages: {e}")
             db.rollback()
         finally:
             db.close()
-        time.sleep(POLL_SECONDS)
+        stop.wait(POLL_SECONDS)
+
+    engine.dispose()
+    print("Outbox worker stopped")
+
+
+def main() -> None:
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    run_worker(stop, metrics_port=int(METRICS_PORT) if METRICS_PORT else None)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,131 @@
+"""
+Bulk write paths shared by the repositories.
+
+``add_many`` picks one of three strategies by batch size:
+
+- below ``BULK_INSERT_MIN_ROWS`` the entities go through the session, so they stay
+  attached and behave exactly like ``add``;
+- up to ``COPY_MIN_ROWS`` they are written with multi-row ``INSERT ... VALUES``
+  statements of ``INSERT_CHUNK_SIZE`` rows each;
+- from ``COPY_MIN_ROWS`` on, Postgres connections using psycopg2 stream them with
+  ``COPY ... FROM STDIN`` in CSV format.
+
+The last two skip the unit of work entirely: every column is resolved in Python
+(including ``func.now()`` defaults) before writing, so the returned entities carry
+their final values but are not attached to the session. The defaults come from
+``python -m benchmarks.bulk_insert``.
+"""
+import io
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Sequence, TypeVar
+
+from sqlalchemy import Table, insert
+from sqlalchemy.orm import Session
+
+from app.core.db import Base
+from app.core.serialization import json_dumps
+
+BULK_INSERT_MIN_ROWS = int(os.getenv("DB_BULK_INSERT_MIN_ROWS", "50"))
+INSERT_CHUNK_SIZE = int(os.getenv("DB_INSERT_CHUNK_SIZE", "500"))
+COPY_MIN_ROWS = int(os.getenv("DB_COPY_MIN_ROWS", "5000"))
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+
+def resolve_rows(entities: Sequence[Base]) -> List[Dict[str, Any]]:
+    """Fill in column defaults on ``entities`` and return one value dict per entity.
+
+    Callable and scalar defaults are evaluated per entity; SQL defaults such as
+    ``func.now()`` resolve to one UTC timestamp shared by the whole batch, the way a
+    single transaction would see them.
+    """
+    now = datetime.now(timezone.utc)
+    rows = []
+    for entity in entities:
+        table = entity.__table__
+        row = {}
+        for column in table.columns:
+            value = getattr(entity, column.key)
+            if value is None and column.default is not None:
+                default = column.default
+                if default.is_callable:
+                    value = default.arg(None)
+                elif default.is_clause_element:
+                    value = now
+                else:
+                    value = default.arg
+                setattr(entity, column.key, value)
+            row[column.key] = value
+        rows.append(row)
+    return rows
+
+
+def insert_rows(db: Session, table: Table, rows: List[Dict[str, Any]], chunk_size: int = INSERT_CHUNK_SIZE) -> None:
+    """Write ``rows`` as multi-row ``INSERT ... VALUES`` statements of ``chunk_size`` rows."""
+    for start in range(0, len(rows), chunk_size):
+        db.execute(insert(table).values(rows[start:start + chunk_size]))
+
+
+def _csv_field(value: Any) -> str:
+    # Quote everything but NULL: an unquoted empty field is NULL in Postgres CSV,
+    # while a quoted one is an empty string.
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        value = json_dumps(value)
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, bool):
+        value = "t" if value else "f"
+    elif not isinstance(value, str):
+        value = str(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+def copy_csv(table: Table, rows: List[Dict[str, Any]]) -> io.StringIO:
+    """Render ``rows`` as the CSV body of ``COPY table FROM STDIN``."""
+    buffer = io.StringIO()
+    columns = [column.key for column in table.columns]
+    for row in rows:
+        buffer.write(",".join(_csv_field(row[column]) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def copy_rows(db: Session, table: Table, rows: List[Dict[str, Any]]) -> None:
+    """Stream ``rows`` into ``table`` with ``COPY`` on the session's own connection."""
+    connection = db.connection()
+    quote = connection.dialect.identifier_preparer
+    columns = ", ".join(quote.format_column(column) for column in table.columns)
+    statement = f"COPY {quote.format_table(table)} ({columns}) FROM STDIN WITH (FORMAT csv)"
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(statement, copy_csv(table, rows))
+    finally:
+        cursor.close()
+
+
+def supports_copy(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def add_many(db: Session, entities: Iterable[ModelT]) -> List[ModelT]:
+    """Persist ``entities`` with the cheapest write path for their count; see the module docstring."""
+    entities = list(entities)
+    if not entities:
+        return entities
+    if len(entities) < BULK_INSERT_MIN_ROWS:
+        db.add_all(entities)
+        db.flush()
+        return entities
+
+    table = entities[0].__table__
+    rows = resolve_rows(entities)
+    if len(rows) >= COPY_MIN_ROWS and supports_copy(db):
+        copy_rows(db, table, rows)
+    else:
+        insert_rows(db, table, rows)
+    return entities
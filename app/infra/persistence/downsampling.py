@@ -0,0 +1,160 @@
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.db import create_db_engine
+from app.domain.orchestration.retention import RETENTION_POLICIES, RetentionPolicy
+from app.infra.persistence.models.event import Event
+from app.infra.persistence.models.event_retention_watermark import EventRetentionWatermark
+
+# Rows read, and at most deleted, per transaction.
+DOWNSAMPLE_BATCH_SIZE = int(os.getenv("EVENTS_DOWNSAMPLE_BATCH_SIZE", "5000"))
+DOWNSAMPLE_INTERVAL_SECONDS = float(os.getenv("EVENTS_DOWNSAMPLE_INTERVAL_SECONDS", "600"))
+
+Candidate = Tuple[object, datetime]
+
+
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _bucket_start(value: datetime, seconds: int) -> datetime:
+    epoch = int(_epoch(value))
+    return datetime.fromtimestamp(epoch - epoch % seconds, timezone.utc)
+
+
+def _delete_childless(db: Session, candidates: List[Candidate]) -> int:
+    """Delete the candidate events that have no derived events; return how many went."""
+    if not candidates:
+        return 0
+    ids = [event_id for event_id, _ in candidates]
+    parents = set(db.execute(select(Event.source_event_id).where(Event.source_event_id.in_(ids))).scalars())
+    doomed = [(event_id, created_at) for event_id, created_at in candidates if event_id not in parents]
+    if not doomed:
+        return 0
+    # The created_at bounds let PostgreSQL prune the delete to the partitions involved.
+    created = [created_at for _, created_at in doomed]
+    db.execute(
+        delete(Event)
+        .where(
+            Event.id.in_([event_id for event_id, _ in doomed]),
+            Event.created_at >= min(created),
+            Event.created_at <= max(created),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return len(doomed)
+
+
+def _save_watermark(db: Session, service: str, processed_until: datetime) -> None:
+    watermark = db.get(EventRetentionWatermark, service)
+    if watermark is None:
+        db.add(EventRetentionWatermark(service=service, processed_until=processed_until))
+    else:
+        watermark.processed_until = processed_until
+
+
+def apply_retention_policy(
+    db: Session,
+    service: str,
+    policy: RetentionPolicy,
+    now: datetime | None = None,
+    batch_size: int = DOWNSAMPLE_BATCH_SIZE,
+) -> int:
+    """Thin or delete ``service``'s base events older than ``policy.raw_days``.
+
+    Events count as old when both their reading ``timestamp`` and their ``created_at``
+    are before the cutoff. They are read in ``created_at`` order from the service's
+    watermark in keyset batches, which keeps every scan and delete within the old
+    partitions, and each batch's deletes are committed together with the advanced
+    watermark. When downsampling, events are bucketed by ``timestamp``, so history
+    imported in one go is thinned by when the readings were taken. An event is
+    deleted as soon as one with the same key and bucket and a later ``timestamp``
+    (then ``created_at``, then id) shows up in the same run, so only the latest per
+    key and bucket survives; rows of one bucket processed by different runs may each
+    leave one. Returns the number of events deleted.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=policy.raw_days)
+    if policy.downsample_seconds:
+        cutoff = _bucket_start(cutoff, policy.downsample_seconds)
+
+    watermark = db.get(EventRetentionWatermark, service)
+    query = select(Event.id, Event.created_at, Event.timestamp, Event.normalized_payload).where(
+        Event.service == service,
+        Event.source_event_id.is_(None),
+        Event.created_at < cutoff,
+        # Readings from the future of their ingestion time are left alone.
+        Event.timestamp < cutoff,
+    )
+    if watermark:
+        query = query.where(Event.created_at >= watermark.processed_until)
+    query = query.order_by(Event.created_at, Event.id).limit(batch_size)
+
+    deleted = 0
+    position = None
+    # Latest event seen so far per (bucket, key), ranked by (timestamp, created_at, id).
+    latest: Dict[Tuple[datetime, str], Tuple[Tuple[float, float, str], Candidate]] = {}
+    while True:
+        page = query if position is None else query.where(tuple_(Event.created_at, Event.id) > tuple_(*position))
+        rows = db.execute(page).all()
+        if not rows:
+            break
+
+        candidates: List[Candidate] = []
+        for row in rows:
+            if not policy.downsample_seconds:
+                candidates.append((row.id, row.created_at))
+                continue
+            payload = row.normalized_payload or {}
+            key = str(payload.get(policy.key_field)) if policy.key_field else ""
+            group = (_bucket_start(row.timestamp, policy.downsample_seconds), key)
+            rank = (_epoch(row.timestamp), _epoch(row.created_at), str(row.id))
+            candidate = (row.id, row.created_at)
+            if group not in latest:
+                latest[group] = (rank, candidate)
+            elif latest[group][0] < rank:
+                candidates.append(latest[group][1])
+                latest[group] = (rank, candidate)
+            else:
+                candidates.append(candidate)
+
+        deleted += _delete_childless(db, candidates)
+        position = (rows[-1].created_at, rows[-1].id)
+        _save_watermark(db, service, rows[-1].created_at)
+        db.commit()
+
+    _save_watermark(db, service, cutoff)
+    db.commit()
+    return deleted
+
+
+def main() -> None:
+    engine = create_db_engine(settings.DATABASE_URL, f"{settings.DB_APPLICATION_NAME}-events-downsampling")
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    print(f"Starting events downsampling for {', '.join(sorted(RETENTION_POLICIES)) or 'no services'}")
+    while True:
+        for service, policy in RETENTION_POLICIES.items():
+            db = SessionLocal()
+            try:
+                deleted = apply_retention_policy(db, service, policy)
+                if deleted:
+                    print(f"Deleted {deleted} old {service} events")
+            except Exception as e:
+                print(f"Error applying {service} retention policy: {e}")
+                db.rollback()
+            finally:
+                db.close()
+        time.sleep(DOWNSAMPLE_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
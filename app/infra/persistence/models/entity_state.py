@@ -0,0 +1,28 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class EntityState(Base):
+    """Latest normalized payload of one entity (e.g. one bus) of a service.
+
+    Written by services whose persistence policy has a ``state_key`` (see
+    app/domain/orchestration/persistence.py): one row per entity, overwritten in
+    place instead of growing ``events``.
+    """
+
+    __tablename__ = "entity_states"
+
+    service: Mapped[str] = mapped_column(Text, primary_key=True)
+    entity_key: Mapped[str] = mapped_column(Text, primary_key=True)
+
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    payload: Mapped[dict] = mapped_column(JSONB)
+    # The base event the state came from; it is only in ``events`` if the policy kept it.
+    event_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
@@ -1,24 +1,67 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Text, func
+from sqlalchemy import DateTime, Index, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
 
 
+# Normalized payload fields operators filter on, per service. Each listed service gets a
+# partial GIN (jsonb_path_ops) index on normalized_payload serving containment (@>) queries.
+PAYLOAD_KEY_FIELDS = {
+    "energy": ("neighborhood",),
+    "health": ("patient_id", "location"),
+    "transport": ("bus_id",),
+    "security": ("camera_trigger",),
+}
+
+
+def _payload_index(service: str) -> Index:
+    return Index(
+        f"ix_events_{service}_normalized_payload",
+        "normalized_payload",
+        postgresql_using="gin",
+        postgresql_ops={"normalized_payload": "jsonb_path_ops"},
+        postgresql_where=text(f"service = '{service}'"),
+    )
+
+
 class Event(Base):
+    # On PostgreSQL the table is range-partitioned by created_at (see
+    # app/infra/persistence/partitions.py) and its primary key is (id, created_at).
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset pagination order (created_at, id), alone and behind each equality filter
+        # of GET /events, so every filtered page is a single index range scan.
+        Index("ix_events_created_at_id", "created_at", "id"),
+        Index("ix_events_service_created_at_id", "service", "created_at", "id"),
+        Index("ix_events_source_event_id_created_at_id", "source_event_id", "created_at", "id"),
+        Index("ix_events_deduplication_key_created_at_id", "deduplication_key", "created_at", "id"),
+        *(_payload_index(service) for service in PAYLOAD_KEY_FIELDS),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    service: Mapped[str] = mapped_column(Text, index=True)
+    service: Mapped[str] = mapped_column(Text)
     timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
 
-    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # SQL NULL when it is identical to normalized_payload (see payload_storage.py); read
+    # raw_payload to get it back either way.
+    payload: Mapped[dict | None] = mapped_column(JSONB(none_as_null=True), nullable=True)
     normalized_payload: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
-    source_event_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), index=True)
-    deduplication_key: Mapped[str | None] = mapped_column(Text, index=True)
+    source_event_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    deduplication_key: Mapped[str | None] = mapped_column(Text)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+
+    @hybrid_property
+    def raw_payload(self) -> dict:
+        return self.payload if self.payload is not None else self.normalized_payload
+
+    @raw_payload.inplace.expression
+    @classmethod
+    def _raw_payload_expression(cls):
+        return func.coalesce(cls.payload, cls.normalized_payload)
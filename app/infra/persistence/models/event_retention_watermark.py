@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class EventRetentionWatermark(Base):
+    """How far the downsampling job has finished a service, so later runs skip that range."""
+
+    __tablename__ = "event_retention_watermarks"
+
+    service: Mapped[str] = mapped_column(Text, primary_key=True)
+    processed_until: Mapped[datetime] = mapped_column(DateTime(timezone=True))
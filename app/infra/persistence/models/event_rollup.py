@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Double, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class EventRollup(Base):
+    """Event count and value statistics of one service key over one time bucket.
+
+    ``key`` is the value of the service's rollup key field (e.g. the neighborhood), or
+    ``""`` for the row covering the whole service. The primary key order serves
+    ``GET /stats``: one service and bucket width, then a key and a bucket range.
+    """
+
+    __tablename__ = "event_rollups"
+
+    service: Mapped[str] = mapped_column(Text, primary_key=True)
+    bucket_seconds: Mapped[int] = mapped_column(Integer, primary_key=True)
+    key: Mapped[str] = mapped_column(Text, primary_key=True)
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+
+    count: Mapped[int] = mapped_column(BigInteger, default=0)
+    value_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    value_sum: Mapped[float] = mapped_column(Double, default=0.0)
+    value_min: Mapped[float | None] = mapped_column(Double, nullable=True)
+    value_max: Mapped[float | None] = mapped_column(Double, nullable=True)
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, LargeBinary, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class EventSketch(Base):
+    """Serialized sketch of one service field over one time bucket, as seen by one replica.
+
+    Each API process only ever writes its own ``replica`` rows, so flushes never
+    contend; queries merge the rows of every replica in the requested range.
+    """
+
+    __tablename__ = "event_sketches"
+
+    service: Mapped[str] = mapped_column(Text, primary_key=True)
+    kind: Mapped[str] = mapped_column(Text, primary_key=True)
+    field: Mapped[str] = mapped_column(Text, primary_key=True)
+    bucket_seconds: Mapped[int] = mapped_column(Integer, primary_key=True)
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    replica: Mapped[str] = mapped_column(Text, primary_key=True)
+
+    data: Mapped[bytes] = mapped_column(LargeBinary)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, Text, func
+from sqlalchemy import DateTime, Index, Integer, SmallInteger, Text, func, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,12 +10,45 @@ from app.core.db import Base
 
 class OutboxMessage(Base):
     __tablename__ = "outbox_messages"
+    __table_args__ = (
+        # Only pending rows are ever polled, so the worker's index stays as small
+        # as the backlog no matter how many sent rows accumulate. The worker reads
+        # each priority lane separately, oldest due message first.
+        Index(
+            "ix_outbox_messages_pending_due",
+            "priority",
+            "next_attempt_at",
+            "created_at",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+        # Finds pending duplicates of a message for the coalescing stage.
+        Index(
+            "ix_outbox_messages_pending_dedup_key",
+            "topic",
+            "dedup_key",
+            postgresql_where=text("status = 'pending' AND dedup_key IS NOT NULL"),
+            sqlite_where=text("status = 'pending' AND dedup_key IS NOT NULL"),
+        ),
+        # Lets the retention archiver find expired rows without scanning the backlog.
+        Index(
+            "ix_outbox_messages_done_created_at",
+            "created_at",
+            postgresql_where=text("status <> 'pending'"),
+            sqlite_where=text("status <> 'pending'"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    topic: Mapped[str] = mapped_column(Text, index=True)
+    topic: Mapped[str] = mapped_column(Text)
     payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    priority: Mapped[int] = mapped_column(SmallInteger, default=1)
+    dedup_key: Mapped[str | None] = mapped_column(Text, nullable=True)
+    coalesced_count: Mapped[int] = mapped_column(Integer, default=1)
 
-    status: Mapped[str] = mapped_column(Text, default="pending", index=True)
-    attempts: Mapped[int] = mapped_column(Integer, default=0, index=True)
+    status: Mapped[str] = mapped_column(Text, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
     published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, SmallInteger, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class OutboxArchivedMessage(Base):
+    __tablename__ = "outbox_messages_archive"
+    __table_args__ = (
+        Index("ix_outbox_messages_archive_topic_created_at", "topic", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    topic: Mapped[str] = mapped_column(Text)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    priority: Mapped[int] = mapped_column(SmallInteger)
+    dedup_key: Mapped[str | None] = mapped_column(Text, nullable=True)
+    coalesced_count: Mapped[int] = mapped_column(Integer)
+
+    status: Mapped[str] = mapped_column(Text)
+    attempts: Mapped[int] = mapped_column(Integer)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
@@ -0,0 +1,28 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, SmallInteger, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class OutboxDeadLetter(Base):
+    __tablename__ = "outbox_dead_letters"
+    __table_args__ = (
+        Index("ix_outbox_dead_letters_topic_dead_lettered_at", "topic", "dead_lettered_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    topic: Mapped[str] = mapped_column(Text)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    priority: Mapped[int] = mapped_column(SmallInteger, default=1)
+    dedup_key: Mapped[str | None] = mapped_column(Text, nullable=True)
+    coalesced_count: Mapped[int] = mapped_column(Integer, default=1)
+
+    attempts: Mapped[int] = mapped_column(Integer)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    last_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    dead_lettered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
@@ -0,0 +1,201 @@
+import os
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.db import create_db_engine
+
+# Width of each events partition: "day" or "week".
+PARTITION_INTERVAL = os.getenv("EVENTS_PARTITION_INTERVAL", "day")
+# Number of future partitions kept ready ahead of the current one.
+PARTITION_PREMAKE = int(os.getenv("EVENTS_PARTITION_PREMAKE", "7"))
+# Partitions whose whole range is older than this are expired; unset keeps history forever.
+RETENTION_DAYS = os.getenv("EVENTS_RETENTION_DAYS")
+# "detach" keeps expired partitions as standalone tables, "drop" deletes them.
+EXPIRE_ACTION = os.getenv("EVENTS_PARTITION_EXPIRE_ACTION", "detach")
+MAINTENANCE_INTERVAL_SECONDS = float(os.getenv("EVENTS_PARTITION_MAINTENANCE_SECONDS", "3600"))
+
+PARENT_TABLE = "events"
+# Catches rows no range partition covers, e.g. while the manager was down past its premake
+# horizon, so inserts never fail; maintenance moves them into the partitions it creates.
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+INTERVALS = {"day": timedelta(days=1), "week": timedelta(weeks=1)}
+
+_BOUND_RE = re.compile(r"FROM \((MINVALUE|'[^']+')\) TO \((MAXVALUE|'[^']+')\)")
+
+
+@dataclass(frozen=True)
+class PartitionPolicy:
+    interval: str = "day"
+    premake: int = 7
+    retention: timedelta | None = None
+    expire_action: str = "detach"
+
+    def __post_init__(self):
+        if self.interval not in INTERVALS:
+            raise ValueError(f"Invalid partition interval {self.interval!r}, expected one of {sorted(INTERVALS)}")
+        if self.expire_action not in ("detach", "drop"):
+            raise ValueError(f"Invalid expire action {self.expire_action!r}, expected 'detach' or 'drop'")
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: datetime | None
+    end: datetime | None
+
+
+def policy_from_env() -> PartitionPolicy:
+    return PartitionPolicy(
+        interval=PARTITION_INTERVAL,
+        premake=PARTITION_PREMAKE,
+        retention=timedelta(days=float(RETENTION_DAYS)) if RETENTION_DAYS else None,
+        expire_action=EXPIRE_ACTION,
+    )
+
+
+def period_start(moment: datetime, interval: str) -> datetime:
+    start = moment.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "week":
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def partition_name(start: datetime, interval: str) -> str:
+    prefix = "w" if interval == "week" else "p"
+    return f"{PARENT_TABLE}_{prefix}{start:%Y%m%d}"
+
+
+def plan_partitions(
+    existing: List[Partition],
+    policy: PartitionPolicy,
+    now: datetime,
+) -> Tuple[List[Partition], List[Partition]]:
+    """Work out which partitions to create and which to expire.
+
+    New partitions start where the newest existing one ends, so changing the interval
+    never produces overlapping ranges, and cover up to ``premake`` periods past now.
+    """
+    step = INTERVALS[policy.interval]
+    horizon = period_start(now, policy.interval) + step * (policy.premake + 1)
+    ends = [partition.end for partition in existing if partition.end is not None]
+    cursor = max(ends) if ends else period_start(now, policy.interval)
+
+    to_create = []
+    while cursor < horizon:
+        start = period_start(cursor, policy.interval)
+        if start < cursor:
+            # Switching from daily to weekly mid-week: bridge to the next week boundary.
+            start, end = cursor, start + step
+        else:
+            end = start + step
+        to_create.append(Partition(partition_name(start, policy.interval), start, end))
+        cursor = end
+
+    to_expire = []
+    if policy.retention is not None:
+        cutoff = now - policy.retention
+        to_expire = [p for p in existing if p.end is not None and p.end <= cutoff]
+    return to_create, to_expire
+
+
+def _parse_bound(value: str) -> datetime | None:
+    if value in ("MINVALUE", "MAXVALUE"):
+        return None
+    return datetime.fromisoformat(value.strip("'")).astimezone(timezone.utc)
+
+
+def list_partitions(db: Session) -> List[Partition]:
+    db.execute(text("SET LOCAL TIME ZONE 'UTC'"))
+    rows = db.execute(
+        text(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+            "FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        ),
+        {"parent": PARENT_TABLE},
+    ).all()
+
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_RE.search(bound or "")
+        if match:
+            partitions.append(Partition(name, _parse_bound(match.group(1)), _parse_bound(match.group(2))))
+    return sorted(partitions, key=lambda p: p.end or datetime.max.replace(tzinfo=timezone.utc))
+
+
+def _create_partition(connection, partition: Partition) -> None:
+    create = (
+        f'CREATE TABLE IF NOT EXISTS "{partition.name}" PARTITION OF {PARENT_TABLE} '
+        f"FOR VALUES FROM ('{partition.start.isoformat()}') TO ('{partition.end.isoformat()}')"
+    )
+    in_range = f"created_at >= '{partition.start.isoformat()}' AND created_at < '{partition.end.isoformat()}'"
+    stray = connection.exec_driver_sql(f'SELECT EXISTS (SELECT 1 FROM "{DEFAULT_PARTITION}" WHERE {in_range})').scalar()
+    if not stray:
+        connection.exec_driver_sql(create)
+        return
+    # A range partition cannot be created while the default partition holds rows of that
+    # range: take the default out, create the partition, move the rows over and put the
+    # default back. Inserts wait on the parent's lock while this runs.
+    connection.exec_driver_sql(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{DEFAULT_PARTITION}"')
+    connection.exec_driver_sql(create)
+    connection.exec_driver_sql(
+        f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" WHERE {in_range} RETURNING *) '
+        f"INSERT INTO {PARENT_TABLE} SELECT * FROM moved"
+    )
+    connection.exec_driver_sql(f'ALTER TABLE {PARENT_TABLE} ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT')
+
+
+def maintain_partitions(db: Session, policy: PartitionPolicy, now: datetime | None = None) -> Tuple[int, int]:
+    """Create upcoming partitions of ``events`` and detach or drop expired ones.
+
+    Rows that landed in the default partition are moved into the partitions created
+    for their range. Returns the number of partitions created and expired.
+    """
+    now = now or datetime.now(timezone.utc)
+    to_create, to_expire = plan_partitions(list_partitions(db), policy, now)
+
+    # DDL goes straight to the driver: the bound literals contain colons, which text()
+    # would otherwise read as bind parameters.
+    connection = db.connection()
+    connection.exec_driver_sql(f'CREATE TABLE IF NOT EXISTS "{DEFAULT_PARTITION}" PARTITION OF {PARENT_TABLE} DEFAULT')
+    for partition in to_create:
+        _create_partition(connection, partition)
+    for partition in to_expire:
+        connection.exec_driver_sql(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{partition.name}"')
+        if policy.expire_action == "drop":
+            connection.exec_driver_sql(f'DROP TABLE "{partition.name}"')
+    db.commit()
+    return len(to_create), len(to_expire)
+
+
+def main() -> None:
+    engine = create_db_engine(settings.DATABASE_URL, f"{settings.DB_APPLICATION_NAME}-events-partitions")
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    policy = policy_from_env()
+
+    print(f"Starting events partition manager ({policy.interval} partitions)")
+    while True:
+        db = SessionLocal()
+        try:
+            created, expired = maintain_partitions(db, policy)
+            if created or expired:
+                print(f"Created {created} events partitions, expired {expired}")
+        except Exception as e:
+            print(f"Error maintaining events partitions: {e}")
+            db.rollback()
+        finally:
+            db.close()
+        time.sleep(MAINTENANCE_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
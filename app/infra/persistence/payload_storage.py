@@ -0,0 +1,25 @@
+import os
+from typing import Any, Dict, Tuple
+
+from app.core.serialization import canonical_json
+
+# Store the raw payload only when normalization changed it, and drop the null defaults
+# the payload schemas add. Reads rebuild the raw payload from normalized_payload.
+COMPACT_STORAGE = os.getenv("EVENTS_COMPACT_STORAGE", "true").lower() in ("1", "true", "yes")
+
+Payload = Dict[str, Any]
+
+
+def compact_payloads(raw: Payload, normalized: Payload | None) -> Tuple[Payload | None, Payload | None]:
+    """Return the ``(payload, normalized_payload)`` pair to store for an event.
+
+    ``None`` values the schema filled in for keys missing from ``raw`` are dropped. If
+    what is left encodes exactly like ``raw`` (so ``600`` and ``600.0`` still differ),
+    only the normalized copy is kept.
+    """
+    if not COMPACT_STORAGE or normalized is None:
+        return raw, normalized
+    normalized = {key: value for key, value in normalized.items() if value is not None or key in raw}
+    if canonical_json(normalized) == canonical_json(raw):
+        return None, normalized
+    return raw, normalized
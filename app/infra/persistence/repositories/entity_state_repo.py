@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.infra.persistence.models.entity_state import EntityState
+
+
+class EntityStateRepository:
+    def __init__(self, db: Session):
+        self._db = db
+
+    def upsert(
+        self,
+        service: str,
+        entity_key: str,
+        payload: dict,
+        timestamp: datetime,
+        event_id: uuid.UUID | None = None,
+    ) -> None:
+        """Make ``payload`` the entity's state unless a newer one is already stored.
+
+        A single ``INSERT ... ON CONFLICT DO UPDATE ... WHERE``, so concurrent and
+        out-of-order ingests settle on the latest reading. The caller owns the transaction.
+        """
+        dialect = postgresql if self._db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(EntityState).values(
+            service=service,
+            entity_key=entity_key,
+            timestamp=timestamp,
+            payload=payload,
+            event_id=event_id,
+            updated_at=datetime.now(timezone.utc),
+        )
+        incoming = stmt.excluded
+        self._db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["service", "entity_key"],
+                set_={
+                    "timestamp": incoming.timestamp,
+                    "payload": incoming.payload,
+                    "event_id": incoming.event_id,
+                    "updated_at": incoming.updated_at,
+                },
+                where=EntityState.__table__.c.timestamp <= incoming.timestamp,
+            )
+        )
+
+    def get(self, service: str, entity_key: str) -> EntityState | None:
+        return self._db.get(EntityState, (service, entity_key))
@@ -1,10 +1,28 @@
 from __future__ import annotations
 
-from sqlalchemy.orm import Session
+import uuid
+from typing import Iterable, List, Tuple
 
+from sqlalchemy import Row, and_, literal, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.infra.persistence.bulk import add_many
 from app.infra.persistence.models.event import Event
 
 
+def _event_columns(entity) -> list:
+    return [
+        entity.id,
+        entity.service,
+        entity.timestamp,
+        entity.raw_payload.label("payload"),
+        entity.normalized_payload,
+        entity.deduplication_key,
+        entity.source_event_id,
+        entity.created_at,
+    ]
+
+
 class EventRepository:
     def __init__(self, db: Session):
         self._db = db
@@ -13,3 +31,42 @@ class EventRepository:
         self._db.add(event)
         self._db.flush()
         return event
+
+    def add_many(self, events: Iterable[Event]) -> List[Event]:
+        """Insert ``events`` in bulk; large batches come back detached (see ``bulk.add_many``)."""
+        return add_many(self._db, events)
+
+    def find_with_derived(self, dedupe_key: str) -> Tuple[Event | None, List[Event]]:
+        """Load the base event with ``dedupe_key`` and its derived events in one query."""
+        base_ids = select(Event.id).where(Event.deduplication_key == dedupe_key, Event.source_event_id.is_(None))
+        events = self._db.execute(
+            select(Event).where(
+                or_(
+                    and_(Event.deduplication_key == dedupe_key, Event.source_event_id.is_(None)),
+                    Event.source_event_id.in_(base_ids),
+                )
+            )
+        ).scalars().all()
+        base = next((event for event in events if event.source_event_id is None), None)
+        return base, [event for event in events if event.source_event_id is not None]
+
+    def lineage(self, event_id: uuid.UUID, max_depth: int) -> List[Row]:
+        """Return an event and everything derived from it, with each row's ``depth``.
+
+        One recursive CTE walks ``source_event_id`` down to ``max_depth`` levels; rows
+        come back ordered by depth, then age.
+        """
+        tree = (
+            select(*_event_columns(Event), literal(0).label("depth"))
+            .where(Event.id == event_id)
+            .cte("lineage", recursive=True)
+        )
+        child = aliased(Event)
+        tree = tree.union_all(
+            select(*_event_columns(child), (tree.c.depth + 1).label("depth"))
+            .join(tree, child.source_event_id == tree.c.id)
+            .where(tree.c.depth < max_depth)
+        )
+        return self._db.execute(
+            select(tree).order_by(tree.c.depth, tree.c.created_at, tree.c.id)
+        ).all()
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from typing import Iterable, List
+
 from sqlalchemy.orm import Session
 
+from app.infra.persistence.bulk import add_many
 from app.infra.persistence.models.outbox import OutboxMessage
 
 
@@ -13,3 +16,7 @@ class OutboxRepository:
         self._db.add(entry)
         self._db.flush()
         return entry
+
+    def add_many(self, entries: Iterable[OutboxMessage]) -> List[OutboxMessage]:
+        """Insert ``entries`` in bulk; large batches come back detached (see ``bulk.add_many``)."""
+        return add_many(self._db, entries)
@@ -1,5 +1,24 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.api.routes import router
+from app.application.rollups import ROLLUP_FLUSH_SECONDS, ROLLUPS_ENABLED, BackgroundFlusher, flush_rollups
+from app.application.sketches import SKETCH_FLUSH_SECONDS, SKETCHES_ENABLED, flush_sketches
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    flushers = []
+    if ROLLUPS_ENABLED:
+        flushers.append(BackgroundFlusher(flush_rollups, ROLLUP_FLUSH_SECONDS, "rollup-flusher"))
+    if SKETCHES_ENABLED:
+        flushers.append(BackgroundFlusher(flush_sketches, SKETCH_FLUSH_SECONDS, "sketch-flusher"))
+    for flusher in flushers:
+        flusher.start()
+    yield
+    for flusher in flushers:
+        flusher.stop()
+
 
-app = FastAPI(title="Smart City Orchestrator")
+app = FastAPI(title="Smart City Orchestrator", lifespan=lifespan)
 app.include_router(router)
\ No newline at end of file
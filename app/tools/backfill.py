@@ -0,0 +1,77 @@
+"""
+Re-run the current rules over stored events and write the derived events they now produce.
+
+    python -m app.tools.backfill --service energy --since 2026-01-01T00:00:00+00:00 --dry-run
+    python -m app.tools.backfill --service energy --workers 8 --checkpoint energy.json --enqueue
+
+With ``--checkpoint`` the position is saved after every committed batch, and running
+the same command again resumes from it.
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from sqlalchemy.orm import sessionmaker
+
+from app.application.backfill import BACKFILL_BATCH_SIZE, BackfillCheckpoint, run_backfill
+from app.core.config import settings
+from app.core.db import create_db_engine
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--service", required=True, help="Service whose base events are re-evaluated")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Events created at or after (ISO 8601)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Events created before (ISO 8601)")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="Base events per transaction")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Rule evaluation processes")
+    parser.add_argument("--checkpoint", help="JSON file to save progress to and resume from")
+    parser.add_argument("--enqueue", action="store_true", help="Also write pending outbox messages")
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many derived events would be written")
+    return parser
+
+
+def _report(checkpoint: BackfillCheckpoint) -> str:
+    stats = checkpoint.stats
+    return f"scanned {stats.scanned}, derived {stats.derived}, already present {stats.existing}"
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+
+    checkpoint = BackfillCheckpoint(service=args.service, since=args.since, until=args.until)
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        saved = BackfillCheckpoint.load(args.checkpoint)
+        if not saved.same_scope(checkpoint):
+            raise SystemExit(f"{args.checkpoint} belongs to a backfill with a different service or time range")
+        checkpoint = saved
+        print(f"Resuming after {checkpoint.last_created_at} ({_report(checkpoint)})")
+
+    def on_batch(progress: BackfillCheckpoint) -> None:
+        if args.checkpoint and not args.dry_run:
+            progress.save(args.checkpoint)
+        print(f"Up to {progress.last_created_at}: {_report(progress)}")
+
+    engine = create_db_engine(settings.DATABASE_URL, f"{settings.DB_APPLICATION_NAME}-backfill")
+    db = sessionmaker(bind=engine, autocommit=False, autoflush=False)()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            run_backfill(
+                db,
+                checkpoint,
+                batch_size=args.batch_size,
+                executor=executor,
+                workers=args.workers,
+                dry_run=args.dry_run,
+                enqueue=args.enqueue,
+                on_batch=on_batch,
+            )
+    finally:
+        db.close()
+    verb = "Would write" if args.dry_run else "Wrote"
+    print(f"{verb} {checkpoint.stats.derived} derived events ({_report(checkpoint)})")
+
+
+if __name__ == "__main__":
+    main()
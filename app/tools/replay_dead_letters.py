@@ -0,0 +1,41 @@
+"""
+Re-drive dead-lettered outbox messages.
+
+    python -m app.tools.replay_dead_letters --topic event.security --since 2026-01-15T10:00:00+00:00
+    python -m app.tools.replay_dead_letters --until 2026-01-16T00:00:00+00:00 --dry-run
+"""
+import argparse
+from datetime import datetime
+
+from app.core.db import SessionLocal
+from app.infra.outbox.dead_letter import REPLAY_CHUNK_SIZE, count_dead_letters, replay_dead_letters
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topic", help="Only replay messages for this topic, e.g. event.security")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Dead-lettered at or after (ISO 8601)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Dead-lettered before (ISO 8601)")
+    parser.add_argument("--chunk-size", type=int, default=REPLAY_CHUNK_SIZE, help="Rows moved per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many messages match")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.dry_run:
+            matched = count_dead_letters(db, args.topic, args.since, args.until)
+            print(f"{matched} dead-lettered messages match")
+            return
+
+        replayed = replay_dead_letters(db, args.topic, args.since, args.until, chunk_size=args.chunk_size)
+        print(f"Replayed {replayed} dead-lettered messages")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
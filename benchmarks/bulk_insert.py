@@ -0,0 +1,85 @@
+"""
+Event insert throughput for each ``add_many`` write path.
+
+Inserts the same batch of derived-event-sized rows through every path, truncating
+``events`` between runs, and reports rows per second:
+
+- ``orm``: ``Session.add_all`` plus ``flush`` (the path below ``DB_BULK_INSERT_MIN_ROWS``).
+- ``values-N``: multi-row ``INSERT ... VALUES`` in chunks of ``N`` rows.
+- ``copy``: ``COPY ... FROM STDIN`` in CSV format (Postgres with psycopg2 only).
+
+``DB_INSERT_CHUNK_SIZE`` should sit where the ``values`` curve flattens, and
+``DB_COPY_MIN_ROWS`` where ``copy`` overtakes it once its fixed cost is paid.
+
+    python -m benchmarks.bulk_insert --rows 50000 --chunks 100,500,1000,5000
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+from typing import Callable, List
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.infra.persistence.bulk import copy_rows, insert_rows, resolve_rows, supports_copy
+from app.infra.persistence.models.event import Event
+from benchmarks._support import bench_engine
+
+
+def make_events(count: int) -> List[Event]:
+    now = datetime.now(timezone.utc)
+    return [
+        Event(
+            service="transport",
+            timestamp=now,
+            payload={"vehicle_id": f"bus-{i}", "line": "42", "speed": 37.5, "occupancy": 0.8},
+            normalized_payload={"vehicle_id": f"bus-{i}", "line": "42", "speed": 37.5},
+            deduplication_key=f"transport-{i}",
+        )
+        for i in range(count)
+    ]
+
+
+def orm_path(session: Session, events: List[Event]) -> None:
+    session.add_all(events)
+    session.flush()
+
+
+def values_path(chunk_size: int) -> Callable[[Session, List[Event]], None]:
+    def run(session: Session, events: List[Event]) -> None:
+        insert_rows(session, Event.__table__, resolve_rows(events), chunk_size)
+    return run
+
+
+def copy_path(session: Session, events: List[Event]) -> None:
+    copy_rows(session, Event.__table__, resolve_rows(events))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--chunks", default="100,500,1000,5000")
+    args = parser.parse_args()
+
+    engine = bench_engine()
+    paths = [("orm", orm_path)]
+    paths += [(f"values-{size}", values_path(int(size))) for size in args.chunks.split(",")]
+    with Session(engine) as session:
+        if supports_copy(session):
+            paths.append(("copy", copy_path))
+
+    print(f"{'path':>12} {'seconds':>9} {'rows/s':>11}")
+    for name, path in paths:
+        with Session(engine) as session:
+            events = make_events(args.rows)
+            started = time.perf_counter()
+            path(session, events)
+            session.commit()
+            elapsed = time.perf_counter() - started
+            session.execute(delete(Event))
+            session.commit()
+        print(f"{name:>12} {elapsed:>9.3f} {args.rows / elapsed:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
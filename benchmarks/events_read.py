@@ -0,0 +1,97 @@
+"""
+GET /events read path: ORM entities and Pydantic versus column tuples and orjson.
+
+Seeds ``events`` with payload-sized rows and times one page of each path:
+
+- ``orm``: load ``Event`` entities, ``EventOut.model_validate`` each one, then
+  validate and encode again the way FastAPI does for ``response_model``, with the
+  stdlib ``json`` module on both the JSONB column and the response.
+- ``lean``: select only the ``EventOut`` columns as tuples and encode the page in one
+  pass with the shared orjson serializer, which also decodes the JSONB columns.
+
+    python -m benchmarks.events_read --rows 100000 --limit 100
+"""
+import argparse
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.api.routes import EVENT_OUT_COLUMNS
+from app.api.schemas import EventOut
+from app.core.serialization import json_dumps, json_dumps_bytes, json_loads
+from app.infra.persistence.models.event import Event
+from benchmarks._support import bench_engine, summarize, timed
+
+CHUNK = 10_000
+EVENT_LIST = TypeAdapter(List[EventOut])
+
+
+def seed(session: Session, count: int) -> None:
+    base = datetime.now(timezone.utc)
+    for start in range(0, count, CHUNK):
+        session.execute(
+            insert(Event),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "service": "transport",
+                    "timestamp": base,
+                    "payload": {"vehicle_id": f"bus-{i}", "line": "42", "speed": 37.5, "occupancy": 0.8},
+                    "normalized_payload": {"vehicle_id": f"bus-{i}", "line": "42", "speed": 37.5},
+                    "deduplication_key": f"transport-{i}",
+                    "created_at": base - timedelta(seconds=i),
+                }
+                for i in range(start, min(start + CHUNK, count))
+            ],
+        )
+    session.commit()
+
+
+def orm_page(session: Session, limit: int) -> bytes:
+    events = session.execute(select(Event).order_by(Event.created_at.desc(), Event.id.desc()).limit(limit)).scalars().all()
+    out = [EventOut.model_validate(event) for event in events]
+    body = json.dumps(jsonable_encoder(EVENT_LIST.validate_python(out))).encode()
+    session.rollback()
+    return body
+
+
+def lean_page(session: Session, limit: int) -> bytes:
+    rows = session.execute(
+        select(*EVENT_OUT_COLUMNS).order_by(Event.created_at.desc(), Event.id.desc()).limit(limit)
+    ).all()
+    body = json_dumps_bytes([row._asdict() for row in rows])
+    session.rollback()
+    return body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = bench_engine()
+    with Session(engine) as session:
+        seed(session, args.rows)
+
+    paths = [
+        ("orm", create_engine(engine.url, json_serializer=json.dumps, json_deserializer=json.loads), orm_page),
+        ("lean", create_engine(engine.url, json_serializer=json_dumps, json_deserializer=json_loads), lean_page),
+    ]
+    print(f"{'path':>6} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, path_engine, page in paths:
+        with Session(path_engine) as session:
+            page(session, args.limit)  # warm up the connection and statement cache
+            stats = summarize(timed(lambda: page(session, args.limit), args.repeat))
+        print(f"{name:>6} {stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['max_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Outbox fetch latency as sent rows accumulate.
+
+Grows ``outbox_messages`` in steps of sent rows while keeping a constant pending
+backlog, and times the worker's fetch query after each step. With the partial
+pending index the latency should stay flat regardless of table size.
+
+    python -m benchmarks.outbox_fetch --steps 10 --step-rows 1000000
+"""
+import argparse
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.infra.outbox.worker import fetch_due_messages
+from app.infra.persistence.models.outbox import OutboxMessage
+from benchmarks._support import bench_engine, summarize, timed
+
+CHUNK = 10_000
+
+
+def add_sent_rows(session: Session, count: int, base: datetime) -> None:
+    if session.bind.dialect.name == "postgresql":
+        session.execute(
+            text(
+                "INSERT INTO outbox_messages "
+                "(id, topic, payload, status, attempts, next_attempt_at, published_at, created_at) "
+                "SELECT gen_random_uuid(), 'event.security', '{}'::jsonb, 'sent', 0, "
+                ":base, :base, :base - make_interval(secs => g) "
+                "FROM generate_series(1, :count) AS g"
+            ),
+            {"base": base, "count": count},
+        )
+    else:
+        for start in range(0, count, CHUNK):
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "topic": "event.security",
+                    "payload": {},
+                    "status": "sent",
+                    "attempts": 0,
+                    "next_attempt_at": base,
+                    "published_at": base,
+                    "created_at": base - timedelta(seconds=start + i),
+                }
+                for i in range(min(CHUNK, count - start))
+            ]
+            session.execute(insert(OutboxMessage), rows)
+    session.commit()
+
+
+def add_pending_rows(session: Session, count: int, base: datetime) -> None:
+    session.execute(
+        insert(OutboxMessage),
+        [
+            {
+                "id": uuid.uuid4(),
+                "topic": "event.security",
+                "payload": {},
+                "status": "pending",
+                "attempts": 0,
+                "next_attempt_at": base,
+                "created_at": base,
+            }
+            for _ in range(count)
+        ],
+    )
+    session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--step-rows", type=int, default=100_000)
+    parser.add_argument("--pending", type=int, default=1_000)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = bench_engine()
+    base = datetime.now(timezone.utc) - timedelta(minutes=1)
+    now = datetime.now(timezone.utc)
+
+    with Session(engine) as session:
+        add_pending_rows(session, args.pending, base)
+
+        print(f"{'sent rows':>12} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for step in range(1, args.steps + 1):
+            add_sent_rows(session, args.step_rows, base)
+            if engine.dialect.name == "postgresql":
+                session.execute(text("ANALYZE outbox_messages"))
+            stats = summarize(
+                timed(lambda: (fetch_due_messages(session, now, args.batch_size), session.rollback()), args.repeat)
+            )
+            print(f"{step * args.step_rows:>12,} {stats['p50_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['max_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
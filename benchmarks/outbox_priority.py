@@ -0,0 +1,99 @@
+"""
+Publish latency per priority lane while a low-urgency backlog drains.
+
+Seeds a backlog of normal-priority messages (e.g. security alerts from an energy
+spike), then keeps enqueuing a mix of high- and normal-priority messages while the
+worker's fetch query drains the outbox. Time is simulated: every publish costs
+``--publish-ms`` so the run is deterministic and fast. Runs twice, once with
+priority lanes and once with every message on one lane (strict age order).
+
+    python -m benchmarks.outbox_priority --backlog 5000 --rounds 300
+"""
+import argparse
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.domain.events.types import Priority
+from app.infra.outbox.worker import fetch_due_messages, parse_lane_weights
+from app.infra.persistence.models.outbox import OutboxMessage
+from benchmarks._support import bench_engine, summarize
+
+
+def enqueue(session: Session, count: int, urgency: Priority, lane: Priority, created_at: datetime) -> None:
+    if not count:
+        return
+    session.execute(
+        insert(OutboxMessage),
+        [
+            {
+                "id": uuid.uuid4(),
+                "topic": "event.transport" if urgency == Priority.HIGH else "event.security",
+                "payload": {"urgency": urgency.name.lower()},
+                "priority": int(lane),
+                "status": "pending",
+                "attempts": 0,
+                "next_attempt_at": created_at,
+                "created_at": created_at,
+            }
+            for _ in range(count)
+        ],
+    )
+
+
+def simulate(session: Session, args: argparse.Namespace, use_lanes: bool) -> Dict[str, List[float]]:
+    session.execute(delete(OutboxMessage))
+    clock = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    publish_cost = timedelta(milliseconds=args.publish_ms)
+    weights = parse_lane_weights(args.weights)
+    lane_of = lambda priority: priority if use_lanes else Priority.NORMAL
+
+    enqueue(session, args.backlog, Priority.NORMAL, Priority.NORMAL, clock)
+    latencies: Dict[str, List[float]] = {"high": [], "normal": []}
+
+    for _ in range(args.rounds):
+        enqueue(session, args.high_per_round, Priority.HIGH, lane_of(Priority.HIGH), clock)
+        enqueue(session, args.normal_per_round, Priority.NORMAL, Priority.NORMAL, clock)
+        session.flush()
+
+        for msg in fetch_due_messages(session, clock, args.batch_size, weights):
+            clock += publish_cost
+            msg.status = "sent"
+            created_at = msg.created_at.replace(tzinfo=timezone.utc)
+            latencies[msg.payload["urgency"]].append((clock - created_at).total_seconds() * 1000)
+        session.flush()
+
+    session.rollback()
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backlog", type=int, default=2_000)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--high-per-round", type=int, default=1)
+    parser.add_argument("--normal-per-round", type=int, default=15)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--publish-ms", type=float, default=5.0)
+    parser.add_argument("--weights", default="high=6,normal=3,low=1")
+    args = parser.parse_args()
+
+    engine = bench_engine()
+    print(f"{'mode':<10} {'urgency':<8} {'published':>9} {'p50 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    with Session(engine) as session:
+        for mode, use_lanes in (("fifo", False), ("lanes", True)):
+            for urgency, samples in simulate(session, args, use_lanes).items():
+                if not samples:
+                    continue
+                stats = summarize(samples)
+                print(
+                    f"{mode:<10} {urgency:<8} {len(samples):>9} "
+                    f"{stats['p50_ms']:>10.1f} {stats['p99_ms']:>10.1f} {stats['max_ms']:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
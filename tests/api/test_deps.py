@@ -0,0 +1,57 @@
+"""
+Tests for API dependencies
+"""
+import pytest
+from unittest.mock import Mock, patch
+
+from fastapi import HTTPException
+
+from app.api import deps
+from app.api.deps import get_read_db
+
+
+def _session(name):
+    session = Mock(name=name)
+    session.get_bind.return_value.dialect.name = "postgresql"
+    return session
+
+
+@pytest.fixture
+def sessions():
+    primary, replica = _session("primary"), _session("replica")
+    with patch.object(deps, "SessionLocal", return_value=primary), \
+            patch.object(deps, "ReadSessionLocal", return_value=replica), \
+            patch.object(deps, "read_engine", Mock()):
+        yield primary, replica
+
+
+class TestGetReadDb:
+    """Tests for get_read_db dependency"""
+
+    def test_uses_replica_without_min_lsn(self, sessions):
+        """Test that plain reads go to the replica"""
+        primary, replica = sessions
+
+        assert next(get_read_db(None)) is replica
+
+    def test_uses_replica_once_caught_up(self, sessions):
+        """Test that a read-your-writes request waits for the replica to replay the LSN"""
+        primary, replica = sessions
+        with patch.object(deps, "replica_caught_up", side_effect=[False, True]), \
+                patch.object(deps, "LSN_POLL_SECONDS", 0):
+            assert next(get_read_db("0/16B6C50")) is replica
+
+    def test_falls_back_to_primary_when_replica_lags(self, sessions):
+        """Test that the primary serves the read if the replica stays behind"""
+        primary, replica = sessions
+        with patch.object(deps, "replica_caught_up", return_value=False), \
+                patch.object(deps.settings, "READ_YOUR_WRITES_TIMEOUT_SECONDS", 0):
+            assert next(get_read_db("0/16B6C50")) is primary
+        replica.close.assert_called()
+
+    def test_rejects_malformed_lsn(self, sessions):
+        """Test that an invalid X-Min-LSN returns 400"""
+        with pytest.raises(HTTPException) as exc:
+            next(get_read_db("not-an-lsn"))
+
+        assert exc.value.status_code == 400
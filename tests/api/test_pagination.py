@@ -0,0 +1,31 @@
+"""
+Tests for keyset pagination cursors
+"""
+import uuid
+import pytest
+from datetime import datetime, timezone
+
+from app.api.pagination import decode_cursor, encode_cursor
+
+
+class TestCursor:
+    """Tests for encode_cursor and decode_cursor"""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes to the created_at and id it was built from"""
+        created_at = datetime(2026, 1, 15, 12, 30, 0, 123456, tzinfo=timezone.utc)
+        event_id = uuid.uuid4()
+
+        assert decode_cursor(encode_cursor(created_at, event_id)) == (created_at, event_id)
+
+    def test_cursor_is_opaque_and_url_safe(self):
+        """Test that the cursor needs no URL escaping"""
+        cursor = encode_cursor(datetime(2026, 1, 15, tzinfo=timezone.utc), uuid.uuid4())
+
+        assert all(c.isalnum() or c in "-_" for c in cursor)
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "W10", "WyJ4IiwieSJd"])
+    def test_invalid_cursor_raises_value_error(self, cursor):
+        """Test that malformed cursors raise ValueError"""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
@@ -1,16 +1,28 @@
 """
 Tests for API routes
 """
+import csv
+import io
+import json
 import pytest
 from fastapi.testclient import TestClient
 from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 import uuid
 
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.api.export import stream_export
 from app.api.routes import router
-from app.core.db import get_db
+from app.api.schemas import EventLineageOut, EventOut
+from app.application.rollups import RollupAccumulator, upsert_rollups
+from app.application.sketches import SketchAccumulator, store_sketches
+from app.api.deps import get_read_db
+from app.core.db import Base, get_db
 from app.infra.persistence.models.event import Event
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from sqlalchemy.dialects import postgresql
 
 
 @pytest.fixture
@@ -31,6 +43,7 @@ def client(app, db_session):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
@@ -47,6 +60,17 @@ class TestHealthCheck:
         assert response.json() == {"status": "ok"}
 
 
+class TestDatabaseHealth:
+    """Tests for the database pool health endpoint"""
+
+    def test_reports_primary_pool(self, client):
+        """Test that pool statistics are returned for the primary engine"""
+        response = client.get("/health/db")
+
+        assert response.status_code == 200
+        assert "pool" in response.json()["primary"]
+
+
 class TestIngest:
     """Tests for ingest endpoint"""
 
@@ -86,6 +110,16 @@ class TestIngest:
         assert len(data["derived_events"]) == 1
         mock_ingest.assert_called_once()
 
+    @patch('app.api.routes.ingest_event')
+    def test_ingest_unstored_event_returns_null_id(self, mock_ingest, client):
+        """Test that an event the persistence policy did not store has no stored_event_id"""
+        mock_ingest.return_value = (None, [])
+
+        response = client.post("/ingest/transport", json={"bus_id": 42})
+
+        assert response.status_code == 200
+        assert response.json() == {"stored_event_id": None, "derived_events": []}
+
     @patch('app.api.routes.ingest_event')
     def test_ingest_with_dedupe_key(self, mock_ingest, client):
         """Test ingest with deduplication key"""
@@ -258,3 +292,367 @@ class TestGetEvents:
         assert "normalized_payload" in event_data
         assert "deduplication_key" in event_data
         assert "created_at" in event_data
+
+    def test_get_events_body_validates_as_event_out(self, client, db_session):
+        """Test that the directly encoded body still matches the EventOut schema"""
+        source = Event(service="energy", timestamp=datetime.now(timezone.utc), payload={"energy": 1.5})
+        db_session.add(source)
+        db_session.commit()
+        db_session.add(Event(
+            service="security",
+            timestamp=datetime.now(timezone.utc),
+            payload={"alert": "spike", "readings": [1, 2]},
+            source_event_id=source.id,
+            deduplication_key="spike",
+        ))
+        db_session.commit()
+
+        response = client.get("/events")
+
+        assert response.headers["content-type"] == "application/json"
+        events = [EventOut.model_validate(event) for event in response.json()]
+        derived = next(event for event in events if event.service == "security")
+        assert derived.source_event_id == source.id
+        assert derived.payload == {"alert": "spike", "readings": [1, 2]}
+
+    def test_get_events_filters_by_created_at_window(self, client, db_session):
+        """Test that since and until restrict events to a created_at window"""
+        for day in (1, 2, 3):
+            db_session.add(Event(
+                service="energy",
+                timestamp=datetime(2026, 1, day, tzinfo=timezone.utc),
+                payload={"day": day},
+                created_at=datetime(2026, 1, day, 12, tzinfo=timezone.utc),
+            ))
+        db_session.commit()
+
+        response = client.get("/events", params={"since": "2026-01-02T00:00:00Z", "until": "2026-01-03T00:00:00Z"})
+
+        assert response.status_code == 200
+        assert [event["payload"] for event in response.json()] == [{"day": 2}]
+
+    def test_get_events_cursor_walks_all_pages(self, client, db_session):
+        """Test that following X-Next-Cursor returns every event once, newest first"""
+        created = datetime(2026, 1, 15, 12, tzinfo=timezone.utc)
+        for i in range(5):
+            # Two events share each created_at so the id tie-breaker is exercised.
+            db_session.add(Event(
+                service="energy",
+                timestamp=created,
+                payload={"i": i},
+                created_at=created.replace(minute=i // 2),
+            ))
+        db_session.commit()
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/events", params=params)
+            assert response.status_code == 200
+            seen += response.json()
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert len({event["id"] for event in seen}) == 5
+        keys = [(event["created_at"], event["id"]) for event in seen]
+        assert keys == sorted(keys, reverse=True)
+
+    def test_get_events_no_cursor_on_last_page(self, client, db_session):
+        """Test that a page shorter than the limit has no next cursor"""
+        db_session.add(Event(service="energy", timestamp=datetime.now(timezone.utc), payload={}))
+        db_session.commit()
+
+        response = client.get("/events?limit=2")
+
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_get_events_invalid_cursor(self, client):
+        """Test that a malformed cursor returns 400"""
+        response = client.get("/events?cursor=not-a-cursor")
+
+        assert response.status_code == 400
+
+    def test_get_events_filters(self, client, db_session):
+        """Test filtering by service, source_event_id and deduplication_key"""
+        base = Event(service="energy", timestamp=datetime.now(timezone.utc), payload={}, deduplication_key="k1")
+        db_session.add(base)
+        db_session.commit()
+        derived = Event(service="security", timestamp=datetime.now(timezone.utc), payload={}, source_event_id=base.id)
+        db_session.add(derived)
+        db_session.commit()
+
+        by_service = client.get("/events", params={"service": "security"}).json()
+        by_source = client.get("/events", params={"source_event_id": str(base.id)}).json()
+        by_key = client.get("/events", params={"deduplication_key": "k1"}).json()
+
+        assert [event["id"] for event in by_service] == [str(derived.id)]
+        assert [event["id"] for event in by_source] == [str(derived.id)]
+        assert [event["id"] for event in by_key] == [str(base.id)]
+
+
+class TestExportEvents:
+    """Tests for the streaming export endpoint"""
+
+    @pytest.fixture
+    def events(self, db_session):
+        for day, service in ((1, "energy"), (2, "health"), (3, "energy")):
+            db_session.add(Event(
+                service=service,
+                timestamp=datetime(2026, 1, day, tzinfo=timezone.utc),
+                payload={"day": day},
+                normalized_payload={"day": day},
+                created_at=datetime(2026, 1, day, 12, tzinfo=timezone.utc),
+            ))
+        db_session.commit()
+
+    def test_export_ndjson(self, client, events):
+        """Test that the export streams one JSON object per line, oldest first"""
+        response = client.get("/events/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["payload"] for row in rows] == [{"day": 1}, {"day": 2}, {"day": 3}]
+        assert set(rows[0]) == set(EventOut.model_fields)
+
+    def test_export_csv(self, client, events):
+        """Test that the CSV export has a header row and JSON-encoded payload columns"""
+        response = client.get("/events/export", params={"format": "csv"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 3
+        assert json.loads(rows[0]["payload"]) == {"day": 1}
+        assert rows[0]["source_event_id"] == ""
+
+    def test_export_filters(self, client, events):
+        """Test that service and time range filters apply to the export"""
+        response = client.get("/events/export", params={"service": "energy", "since": "2026-01-02T00:00:00Z"})
+
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["payload"] for row in rows] == [{"day": 3}]
+
+    def test_export_streams_in_batches(self, db_session, events):
+        """Test that each chunk holds at most one batch of rows"""
+        query = select(*Event.__table__.columns).order_by(Event.created_at)
+
+        chunks = list(stream_export(db_session, query, "ndjson", batch_size=2))
+
+        assert [chunk.count("\n") for chunk in chunks] == [2, 1]
+
+    def test_export_rejects_unknown_format(self, client):
+        """Test that an unsupported format returns 422"""
+        response = client.get("/events/export", params={"format": "xml"})
+
+        assert response.status_code == 422
+
+
+class TestSearchEvents:
+    """Tests for the normalized payload field search endpoint"""
+
+    def test_search_rejects_unindexed_field(self, client):
+        """Test that filtering on a field without an index returns 400"""
+        response = client.get("/events/search", params={"service": "energy", "energy": "500"})
+
+        assert response.status_code == 400
+        assert "not indexed" in response.json()["detail"]
+
+    def test_search_requires_service(self, client):
+        """Test that the service parameter is required"""
+        response = client.get("/events/search", params={"neighborhood": "downtown"})
+
+        assert response.status_code == 422
+
+    @patch('app.api.routes._event_page')
+    def test_search_builds_containment_query(self, mock_page, client):
+        """Test that field filters become a containment predicate on normalized_payload"""
+        mock_page.return_value = Response(content=b"[]", media_type="application/json")
+
+        response = client.get("/events/search", params={"service": "health", "patient_id": "123", "limit": 10})
+
+        assert response.status_code == 200
+        query, limit = mock_page.call_args[0][1], mock_page.call_args[0][2]
+        compiled = query.compile(dialect=postgresql.dialect())
+        assert "@>" in str(compiled)
+        assert {"patient_id": 123} in compiled.params.values()
+        assert limit == 10
+
+
+class TestCompactStorageRead:
+    """Tests for reading events stored without a raw payload"""
+
+    def test_payload_is_rebuilt_from_normalized_payload(self, client, db_session):
+        """Test that /events and the export return the payload of compactly stored events"""
+        db_session.add(Event(
+            service="energy",
+            timestamp=datetime.now(timezone.utc),
+            payload=None,
+            normalized_payload={"energy": 500.0, "neighborhood": "downtown"},
+        ))
+        db_session.commit()
+
+        listed = client.get("/events").json()
+        exported = json.loads(client.get("/events/export").text)
+
+        assert listed[0]["payload"] == {"energy": 500.0, "neighborhood": "downtown"}
+        assert exported["payload"] == listed[0]["payload"]
+
+
+class TestEventLineage:
+    """Tests for the event lineage endpoint"""
+
+    def test_lineage_returns_tree(self, client, db_session):
+        """Test that the lineage endpoint returns derived events nested under their source"""
+        root = Event(service="health", timestamp=datetime.now(timezone.utc), payload={"alert": "emergency"})
+        db_session.add(root)
+        db_session.commit()
+        child = Event(service="transport", timestamp=datetime.now(timezone.utc), payload={"action": "dispatch"},
+                      source_event_id=root.id)
+        db_session.add(child)
+        db_session.commit()
+
+        response = client.get(f"/events/{root.id}/lineage")
+
+        assert response.status_code == 200
+        tree = EventLineageOut.model_validate(response.json())
+        assert tree.id == root.id
+        assert [node.id for node in tree.children] == [child.id]
+        assert tree.children[0].children == []
+
+    def test_lineage_unknown_event(self, client):
+        """Test that an unknown event returns 404"""
+        response = client.get(f"/events/{uuid.uuid4()}/lineage")
+
+        assert response.status_code == 404
+
+
+class TestReadReplicaRouting:
+    """Tests for routing query endpoints to the read session"""
+
+    @pytest.fixture
+    def replica_session(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path}/replica.db")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+        engine.dispose()
+
+    def test_writes_go_to_primary_and_reads_to_replica(self, app, db_session, replica_session):
+        """Test that /ingest uses the primary session and /events the read session"""
+        def primary():
+            yield db_session
+
+        def replica():
+            yield replica_session
+
+        app.dependency_overrides[get_db] = primary
+        app.dependency_overrides[get_read_db] = replica
+        client = TestClient(app)
+
+        response = client.post("/ingest/transport", json={"bus_id": 7})
+        assert response.status_code == 200
+        assert client.get("/events").json() == []
+
+        replica_session.add(Event(service="transport", timestamp=datetime.now(timezone.utc), payload={"bus_id": 7}))
+        replica_session.commit()
+        assert len(client.get("/events").json()) == 1
+        app.dependency_overrides.clear()
+
+    @patch("app.api.routes.current_lsn", return_value="0/16B6C50")
+    @patch("app.api.routes.settings")
+    def test_ingest_returns_commit_lsn_with_replica(self, mock_settings, mock_lsn, client):
+        """Test that ingest reports the commit LSN when a replica is configured"""
+        mock_settings.DATABASE_READ_URL = "postgresql://replica/db"
+
+        response = client.post("/ingest/transport", json={"bus_id": 7})
+
+        assert response.headers["X-Commit-LSN"] == "0/16B6C50"
+
+    def test_ingest_without_replica_has_no_lsn(self, client):
+        """Test that no LSN header is sent when reads use the primary"""
+        response = client.post("/ingest/transport", json={"bus_id": 7})
+
+        assert "X-Commit-LSN" not in response.headers
+
+
+class TestStats:
+    """Tests for the rollup stats endpoint"""
+
+    @pytest.fixture
+    def rollups(self, db_session):
+        accumulator = RollupAccumulator()
+        at = datetime(2026, 3, 1, 10, 17, tzinfo=timezone.utc)
+        accumulator.add("energy", at, {"energy": 600.0, "neighborhood": "downtown"})
+        accumulator.add("energy", at, {"energy": 200.0, "neighborhood": "uptown"})
+        upsert_rollups(db_session, accumulator.drain())
+        db_session.commit()
+
+    def test_service_totals(self, client, rollups):
+        """Test that service-wide rows are returned by default"""
+        response = client.get("/stats", params={"service": "energy", "interval": "hour"})
+
+        assert response.status_code == 200
+        [bucket] = response.json()
+        assert (bucket["key"], bucket["count"], bucket["avg"]) == ("", 2, 400.0)
+
+    def test_by_key(self, client, rollups):
+        """Test that by_key returns one row per key"""
+        response = client.get("/stats", params={"service": "energy", "by_key": "true"})
+
+        assert [(row["key"], row["max"]) for row in response.json()] == [("downtown", 600.0), ("uptown", 200.0)]
+
+    def test_unknown_interval(self, client):
+        """Test that only rolled-up intervals are accepted"""
+        response = client.get("/stats", params={"service": "energy", "interval": "day"})
+
+        assert response.status_code == 422
+
+    def test_limit_too_large(self, client):
+        """Test that limit above 1000 is rejected"""
+        response = client.get("/stats", params={"service": "energy", "limit": 1001})
+
+        assert response.status_code == 400
+
+
+class TestSketchStats:
+    """Tests for the distinct-count and top-K endpoints"""
+
+    @pytest.fixture
+    def sketches(self, db_session):
+        now = datetime.now(timezone.utc)
+        for replica, records in [("api-1", [("downtown", 600.0), ("uptown", 100.0)]), ("api-2", [("uptown", 300.0)])]:
+            accumulator = SketchAccumulator()
+            for neighborhood, energy in records:
+                accumulator.add("energy", now, {"energy": energy, "neighborhood": neighborhood})
+            store_sketches(db_session, accumulator.drain(), replica=replica)
+        db_session.commit()
+
+    def test_distinct(self, client, sketches):
+        """Test that distinct values are counted across replicas"""
+        response = client.get("/stats/distinct", params={"service": "energy", "field": "neighborhood"})
+
+        assert response.status_code == 200
+        assert response.json() == {"service": "energy", "field": "neighborhood", "distinct": 2}
+
+    def test_top(self, client, sketches):
+        """Test that the heaviest values come first"""
+        response = client.get("/stats/top", params={"service": "energy", "field": "neighborhood", "k": 1})
+
+        assert response.status_code == 200
+        assert response.json() == [{"item": "downtown", "count": 600.0, "error": 0.0}]
+
+    def test_top_k_too_large(self, client):
+        """Test that k above 100 is rejected"""
+        response = client.get("/stats/top", params={"service": "energy", "field": "neighborhood", "k": 101})
+
+        assert response.status_code == 400
+
+    def test_untracked_field(self, client):
+        """Test that fields without a sketch are rejected"""
+        response = client.get("/stats/distinct", params={"service": "energy", "field": "voltage"})
+
+        assert response.status_code == 400
+
@@ -0,0 +1,167 @@
+"""
+Tests for historical rule re-evaluation
+"""
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.application.backfill import BackfillCheckpoint, evaluate_rows, run_backfill
+from app.application.rollups import query_rollups
+from app.infra.persistence.models.event import Event
+from app.infra.persistence.models.outbox import OutboxMessage
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _energy(db_session, energy, minutes):
+    event = Event(service="energy", timestamp=BASE, payload=None,
+                  normalized_payload={"energy": energy, "neighborhood": "downtown"},
+                  created_at=BASE + timedelta(minutes=minutes))
+    db_session.add(event)
+    db_session.commit()
+    return event
+
+
+def _derived(db_session):
+    return db_session.execute(
+        select(Event).where(Event.source_event_id.is_not(None)).order_by(Event.created_at)
+    ).scalars().all()
+
+
+class TestEvaluateRows:
+    """Tests for evaluate_rows function"""
+
+    def test_uses_registered_rule_evaluator(self):
+        """Test that each row is evaluated by its service's rules"""
+        results = evaluate_rows([
+            ("energy", BASE, {}, {"energy": 600.0, "neighborhood": "downtown"}),
+            ("energy", BASE, {}, {"energy": 100.0, "neighborhood": "downtown"}),
+        ])
+
+        assert [len(specs) for specs in results] == [1, 0]
+        assert results[0][0].service == "security"
+
+
+class TestRunBackfill:
+    """Tests for run_backfill function"""
+
+    def test_writes_derived_events_for_matching_rows(self, db_session):
+        """Test that events the rules now match get derived events"""
+        high = _energy(db_session, 600.0, 0)
+        _energy(db_session, 100.0, 1)
+
+        stats = run_backfill(db_session, BackfillCheckpoint(service="energy"), batch_size=1)
+
+        [derived] = _derived(db_session)
+        assert derived.source_event_id == high.id
+        assert derived.service == "security"
+        assert derived.deduplication_key == "critical_energy_usage_downtown"
+        assert (stats.scanned, stats.derived, stats.existing) == (2, 1, 0)
+        assert db_session.query(OutboxMessage).count() == 0
+
+    def test_dry_run_writes_nothing(self, db_session):
+        """Test that a dry run only counts"""
+        _energy(db_session, 600.0, 0)
+
+        stats = run_backfill(db_session, BackfillCheckpoint(service="energy"), dry_run=True)
+
+        assert stats.derived == 1
+        assert _derived(db_session) == []
+
+    def test_rerun_skips_existing_derived_events(self, db_session):
+        """Test that a second run over the same events writes nothing new"""
+        _energy(db_session, 600.0, 0)
+        run_backfill(db_session, BackfillCheckpoint(service="energy"))
+
+        stats = run_backfill(db_session, BackfillCheckpoint(service="energy"))
+
+        assert len(_derived(db_session)) == 1
+        assert (stats.derived, stats.existing) == (0, 1)
+
+    def test_new_derived_events_reach_stats(self, db_session):
+        """Test that derived events are rolled up once, however often the backfill runs"""
+        _energy(db_session, 600.0, 0)
+
+        run_backfill(db_session, BackfillCheckpoint(service="energy"))
+        run_backfill(db_session, BackfillCheckpoint(service="energy"))
+
+        [row] = query_rollups(db_session, "security", "hour", since=BASE)
+        assert row.count == 1
+
+    def test_resumes_after_checkpoint(self, db_session):
+        """Test that events up to the checkpoint position are not scanned again"""
+        first = _energy(db_session, 600.0, 0)
+        second = _energy(db_session, 700.0, 1)
+        checkpoint = BackfillCheckpoint(service="energy", last_created_at=first.created_at, last_id=first.id)
+
+        run_backfill(db_session, checkpoint)
+
+        assert [event.source_event_id for event in _derived(db_session)] == [second.id]
+        assert (checkpoint.last_created_at, checkpoint.last_id) == (second.created_at, second.id)
+
+    def test_respects_time_range(self, db_session):
+        """Test that only events created inside [since, until) are scanned"""
+        _energy(db_session, 600.0, 0)
+        inside = _energy(db_session, 600.0, 5)
+        _energy(db_session, 600.0, 10)
+        checkpoint = BackfillCheckpoint(service="energy", since=BASE + timedelta(minutes=5),
+                                        until=BASE + timedelta(minutes=10))
+
+        run_backfill(db_session, checkpoint)
+
+        assert [event.source_event_id for event in _derived(db_session)] == [inside.id]
+
+    def test_enqueue_writes_outbox_messages(self, db_session):
+        """Test that derived events can also be queued for notification"""
+        _energy(db_session, 600.0, 0)
+
+        run_backfill(db_session, BackfillCheckpoint(service="energy"), enqueue=True)
+
+        [message] = db_session.query(OutboxMessage).all()
+        assert message.topic == "event.security"
+        assert message.status == "pending"
+
+    def test_evaluates_through_executor(self, db_session):
+        """Test that batches are split across the executor's workers"""
+        for minutes in range(5):
+            _energy(db_session, 600.0, minutes)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            stats = run_backfill(db_session, BackfillCheckpoint(service="energy"), executor=executor, workers=2)
+
+        assert stats.derived == 5
+        assert len(_derived(db_session)) == 5
+
+    def test_reports_progress_per_batch(self, db_session):
+        """Test that on_batch sees the checkpoint after every batch"""
+        for minutes in range(3):
+            _energy(db_session, 100.0, minutes)
+        seen = []
+
+        run_backfill(db_session, BackfillCheckpoint(service="energy"), batch_size=2,
+                     on_batch=lambda checkpoint: seen.append(checkpoint.stats.scanned))
+
+        assert seen == [2, 3]
+
+
+class TestBackfillCheckpoint:
+    """Tests for BackfillCheckpoint"""
+
+    def test_round_trips_through_file(self, tmp_path):
+        """Test that a saved checkpoint loads back identically"""
+        checkpoint = BackfillCheckpoint(service="energy", since=BASE, last_created_at=BASE, last_id=None)
+        checkpoint.stats.scanned = 10
+        path = str(tmp_path / "checkpoint.json")
+
+        checkpoint.save(path)
+
+        assert BackfillCheckpoint.load(path) == checkpoint
+
+    def test_scope_comparison(self):
+        """Test that checkpoints for another service or range are told apart"""
+        checkpoint = BackfillCheckpoint(service="energy", since=BASE)
+
+        assert checkpoint.same_scope(BackfillCheckpoint(service="energy", since=BASE))
+        assert not checkpoint.same_scope(BackfillCheckpoint(service="health", since=BASE))
@@ -0,0 +1,144 @@
+"""
+Tests for offline bulk import of sensor dumps
+"""
+import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app.application.bulk_import import ImportOptions, ImportStats, detect_format, read_records, run_import
+from app.application.rollups import query_rollups
+from app.application.sketches import top_items
+from app.infra.persistence.models.event import Event
+from app.infra.persistence.models.outbox import OutboxMessage
+
+
+@pytest.fixture
+def ndjson_dump(tmp_path):
+    path = tmp_path / "readings.ndjson"
+    records = [
+        {"meter": "m1", "energy": 100.0, "neighborhood": "downtown", "read_at": "2025-06-01T10:00:00+00:00"},
+        {"meter": "m2", "energy": 700.0, "neighborhood": "uptown", "read_at": "2025-06-01T10:05:00+00:00"},
+        {"meter": "m1", "energy": 100.0, "neighborhood": "downtown", "read_at": "2025-06-01T10:00:00+00:00"},
+    ]
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n\n")
+    return path
+
+
+def _base_events(db_session):
+    return db_session.execute(
+        select(Event).where(Event.source_event_id.is_(None)).order_by(Event.timestamp)
+    ).scalars().all()
+
+
+class TestReadRecords:
+    """Tests for read_records and detect_format"""
+
+    def test_reads_csv_with_empty_cells_as_none(self, tmp_path):
+        """Test that CSV rows become dicts and empty cells become None"""
+        path = tmp_path / "gps.csv"
+        path.write_text("bus_id,line\n42,\n43,7\n")
+        stats = ImportStats()
+
+        records = list(read_records(str(path), detect_format(str(path)), stats))
+
+        assert records == [(2, {"bus_id": "42", "line": None}), (3, {"bus_id": "43", "line": "7"})]
+        assert stats.bytes_read == path.stat().st_size
+
+    def test_ndjson_line_numbers_count_blank_lines(self, tmp_path):
+        """Test that records carry their physical line, past blank lines"""
+        path = tmp_path / "gps.ndjson"
+        path.write_text('{"bus_id": 1}\n\n\n{"bus_id": 2}\n')
+
+        records = list(read_records(str(path), "ndjson", ImportStats()))
+
+        assert records == [(1, {"bus_id": 1}), (4, {"bus_id": 2})]
+
+    def test_unknown_extension(self):
+        """Test that a file with an unknown extension is rejected"""
+        with pytest.raises(ValueError):
+            detect_format("dump.xml")
+
+
+class TestRunImport:
+    """Tests for run_import function"""
+
+    def test_imports_normalized_records(self, db_session, ndjson_dump):
+        """Test that every record becomes a normalized base event"""
+        stats = run_import(db_session, str(ndjson_dump), ImportOptions(service="energy", timestamp_field="read_at"))
+
+        events = _base_events(db_session)
+        assert (stats.read, stats.imported, stats.derived) == (3, 3, 0)
+        assert events[-1].normalized_payload["energy"] == 700.0
+        assert events[-1].timestamp.replace(tzinfo=timezone.utc) == datetime(2025, 6, 1, 10, 5, tzinfo=timezone.utc)
+
+    def test_dedupe_key_skips_repeats_across_chunks_and_runs(self, db_session, ndjson_dump):
+        """Test that records with an already imported dedupe key are skipped"""
+        options = ImportOptions(service="energy", dedupe_key="{meter}-{read_at}")
+
+        first = run_import(db_session, str(ndjson_dump), options, chunk_size=1)
+        second = run_import(db_session, str(ndjson_dump), options)
+
+        assert (first.imported, first.duplicates) == (2, 1)
+        assert (second.imported, second.duplicates) == (0, 3)
+        assert len(_base_events(db_session)) == 2
+
+    def test_imported_events_reach_rollups(self, db_session, ndjson_dump):
+        """Test that imported events reach rollups and sketches by reading time, and duplicates do not"""
+        options = ImportOptions(service="energy", timestamp_field="read_at", dedupe_key="{meter}-{read_at}")
+
+        run_import(db_session, str(ndjson_dump), options)
+        run_import(db_session, str(ndjson_dump), options)
+
+        since = datetime(2025, 6, 1, tzinfo=timezone.utc)
+        [row] = query_rollups(db_session, "energy", "hour", since=since)
+        assert (row.count, row.max) == (2, 700.0)
+        assert [item for item, _, _ in top_items(db_session, "energy", "neighborhood", since=since)] == ["uptown", "downtown"]
+
+    def test_missing_dedupe_field_names_the_line(self, db_session, ndjson_dump):
+        """Test that a template field missing from a record is reported with its line"""
+        with pytest.raises(ValueError, match="readings.ndjson:1"):
+            run_import(db_session, str(ndjson_dump), ImportOptions(service="energy", file="readings.ndjson",
+                                                                   dedupe_key="{serial}"))
+
+    def test_line_in_dedupe_key_is_the_file_line(self, db_session, tmp_path):
+        """Test that {line} in a dedupe key is the record's line in the file, header included"""
+        path = tmp_path / "readings.csv"
+        path.write_text("energy,neighborhood\n100,downtown\n200,uptown\n")
+
+        run_import(db_session, str(path), ImportOptions(service="energy", file="readings.csv", dedupe_key="{file}-{line}"))
+
+        keys = {event.deduplication_key for event in _base_events(db_session)}
+        assert keys == {"readings.csv-2", "readings.csv-3"}
+
+    def test_rules_run_only_when_asked(self, db_session, ndjson_dump):
+        """Test that --evaluate writes derived events and --enqueue queues them"""
+        options = ImportOptions(service="energy", timestamp_field="read_at", evaluate=True, enqueue=True)
+
+        stats = run_import(db_session, str(ndjson_dump), options)
+
+        [derived] = db_session.execute(select(Event).where(Event.source_event_id.is_not(None))).scalars().all()
+        assert stats.derived == 1
+        assert derived.service == "security"
+        assert derived.timestamp.replace(tzinfo=timezone.utc) == datetime(2025, 6, 1, 10, 5, tzinfo=timezone.utc)
+        assert db_session.query(OutboxMessage).count() == 1
+
+    def test_normalizes_through_executor(self, db_session, ndjson_dump):
+        """Test that chunks normalized by workers are loaded in file order"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            stats = run_import(db_session, str(ndjson_dump), ImportOptions(service="energy", timestamp_field="read_at"),
+                               chunk_size=1, executor=executor)
+
+        assert stats.imported == 3
+        assert [event.normalized_payload["energy"] for event in _base_events(db_session)] == [100.0, 100.0, 700.0]
+
+    def test_reports_progress_per_chunk(self, db_session, ndjson_dump):
+        """Test that on_chunk sees the running totals after every chunk"""
+        seen = []
+
+        run_import(db_session, str(ndjson_dump), ImportOptions(service="energy"), chunk_size=2,
+                   on_chunk=lambda stats: seen.append(stats.read))
+
+        assert seen == [2, 3]
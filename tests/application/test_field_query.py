@@ -0,0 +1,50 @@
+"""
+Tests for normalized payload field queries
+"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.application.field_query import payload_filter
+from app.infra.persistence.models.event import Event
+
+
+class TestPayloadFilter:
+    """Tests for payload_filter function"""
+
+    def test_values_are_coerced_by_the_service_schema(self):
+        """Test that query-string values get the type they are stored with"""
+        assert payload_filter("health", {"patient_id": "123"}) == {"patient_id": 123}
+        assert payload_filter("transport", {"bus_id": "42"}) == {"bus_id": 42}
+
+    def test_multiple_fields_form_one_document(self):
+        """Test that several filters are combined into a single containment document"""
+        result = payload_filter("health", {"patient_id": "7", "location": "Rua das Flores, 100"})
+
+        assert result == {"patient_id": 7, "location": "Rua das Flores, 100"}
+
+    def test_rejects_fields_that_are_not_indexed(self):
+        """Test that only the service's key fields can be filtered on"""
+        with pytest.raises(ValueError, match="not indexed"):
+            payload_filter("energy", {"energy": "500"})
+
+    def test_rejects_services_without_key_fields(self):
+        """Test that unknown services are rejected"""
+        with pytest.raises(ValueError, match="no indexed payload fields"):
+            payload_filter("custom", {"x": "1"})
+
+    def test_requires_at_least_one_field(self):
+        """Test that an empty filter is rejected"""
+        with pytest.raises(ValueError):
+            payload_filter("energy", {})
+
+    def test_compiles_to_jsonb_containment(self):
+        """Test that the filter becomes a @> predicate on PostgreSQL"""
+        query = select(Event.id).where(
+            Event.service == "energy",
+            Event.normalized_payload.contains(payload_filter("energy", {"neighborhood": "downtown"})),
+        )
+
+        sql = str(query.compile(dialect=postgresql.dialect()))
+
+        assert "events.normalized_payload @> %(normalized_payload_1)s" in sql
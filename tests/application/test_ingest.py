@@ -3,19 +3,57 @@ Tests for event ingestion
 """
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from app.application.ingest import ingest_event, _persist_derived_events
 from app.domain.events.types import NormalizedEvent, DerivedEventSpec
+from app.domain.orchestration.factories.common import SimpleComponentsFactory
+from app.domain.orchestration.persistence import FULL_PERSISTENCE, PersistencePolicy
+from app.domain.events.normalization.payloads import TransportPayload
+from app.infra.outbox.relay import OutboxRelay, relay_messages
+from app.infra.persistence.models.entity_state import EntityState
 from app.infra.persistence.models.event import Event
+from app.infra.persistence.models.outbox import OutboxMessage
+
+
+@pytest.fixture
+def app_json_session():
+    """SQLite session serializing JSON columns the way the application engine does"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from app.core.db import Base, engine_options
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool, **engine_options("sqlite://")
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+
+
+def _large_int_factory():
+    factory = Mock()
+    factory.normalizer.return_value.normalize.return_value = NormalizedEvent(
+        service="misc",
+        timestamp=datetime.now(timezone.utc),
+        raw_payload={"reading": 2**70},
+        normalized_payload={"reading": 2**70, "unit": None},
+    )
+    factory.rule_evaluator.return_value.evaluate.return_value = []
+    factory.persistence_policy.return_value = FULL_PERSISTENCE
+    return factory
 
 
 class TestIngestEvent:
     """Tests for ingest_event function"""
 
     @patch('app.application.ingest.registry')
-    @patch('app.application.ingest.enqueue_notification')
-    def test_ingest_new_event_creates_base_and_derived(self, mock_enqueue, mock_registry, db_session):
+    def test_ingest_new_event_creates_base_and_derived(self, mock_registry, db_session):
         """Test ingesting a new event creates base and derived events"""
         # Setup mocks
         mock_factory = Mock()
@@ -39,6 +77,7 @@ class TestIngestEvent:
         
         mock_factory.normalizer.return_value = mock_normalizer
         mock_factory.rule_evaluator.return_value = mock_rule_evaluator
+        mock_factory.persistence_policy.return_value = FULL_PERSISTENCE
         mock_registry.get.return_value = mock_factory
         
         # Execute
@@ -50,7 +89,14 @@ class TestIngestEvent:
         assert len(derived) == 1
         assert derived[0].service == "security"
         assert derived[0].source_event_id == base.id
-        mock_enqueue.assert_called_once()
+        assert db_session.query(OutboxMessage).count() == 1
+
+    @patch('app.application.ingest.rollup_accumulator')
+    def test_ingest_feeds_rollups(self, mock_accumulator, db_session):
+        """Test that committed base and derived events are handed to the rollup accumulator"""
+        base, derived = ingest_event("energy", {"energy": 600.0, "neighborhood": "downtown"}, db_session)
+
+        mock_accumulator.add_events.assert_called_once_with([base, *derived])
 
     @patch('app.application.ingest.registry')
     def test_ingest_with_dedupe_key_returns_existing(self, mock_registry, db_session):
@@ -87,8 +133,7 @@ class TestIngestEvent:
         mock_registry.get.assert_not_called()
 
     @patch('app.application.ingest.registry')
-    @patch('app.application.ingest.enqueue_notification')
-    def test_ingest_with_no_derived_events(self, mock_enqueue, mock_registry, db_session):
+    def test_ingest_with_no_derived_events(self, mock_registry, db_session):
         """Test ingesting event that produces no derived events"""
         mock_factory = Mock()
         mock_normalizer = Mock()
@@ -105,6 +150,7 @@ class TestIngestEvent:
         
         mock_factory.normalizer.return_value = mock_normalizer
         mock_factory.rule_evaluator.return_value = mock_rule_evaluator
+        mock_factory.persistence_policy.return_value = FULL_PERSISTENCE
         mock_registry.get.return_value = mock_factory
         
         # Execute
@@ -113,11 +159,10 @@ class TestIngestEvent:
         # Assertions
         assert isinstance(base, Event)
         assert len(derived) == 0
-        mock_enqueue.assert_not_called()
+        assert db_session.query(OutboxMessage).count() == 0
 
     @patch('app.application.ingest.registry')
-    @patch('app.application.ingest.enqueue_notification')
-    def test_ingest_sets_deduplication_key(self, mock_enqueue, mock_registry, db_session):
+    def test_ingest_sets_deduplication_key(self, mock_registry, db_session):
         """Test that deduplication key is set on base event"""
         mock_factory = Mock()
         mock_normalizer = Mock()
@@ -134,6 +179,7 @@ class TestIngestEvent:
         
         mock_factory.normalizer.return_value = mock_normalizer
         mock_factory.rule_evaluator.return_value = mock_rule_evaluator
+        mock_factory.persistence_policy.return_value = FULL_PERSISTENCE
         mock_registry.get.return_value = mock_factory
         
         # Execute
@@ -143,8 +189,7 @@ class TestIngestEvent:
         assert base.deduplication_key == "test_key"
 
     @patch('app.application.ingest.registry')
-    @patch('app.application.ingest.enqueue_notification')
-    def test_ingest_commits_transaction(self, mock_enqueue, mock_registry, db_session):
+    def test_ingest_commits_transaction(self, mock_registry, db_session):
         """Test that ingest commits the transaction"""
         mock_factory = Mock()
         mock_normalizer = Mock()
@@ -161,6 +206,7 @@ class TestIngestEvent:
         
         mock_factory.normalizer.return_value = mock_normalizer
         mock_factory.rule_evaluator.return_value = mock_rule_evaluator
+        mock_factory.persistence_policy.return_value = FULL_PERSISTENCE
         mock_registry.get.return_value = mock_factory
         
         # Execute
@@ -172,23 +218,217 @@ class TestIngestEvent:
         events = db_session.execute(select(Event)).scalars().all()
         assert len(events) == 1
 
+    @patch('app.application.ingest.registry')
+    def test_ingest_with_relay_hands_over_outbox_messages_after_commit(self, mock_registry, db_session):
+        """Test that a relay receives the committed outbox messages and the worker waits for it"""
+        mock_factory = Mock()
+        mock_normalizer = Mock()
+        mock_rule_evaluator = Mock()
 
-class TestPersistDerivedEvents:
-    """Tests for _persist_derived_events function"""
-
-    @patch('app.application.ingest.enqueue_notification')
-    def test_persist_derived_events_creates_events(self, mock_enqueue, db_session):
-        """Test that _persist_derived_events creates derived events"""
-        normalized = NormalizedEvent(
+        mock_normalizer.normalize.return_value = NormalizedEvent(
             service="energy",
             timestamp=datetime.now(timezone.utc),
             raw_payload={"energy": 600.0},
             normalized_payload={"energy": 600.0}
         )
-        
-        mock_factory = Mock()
-        mock_rule_evaluator = Mock()
         mock_rule_evaluator.evaluate.return_value = [
+            DerivedEventSpec(service="security", payload={"alert": "possible_risk"})
+        ]
+        mock_factory.normalizer.return_value = mock_normalizer
+        mock_factory.rule_evaluator.return_value = mock_rule_evaluator
+        mock_factory.persistence_policy.return_value = FULL_PERSISTENCE
+        mock_registry.get.return_value = mock_factory
+
+        schedule = Mock()
+        relay = OutboxRelay(schedule, grace=timedelta(seconds=30))
+
+        ingest_event("energy", {"energy": 600.0}, db_session, relay=relay)
+
+        from sqlalchemy import select
+        msg = db_session.execute(select(OutboxMessage)).scalar_one()
+        schedule.assert_called_once_with(relay_messages, [msg.id])
+        assert msg.next_attempt_at - msg.created_at == timedelta(seconds=30)
+
+    @patch('app.infra.persistence.bulk.BULK_INSERT_MIN_ROWS', 2)
+    @patch('app.application.ingest.registry')
+    def test_ingest_with_bulk_derived_events(self, mock_registry, db_session):
+        """Test that derived events and notifications written on the bulk path are returned and tracked"""
+        factory = Mock()
+        factory.normalizer.return_value.normalize.return_value = NormalizedEvent(
+            service="energy",
+            timestamp=datetime.now(timezone.utc),
+            raw_payload={"energy": 600.0},
+            normalized_payload={"energy": 600.0},
+        )
+        factory.rule_evaluator.return_value.evaluate.return_value = [
+            DerivedEventSpec(service="security", payload={"alert": i}) for i in range(5)
+        ]
+        factory.persistence_policy.return_value = FULL_PERSISTENCE
+        mock_registry.get.return_value = factory
+        schedule = Mock()
+        relay = OutboxRelay(schedule)
+
+        base, derived = ingest_event("energy", {"energy": 600.0}, db_session, relay=relay)
+
+        assert [event.payload for event in derived] == [{"alert": i} for i in range(5)]
+        assert all(event.source_event_id == base.id for event in derived)
+        from sqlalchemy import select
+        ids = set(db_session.execute(select(OutboxMessage.id)).scalars())
+        assert len(ids) == 5
+        schedule.assert_called_once()
+        assert set(schedule.call_args.args[1]) == ids
+
+    @patch('app.application.ingest.registry')
+    def test_ingest_integer_beyond_64_bits(self, mock_registry, app_json_session):
+        """Test that a payload orjson cannot encode is still stored and read back exactly"""
+        mock_registry.get.return_value = _large_int_factory()
+
+        with patch("app.infra.persistence.payload_storage.COMPACT_STORAGE", False):
+            base, _ = ingest_event("misc", {"reading": 2**70}, app_json_session)
+
+        app_json_session.expire_all()
+        stored = app_json_session.get(Event, base.id)
+        assert stored.payload == {"reading": 2**70}
+        assert stored.normalized_payload == {"reading": 2**70, "unit": None}
+
+    @patch('app.application.ingest.registry')
+    def test_ingest_integer_beyond_64_bits_compact(self, mock_registry, app_json_session):
+        """Test that compact storage handles a payload orjson cannot encode"""
+        mock_registry.get.return_value = _large_int_factory()
+
+        base, _ = ingest_event("misc", {"reading": 2**70}, app_json_session)
+
+        app_json_session.expire_all()
+        stored = app_json_session.get(Event, base.id)
+        assert stored.payload is None
+        assert stored.normalized_payload == {"reading": 2**70}
+
+    def test_ingest_stores_valid_payload_once(self, db_session):
+        """Test that a payload normalization does not change is stored only as normalized_payload"""
+        base, _ = ingest_event("transport", {"bus_id": 42, "lat": -23.5}, db_session)
+
+        assert base.payload is None
+        assert base.normalized_payload == {"bus_id": 42, "lat": -23.5}
+        assert base.raw_payload == {"bus_id": 42, "lat": -23.5}
+
+    def test_ingest_keeps_raw_payload_when_coerced(self, db_session):
+        """Test that the raw payload is kept when normalization changed it"""
+        base, _ = ingest_event("transport", {"bus_id": "42"}, db_session)
+
+        assert base.payload == {"bus_id": "42"}
+        assert base.normalized_payload == {"bus_id": 42}
+
+
+class TestIngestPersistencePolicy:
+    """Tests for ingest_event honouring the factory's persistence policy"""
+
+    def _ingest(self, db_session, policy, payload, dedupe_key=None):
+        factory = SimpleComponentsFactory(service="transport", schema=TransportPayload, persistence=policy)
+        with patch('app.application.ingest.registry') as mock_registry:
+            mock_registry.get.return_value = factory
+            return ingest_event("transport", payload, db_session, dedupe_key)
+
+    def _stored(self, db_session):
+        from sqlalchemy import select
+        return db_session.execute(select(Event).where(Event.service == "transport")).scalars().all()
+
+    def test_sampled_every_n_stores_one_in_n(self, db_session):
+        """Test that a 1-in-N policy stores every Nth base event"""
+        policy = PersistencePolicy(mode="sampled", sample_every=3)
+        for i in range(7):
+            self._ingest(db_session, policy, {"bus_id": i})
+
+        assert sorted(event.normalized_payload["bus_id"] for event in self._stored(db_session)) == [0, 3, 6]
+
+    @patch('app.application.ingest.rollup_accumulator')
+    def test_unstored_event_is_counted_but_not_returned(self, mock_accumulator, db_session):
+        """Test that an event the policy drops is never written but still reaches the rollups"""
+        base, _ = self._ingest(db_session, PersistencePolicy(mode="discard"), {"bus_id": 1})
+
+        assert base is None
+        assert self._stored(db_session) == []
+        [counted] = mock_accumulator.add_events.call_args.args[0]
+        assert counted.normalized_payload["bus_id"] == 1
+        assert counted.created_at is not None
+
+    def test_event_with_dedupe_key_is_always_stored(self, db_session):
+        """Test that a keyed event is stored under any policy, so a retry finds it"""
+        policy = PersistencePolicy(mode="discard")
+        first, _ = self._ingest(db_session, policy, {"bus_id": 1}, dedupe_key="ping-1")
+        retry, _ = self._ingest(db_session, policy, {"bus_id": 1}, dedupe_key="ping-1")
+
+        assert first is not None
+        assert retry.id == first.id
+        assert [event.id for event in self._stored(db_session)] == [first.id]
+
+    def test_state_only_upserts_latest_state(self, db_session):
+        """Test that a state-only policy keeps one row per entity with its newest payload"""
+        policy = PersistencePolicy(mode="state", state_key="bus_id")
+        self._ingest(db_session, policy, {"bus_id": 7, "lat": 1.0})
+        self._ingest(db_session, policy, {"bus_id": 7, "lat": 2.0})
+        self._ingest(db_session, policy, {"bus_id": 8, "lat": 3.0})
+
+        state = db_session.get(EntityState, ("transport", "7"))
+        assert state.payload["lat"] == 2.0
+        assert state.event_id is None
+        assert db_session.query(EntityState).count() == 2
+        assert self._stored(db_session) == []
+
+    def test_base_with_derived_events_is_stored_under_discard_policy(self, db_session):
+        """Test that a base event with derived events is stored so they can reference it"""
+        factory = Mock()
+        factory.normalizer.return_value.normalize.return_value = NormalizedEvent(
+            service="transport",
+            timestamp=datetime.now(timezone.utc),
+            raw_payload={"bus_id": 1},
+            normalized_payload={"bus_id": 1},
+        )
+        factory.rule_evaluator.return_value.evaluate.return_value = [
+            DerivedEventSpec(service="security", payload={"alert": "late"})
+        ]
+        factory.persistence_policy.return_value = PersistencePolicy(mode="discard")
+
+        with patch('app.application.ingest.registry') as mock_registry:
+            mock_registry.get.return_value = factory
+            base, derived = ingest_event("transport", {"bus_id": 1}, db_session)
+
+        assert base is not None
+        assert len(derived) == 1
+        assert derived[0].source_event_id == base.id
+        assert [event.id for event in self._stored(db_session)] == [base.id]
+
+    def test_sampled_service_with_rules_stores_every_base_with_derived_events(self, db_session):
+        """Test that sampling only skips base events that no rule derived anything from"""
+        factory = Mock()
+        factory.normalizer.return_value.normalize.side_effect = lambda payload: NormalizedEvent(
+            service="transport",
+            timestamp=datetime.now(timezone.utc),
+            raw_payload=payload,
+            normalized_payload=payload,
+        )
+        factory.rule_evaluator.return_value.evaluate.side_effect = lambda normalized: [
+            DerivedEventSpec(service="security", payload={"late": normalized.normalized_payload["bus_id"]})
+        ] if normalized.normalized_payload["late"] else []
+        factory.persistence_policy.return_value = PersistencePolicy(mode="sampled", sample_every=100)
+
+        with patch('app.application.ingest.registry') as mock_registry:
+            mock_registry.get.return_value = factory
+            for i in range(6):
+                ingest_event("transport", {"bus_id": i, "late": i % 2 == 1}, db_session)
+
+        stored = {event.id: event.normalized_payload["bus_id"] for event in self._stored(db_session)}
+        assert sorted(stored.values()) == [0, 1, 3, 5]
+        from sqlalchemy import select
+        derived = db_session.execute(select(Event).where(Event.service == "security")).scalars().all()
+        assert sorted(stored[event.source_event_id] for event in derived) == [1, 3, 5]
+
+
+class TestPersistDerivedEvents:
+    """Tests for _persist_derived_events function"""
+
+    def test_persist_derived_events_creates_events(self, db_session):
+        """Test that _persist_derived_events creates derived events"""
+        derived_specs = [
             DerivedEventSpec(
                 service="security",
                 payload={"alert": "test"},
@@ -199,14 +439,13 @@ class TestPersistDerivedEvents:
                 payload={"action": "test"},
             )
         ]
-        mock_factory.rule_evaluator.return_value = mock_rule_evaluator
         
         # Use a simple UUID for SQLite
         import uuid
         base_id = uuid.uuid4()
         
         # Execute
-        derived_events = _persist_derived_events(normalized, mock_factory, base_id, db_session)
+        derived_events = _persist_derived_events(derived_specs, base_id, db_session)
         
         # Assertions
         assert len(derived_events) == 2
@@ -215,29 +454,16 @@ class TestPersistDerivedEvents:
         assert derived_events[0].deduplication_key == "derived_key"
         assert derived_events[1].service == "transport"
         assert derived_events[1].deduplication_key is None
-        assert mock_enqueue.call_count == 2
+        assert db_session.query(OutboxMessage).count() == 2
 
-    @patch('app.application.ingest.enqueue_notification')
-    def test_persist_derived_events_with_no_specs(self, mock_enqueue, db_session):
+    def test_persist_derived_events_with_no_specs(self, db_session):
         """Test _persist_derived_events with no derived specs"""
-        normalized = NormalizedEvent(
-            service="energy",
-            timestamp=datetime.now(timezone.utc),
-            raw_payload={"energy": 400.0},
-            normalized_payload={"energy": 400.0}
-        )
-        
-        mock_factory = Mock()
-        mock_rule_evaluator = Mock()
-        mock_rule_evaluator.evaluate.return_value = []
-        mock_factory.rule_evaluator.return_value = mock_rule_evaluator
-        
         import uuid
         base_id = uuid.uuid4()
         
         # Execute
-        derived_events = _persist_derived_events(normalized, mock_factory, base_id, db_session)
+        derived_events = _persist_derived_events([], base_id, db_session)
         
         # Assertions
         assert len(derived_events) == 0
-        mock_enqueue.assert_not_called()
+        assert db_session.query(OutboxMessage).count() == 0
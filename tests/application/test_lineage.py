@@ -0,0 +1,94 @@
+"""
+Tests for event lineage retrieval
+"""
+import uuid
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from app.application.lineage import LRUCache, get_lineage, lineage_cache
+from app.infra.persistence.models.event import Event
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    lineage_cache.clear()
+    yield
+    lineage_cache.clear()
+
+
+def _event(db_session, service, source=None):
+    event = Event(service=service, timestamp=datetime.now(timezone.utc), payload={"service": service},
+                  source_event_id=source.id if source else None)
+    db_session.add(event)
+    db_session.commit()
+    return event
+
+
+class TestLRUCache:
+    """Tests for LRUCache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the entry not read for the longest time is evicted first"""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_zero_size_disables_cache(self):
+        """Test that a cache of size 0 stores nothing"""
+        cache = LRUCache(0)
+        cache.put("a", 1)
+
+        assert cache.get("a") is None
+
+    def test_entries_expire_after_ttl(self):
+        """Test that an entry is dropped once its TTL has passed"""
+        now = [100.0]
+        cache = LRUCache(2, ttl=60, clock=lambda: now[0])
+        cache.put("a", 1)
+
+        now[0] = 159.0
+        assert cache.get("a") == 1
+        now[0] = 160.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestGetLineage:
+    """Tests for get_lineage function"""
+
+    def test_builds_nested_tree(self, db_session):
+        """Test that rows are nested under their source event"""
+        root = _event(db_session, "health")
+        first = _event(db_session, "transport", root)
+        second = _event(db_session, "security", root)
+        nested = _event(db_session, "energy", first)
+
+        tree = get_lineage(db_session, root.id)
+
+        assert tree["id"] == root.id
+        assert {child["id"] for child in tree["children"]} == {first.id, second.id}
+        first_node = next(child for child in tree["children"] if child["id"] == first.id)
+        assert [node["id"] for node in first_node["children"]] == [nested.id]
+
+    def test_unknown_event_returns_none(self, db_session):
+        """Test that a missing event is reported as None and not cached"""
+        assert get_lineage(db_session, uuid.uuid4()) is None
+        assert len(lineage_cache) == 0
+
+    def test_second_call_served_from_cache(self, db_session):
+        """Test that a cached tree does not hit the database again"""
+        root = _event(db_session, "health")
+        get_lineage(db_session, root.id)
+
+        with patch("app.application.lineage.EventRepository") as repo:
+            tree = get_lineage(db_session, root.id)
+
+        repo.assert_not_called()
+        assert tree["id"] == root.id
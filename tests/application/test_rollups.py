@@ -0,0 +1,125 @@
+"""
+Tests for time-bucket event rollups
+"""
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+from app.application.rollups import (
+    RollupAccumulator,
+    bucket_start,
+    flush_rollups,
+    query_rollups,
+    upsert_rollups,
+)
+from app.infra.persistence.models.event import Event
+
+T = datetime(2026, 3, 1, 10, 17, 42, tzinfo=timezone.utc)
+MINUTE = datetime(2026, 3, 1, 10, 17, tzinfo=timezone.utc)
+HOUR = datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def _utc(value):
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class TestBucketStart:
+    """Tests for bucket_start function"""
+
+    def test_truncates_to_bucket(self):
+        """Test that timestamps snap to the start of their bucket"""
+        assert bucket_start(T, 60) == MINUTE
+        assert bucket_start(T, 3600) == HOUR
+
+    def test_naive_timestamps_are_utc(self):
+        """Test that naive timestamps are treated as UTC"""
+        assert bucket_start(T.replace(tzinfo=None), 60) == MINUTE
+
+
+class TestRollupAccumulator:
+    """Tests for RollupAccumulator"""
+
+    def test_counts_service_and_key_rows_per_interval(self):
+        """Test that an event lands in the service row and its key row for every interval"""
+        accumulator = RollupAccumulator()
+        accumulator.add("energy", T, {"energy": 600.0, "neighborhood": "downtown"})
+        accumulator.add("energy", T, {"energy": 200.0, "neighborhood": "downtown"})
+        accumulator.add("energy", T, {"energy": None, "neighborhood": "uptown"})
+
+        cells = accumulator.drain()
+
+        total = cells[("energy", 60, "", MINUTE)]
+        assert (total.count, total.value_count, total.value_sum) == (3, 2, 800.0)
+        downtown = cells[("energy", 3600, "downtown", HOUR)]
+        assert (downtown.count, downtown.value_min, downtown.value_max) == (2, 200.0, 600.0)
+        assert cells[("energy", 60, "uptown", MINUTE)].value_count == 0
+        assert len(accumulator) == 0
+
+    def test_unknown_service_counted_without_keys(self):
+        """Test that services without rollup fields only get the service-wide row"""
+        accumulator = RollupAccumulator()
+        accumulator.add("parking", T, {"spot": 7})
+
+        assert set(accumulator.drain()) == {("parking", 60, "", MINUTE), ("parking", 3600, "", HOUR)}
+
+    def test_derived_events_use_raw_payload(self):
+        """Test that events without a normalized payload are keyed by their payload"""
+        accumulator = RollupAccumulator()
+        accumulator.add_events([Event(service="security", timestamp=T, payload={"alert": "possible_risk"})])
+
+        assert ("security", 60, "possible_risk", MINUTE) in accumulator.drain()
+
+    def test_merge_combines_cells(self):
+        """Test that drained cells put back merge with newer ones"""
+        accumulator = RollupAccumulator()
+        accumulator.add("energy", T, {"energy": 100.0})
+        cells = accumulator.drain()
+        accumulator.add("energy", T, {"energy": 50.0})
+
+        accumulator.merge(cells)
+
+        cell = accumulator.drain()[("energy", 60, "", MINUTE)]
+        assert (cell.count, cell.value_sum, cell.value_min, cell.value_max) == (2, 150.0, 50.0, 100.0)
+
+
+class TestUpsertRollups:
+    """Tests for upsert_rollups and query_rollups"""
+
+    def test_upserts_add_onto_stored_rows(self, db_session):
+        """Test that a second flush adds counts and widens min/max"""
+        first, second = RollupAccumulator(), RollupAccumulator()
+        first.add("energy", T, {"energy": 600.0, "neighborhood": "downtown"})
+        second.add("energy", T, {"energy": 200.0, "neighborhood": "downtown"})
+        second.add("energy", T, {"neighborhood": "downtown"})
+
+        upsert_rollups(db_session, first.drain())
+        upsert_rollups(db_session, second.drain())
+        db_session.commit()
+
+        [row] = query_rollups(db_session, "energy", "hour", key="downtown")
+        assert _utc(row.bucket) == HOUR
+        assert (row.count, row.sum, row.avg, row.min, row.max) == (3, 800.0, 400.0, 200.0, 600.0)
+
+    def test_query_by_key_and_range(self, db_session):
+        """Test that by_key returns every key and since snaps to the bucket"""
+        accumulator = RollupAccumulator()
+        accumulator.add("energy", T, {"energy": 1.0, "neighborhood": "downtown"})
+        accumulator.add("energy", T, {"energy": 2.0, "neighborhood": "uptown"})
+        upsert_rollups(db_session, accumulator.drain())
+        db_session.commit()
+
+        rows = query_rollups(db_session, "energy", "minute", by_key=True, since=T)
+
+        assert [(row.key, row.avg) for row in rows] == [("downtown", 1.0), ("uptown", 2.0)]
+        assert query_rollups(db_session, "energy", "minute", until=MINUTE) == []
+
+    def test_failed_flush_keeps_cells(self):
+        """Test that cells survive a flush that fails"""
+        accumulator = RollupAccumulator()
+        accumulator.add("energy", T, {"energy": 1.0})
+        session = Mock()
+        session.execute.side_effect = RuntimeError("database down")
+
+        assert flush_rollups(accumulator, lambda: session) == 0
+        session.rollback.assert_called_once()
+        assert len(accumulator) == 2
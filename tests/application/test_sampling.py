@@ -0,0 +1,75 @@
+"""
+Tests for persistence policy sampling
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.application.sampling import EventSampler, entity_key, should_store
+from app.domain.orchestration.persistence import PersistencePolicy
+
+T0 = datetime(2026, 10, 19, 12, 0, 0, tzinfo=timezone.utc)
+
+
+class TestPersistencePolicy:
+    """Tests for PersistencePolicy validation"""
+
+    def test_rejects_unknown_mode(self):
+        """Test that an unknown mode is rejected"""
+        with pytest.raises(ValueError):
+            PersistencePolicy(mode="sometimes")
+
+    @pytest.mark.parametrize("kwargs", [{}, {"sample_every": 10, "sample_seconds": 15}])
+    def test_sampled_needs_exactly_one_rate(self, kwargs):
+        """Test that a sampled policy needs one of sample_every or sample_seconds"""
+        with pytest.raises(ValueError):
+            PersistencePolicy(mode="sampled", **kwargs)
+
+    def test_state_needs_key(self):
+        """Test that a state-only policy needs a state_key"""
+        with pytest.raises(ValueError):
+            PersistencePolicy(mode="state")
+
+
+class TestShouldStore:
+    """Tests for should_store"""
+
+    def test_full_and_unstored_modes(self):
+        """Test that full always stores and state/discard never do"""
+        sampler = EventSampler()
+        assert should_store(PersistencePolicy(), "energy", {}, T0, sampler)
+        assert not should_store(PersistencePolicy(mode="state", state_key="bus_id"), "transport", {"bus_id": 1}, T0, sampler)
+        assert not should_store(PersistencePolicy(mode="discard"), "transport", {}, T0, sampler)
+
+    def test_time_based_keeps_first_per_key_and_bucket(self):
+        """Test that time-based sampling keeps one event per key in each bucket"""
+        sampler = EventSampler()
+        policy = PersistencePolicy(mode="sampled", sample_seconds=15, state_key="bus_id")
+
+        kept = [
+            should_store(policy, "transport", {"bus_id": bus}, T0 + timedelta(seconds=offset), sampler)
+            for bus, offset in [(1, 0), (1, 5), (2, 5), (1, 14), (1, 15), (2, 20)]
+        ]
+
+        assert kept == [True, False, True, False, True, True]
+
+    def test_time_based_without_key_samples_per_service(self):
+        """Test that events lacking the key share one service-wide schedule"""
+        sampler = EventSampler()
+        policy = PersistencePolicy(mode="sampled", sample_seconds=60, state_key="bus_id")
+
+        assert should_store(policy, "transport", {}, T0, sampler)
+        assert not should_store(policy, "transport", {"lat": 1.0}, T0 + timedelta(seconds=30), sampler)
+
+
+class TestEntityKey:
+    """Tests for entity_key"""
+
+    def test_key_is_text(self):
+        """Test that the key field's value is returned as text"""
+        assert entity_key(PersistencePolicy(state_key="bus_id"), {"bus_id": 42}) == "42"
+
+    def test_missing_key(self):
+        """Test that no key is returned without a state_key or a value"""
+        assert entity_key(PersistencePolicy(), {"bus_id": 42}) is None
+        assert entity_key(PersistencePolicy(state_key="bus_id"), {"lat": 1.0}) is None
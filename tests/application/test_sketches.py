@@ -0,0 +1,98 @@
+"""
+Tests for per-bucket sketch accumulation and storage
+"""
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+from app.application.sketches import (
+    DISTINCT,
+    TOP,
+    SketchAccumulator,
+    distinct_count,
+    flush_sketches,
+    store_sketches,
+    top_items,
+)
+from app.infra.persistence.models.event_sketch import EventSketch
+
+T = datetime(2026, 3, 1, 10, 17, tzinfo=timezone.utc)
+HOUR = datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc)
+DAY = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _accumulate(records):
+    accumulator = SketchAccumulator()
+    for service, payload in records:
+        accumulator.add(service, T, payload)
+    return accumulator
+
+
+class TestSketchAccumulator:
+    """Tests for SketchAccumulator"""
+
+    def test_tracks_configured_fields_per_bucket(self):
+        """Test that each configured field gets a sketch per interval"""
+        accumulator = _accumulate([("energy", {"energy": 600.0, "neighborhood": "downtown"})])
+
+        sketches = accumulator.drain()
+
+        assert set(sketches) == {
+            ("energy", DISTINCT, "neighborhood", 3600, HOUR),
+            ("energy", DISTINCT, "neighborhood", 86400, DAY),
+            ("energy", TOP, "neighborhood", 3600, HOUR),
+            ("energy", TOP, "neighborhood", 86400, DAY),
+        }
+        assert sketches[("energy", TOP, "neighborhood", 3600, HOUR)].top(1) == [("downtown", 600.0, 0.0)]
+
+    def test_skips_missing_fields_and_weights(self):
+        """Test that events without the field or a numeric weight are not ranked"""
+        accumulator = _accumulate([("energy", {"neighborhood": "downtown"}), ("energy", {"energy": 1.0})])
+
+        sketches = accumulator.drain()
+
+        assert ("energy", TOP, "neighborhood", 3600, HOUR) not in sketches
+        assert sketches[("energy", DISTINCT, "neighborhood", 3600, HOUR)].estimate() == 1
+
+
+class TestStoreSketches:
+    """Tests for store_sketches and the merged queries"""
+
+    def test_replica_rows_merge_across_flushes(self, db_session):
+        """Test that a replica's second flush merges into its stored row"""
+        store_sketches(db_session, _accumulate([("transport", {"bus_id": 1})]).drain(), replica="api-1")
+        store_sketches(db_session, _accumulate([("transport", {"bus_id": 2})]).drain(), replica="api-1")
+        db_session.commit()
+
+        assert db_session.query(EventSketch).filter_by(kind=DISTINCT, bucket_seconds=3600).count() == 1
+        assert distinct_count(db_session, "transport", "bus_id", "hour", since=T) == 2
+
+    def test_queries_merge_all_replicas(self, db_session):
+        """Test that rows from different replicas are merged at query time"""
+        store_sketches(db_session, _accumulate([
+            ("energy", {"energy": 600.0, "neighborhood": "downtown"}),
+            ("energy", {"energy": 100.0, "neighborhood": "uptown"}),
+        ]).drain(), replica="api-1")
+        store_sketches(db_session, _accumulate([
+            ("energy", {"energy": 300.0, "neighborhood": "uptown"}),
+        ]).drain(), replica="api-2")
+        db_session.commit()
+
+        assert top_items(db_session, "energy", "neighborhood", k=1, interval="day", since=T) == [("downtown", 600.0, 0.0)]
+        assert [item for item, _, _ in top_items(db_session, "energy", "neighborhood", interval="day", since=T)] == [
+            "downtown", "uptown"
+        ]
+        assert distinct_count(db_session, "energy", "neighborhood", "day", since=T) == 2
+
+    def test_empty_range(self, db_session):
+        """Test that a range without sketches answers zero and nothing"""
+        assert distinct_count(db_session, "transport", "bus_id", since=T) == 0
+        assert top_items(db_session, "transport", "bus_id", since=T) == []
+
+    def test_failed_flush_keeps_sketches(self):
+        """Test that sketches survive a flush that fails"""
+        accumulator = _accumulate([("transport", {"bus_id": 1})])
+        session = Mock()
+        session.execute.side_effect = RuntimeError("database down")
+
+        assert flush_sketches(accumulator, lambda: session) == 0
+        assert len(accumulator) == 4
@@ -22,9 +22,24 @@ def visit_UUID(self, type_, **kw):
 SQLiteTypeCompiler.visit_JSONB = visit_JSONB
 SQLiteTypeCompiler.visit_UUID = visit_UUID
 
+from app.application.sampling import event_sampler
 from app.core.db import Base
+from app.infra.persistence.models.entity_state import EntityState
 from app.infra.persistence.models.event import Event
+from app.infra.persistence.models.event_retention_watermark import EventRetentionWatermark
+from app.infra.persistence.models.event_rollup import EventRollup
+from app.infra.persistence.models.event_sketch import EventSketch
 from app.infra.persistence.models.outbox import OutboxMessage
+from app.infra.persistence.models.outbox_archive import OutboxArchivedMessage
+from app.infra.persistence.models.outbox_dead_letter import OutboxDeadLetter
+
+
+@pytest.fixture(autouse=True)
+def clear_event_sampler():
+    """Start every test with no sampling history, since the sampler is process-wide"""
+    event_sampler.clear()
+    yield
+    event_sampler.clear()
 
 
 @pytest.fixture
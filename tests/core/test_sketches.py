@@ -0,0 +1,95 @@
+"""
+Tests for mergeable streaming sketches
+"""
+import pytest
+
+from app.core.sketches import HyperLogLog, SpaceSaving
+
+
+class TestHyperLogLog:
+    """Tests for HyperLogLog"""
+
+    def test_small_counts_are_exact_enough(self):
+        """Test that repeated values are counted once"""
+        hll = HyperLogLog()
+        for i in range(100):
+            hll.add(f"bus-{i % 10}")
+
+        assert hll.estimate() == 10
+
+    def test_large_count_within_error(self):
+        """Test that the estimate stays within a few standard errors"""
+        hll = HyperLogLog()
+        for i in range(50_000):
+            hll.add(i)
+
+        assert abs(hll.estimate() - 50_000) / 50_000 < 0.05
+
+    def test_merge_is_union(self):
+        """Test that merging two sketches estimates the union of their values"""
+        a, b = HyperLogLog(), HyperLogLog()
+        for i in range(1000):
+            a.add(i)
+            b.add(i + 500)
+
+        a.merge(b)
+
+        assert abs(a.estimate() - 1500) / 1500 < 0.05
+
+    def test_round_trips_through_bytes(self):
+        """Test that the byte encoding keeps precision and registers"""
+        hll = HyperLogLog(precision=10)
+        hll.add("x")
+
+        restored = HyperLogLog.from_bytes(hll.to_bytes())
+
+        assert len(hll.to_bytes()) == 1025
+        assert (restored.precision, restored.registers) == (10, hll.registers)
+
+    def test_rejects_mismatched_precision(self):
+        """Test that sketches of different precision cannot be merged"""
+        with pytest.raises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+
+class TestSpaceSaving:
+    """Tests for SpaceSaving"""
+
+    def test_exact_below_capacity(self):
+        """Test that counts are exact while every item fits"""
+        sketch = SpaceSaving(capacity=10)
+        for item, weight in [("downtown", 600.0), ("uptown", 200.0), ("downtown", 50.0)]:
+            sketch.add(item, weight)
+
+        assert sketch.top(2) == [("downtown", 650.0, 0.0), ("uptown", 200.0, 0.0)]
+
+    def test_keeps_heavy_hitter_past_capacity(self):
+        """Test that a frequent item survives a long tail of rare ones"""
+        sketch = SpaceSaving(capacity=5)
+        for i in range(200):
+            sketch.add("bus-42")
+            sketch.add(f"bus-{i}")
+
+        item, count, error = sketch.top(1)[0]
+        assert item == "bus-42"
+        assert count - error <= 201 <= count
+
+    def test_merge_adds_counts(self):
+        """Test that merged summaries add the weights of shared items"""
+        a, b = SpaceSaving(10), SpaceSaving(10)
+        a.add("downtown", 5)
+        b.add("downtown", 3)
+        b.add("uptown", 1)
+
+        a.merge(b)
+
+        assert a.top(2) == [("downtown", 8, 0), ("uptown", 1, 0)]
+
+    def test_round_trips_through_bytes(self):
+        """Test that the byte encoding keeps capacity and counters"""
+        sketch = SpaceSaving(capacity=3)
+        sketch.add("downtown", 2.5)
+
+        restored = SpaceSaving.from_bytes(sketch.to_bytes())
+
+        assert (restored.capacity, restored.counters) == (3, {"downtown": (2.5, 0.0)})
@@ -9,6 +9,7 @@ from app.domain.orchestration.factories.health_factory import HealthEventCompone
 from app.domain.orchestration.factories.common import SimpleComponentsFactory
 from app.domain.orchestration.factories.passthrough_factory import PassthroughEventComponentsFactory
 from app.domain.events.normalization.payloads import TransportPayload, SecurityPayload
+from app.domain.orchestration.persistence import FULL_PERSISTENCE
 
 
 class TestFactoryRegistry:
@@ -78,3 +79,13 @@ class TestFactoryRegistry:
         
         # Unknown service should return passthrough
         assert isinstance(reg.get("unknown"), PassthroughEventComponentsFactory)
+
+    def test_persistence_policies(self):
+        """Test that transport is sampled with per-bus state and the rest are stored in full"""
+        reg = FactoryRegistry()
+
+        transport = reg.get("transport").persistence_policy()
+        assert transport.mode == "sampled"
+        assert transport.state_key == "bus_id"
+        for service in ("health", "energy", "security", "unknown"):
+            assert reg.get(service).persistence_policy() == FULL_PERSISTENCE
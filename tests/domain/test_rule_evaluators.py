@@ -6,7 +6,7 @@ from datetime import datetime
 
 from app.domain.events.rules.energy import EnergyRuleEvaluator
 from app.domain.events.rules.health import HealthRuleEvaluator
-from app.domain.events.types import NormalizedEvent, DerivedEventSpec
+from app.domain.events.types import NormalizedEvent, DerivedEventSpec, Priority
 from app.domain.orchestration.factories.common import NoopRuleEvaluator
 from app.domain.orchestration.factories.passthrough_factory import PassthroughRuleEvaluator
 
@@ -156,6 +156,20 @@ class TestHealthRuleEvaluator:
         assert security_event.payload["patient_id"] == 123
         assert security_event.deduplication_key == "health_emergency_123"
 
+    def test_evaluate_emergency_uses_high_priority_lane(self):
+        """Test that emergency derived events are delivered on the high-priority lane"""
+        evaluator = HealthRuleEvaluator()
+        event = NormalizedEvent(
+            service="health",
+            timestamp=datetime.now(),
+            raw_payload={"patient_id": 123, "alert": "emergency"},
+            normalized_payload={"patient_id": 123, "alert": "emergency"}
+        )
+
+        result = evaluator.evaluate(event)
+
+        assert all(spec.priority == Priority.HIGH for spec in result)
+
     def test_evaluate_missing_alert_returns_empty(self):
         """Test that missing alert field returns no derived events"""
         evaluator = HealthRuleEvaluator()
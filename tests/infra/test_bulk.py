@@ -0,0 +1,109 @@
+"""
+Tests for bulk repository writes
+"""
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from sqlalchemy import select
+
+from app.infra.persistence import bulk
+from app.infra.persistence.bulk import add_many, copy_csv, resolve_rows
+from app.infra.persistence.models.event import Event
+from app.infra.persistence.models.outbox import OutboxMessage
+from app.infra.persistence.repositories.event_repo import EventRepository
+from app.infra.persistence.repositories.outbox_repo import OutboxRepository
+
+
+def _events(count):
+    return [
+        Event(service="energy", timestamp=datetime.now(timezone.utc), payload={"energy": float(i)},
+              normalized_payload={"energy": float(i)}, deduplication_key=f"energy-{i}")
+        for i in range(count)
+    ]
+
+
+class TestResolveRows:
+    """Tests for resolve_rows function"""
+
+    def test_fills_callable_and_sql_defaults(self):
+        """Test that ids and func.now() defaults are resolved in Python"""
+        event = Event(service="energy", payload={})
+
+        [row] = resolve_rows([event])
+
+        assert isinstance(row["id"], uuid.UUID)
+        assert row["id"] == event.id
+        assert row["created_at"] == row["timestamp"] == event.created_at
+        assert row["source_event_id"] is None
+
+    def test_keeps_explicit_values(self):
+        """Test that values set on the entity are not replaced"""
+        event_id = uuid.uuid4()
+        [row] = resolve_rows([Event(id=event_id, service="energy", payload={})])
+
+        assert row["id"] == event_id
+
+
+class TestCopyCsv:
+    """Tests for copy_csv function"""
+
+    def test_distinguishes_null_from_empty_string(self):
+        """Test that NULL is an unquoted empty field and strings are always quoted"""
+        event = Event(id=uuid.UUID(int=1), service="", timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                      payload=None, normalized_payload={"note": 'say "hi"'}, deduplication_key=None,
+                      source_event_id=None, created_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+        line = copy_csv(Event.__table__, resolve_rows([event])).getvalue()
+
+        assert line == (
+            '"00000000-0000-0000-0000-000000000001","","2024-01-01T00:00:00+00:00",,'
+            '"{""note"":""say \\""hi\\""""}",,,"2024-01-01T00:00:00+00:00"\n'
+        )
+
+
+class TestAddMany:
+    """Tests for add_many function"""
+
+    def test_small_batch_stays_in_session(self, db_session):
+        """Test that batches below the bulk threshold go through the unit of work"""
+        events = EventRepository(db_session).add_many(_events(3))
+
+        assert all(event in db_session for event in events)
+        assert all(event.id is not None for event in events)
+
+    def test_medium_batch_uses_multi_row_insert(self, db_session):
+        """Test that larger batches are inserted in chunks and read back intact"""
+        with patch.object(bulk, "BULK_INSERT_MIN_ROWS", 2), \
+             patch.object(bulk, "insert_rows", wraps=bulk.insert_rows) as insert_rows:
+            events = EventRepository(db_session).add_many(_events(5))
+        db_session.commit()
+
+        insert_rows.assert_called_once()
+        assert not any(event in db_session for event in events)
+        stored = db_session.execute(select(Event.id, Event.payload).order_by(Event.deduplication_key)).all()
+        assert [(row.id, row.payload) for row in stored] == [(event.id, event.payload) for event in events]
+
+    def test_large_batch_uses_copy_when_supported(self, db_session):
+        """Test that batches past the COPY threshold are streamed with COPY"""
+        with patch.object(bulk, "BULK_INSERT_MIN_ROWS", 2), patch.object(bulk, "COPY_MIN_ROWS", 4), \
+             patch.object(bulk, "supports_copy", return_value=True), \
+             patch.object(bulk, "copy_rows") as copy_rows:
+            add_many(db_session, _events(4))
+
+        copy_rows.assert_called_once()
+        assert len(copy_rows.call_args.args[2]) == 4
+
+    def test_outbox_batch(self, db_session):
+        """Test that outbox messages can be written in bulk"""
+        messages = [OutboxMessage(topic="event.energy", payload={"i": i}) for i in range(3)]
+        with patch.object(bulk, "BULK_INSERT_MIN_ROWS", 2):
+            OutboxRepository(db_session).add_many(messages)
+        db_session.commit()
+
+        stored = db_session.execute(select(OutboxMessage.status, OutboxMessage.attempts)).all()
+        assert [tuple(row) for row in stored] == [("pending", 0)] * 3
+
+    def test_empty_batch(self, db_session):
+        """Test that an empty batch writes nothing"""
+        assert add_many(db_session, []) == []
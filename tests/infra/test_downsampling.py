@@ -0,0 +1,119 @@
+"""
+Tests for per-service event downsampling and retention
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.domain.orchestration.retention import RETENTION_POLICIES, RetentionPolicy
+from app.infra.persistence.downsampling import apply_retention_policy
+from app.infra.persistence.models.event import Event
+from app.infra.persistence.models.event_retention_watermark import EventRetentionWatermark
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+OLD = datetime(2026, 3, 1, 8, 0, tzinfo=timezone.utc)
+POLICY = RetentionPolicy(raw_days=3, downsample_seconds=60, key_field="bus_id")
+
+
+def _ping(db_session, bus_id, created_at, service="transport", timestamp=None):
+    event = Event(service=service, timestamp=timestamp or created_at, payload=None,
+                  normalized_payload={"bus_id": bus_id, "lat": 1.0, "lon": 2.0}, created_at=created_at)
+    db_session.add(event)
+    db_session.commit()
+    return event
+
+
+def _remaining(db_session, service="transport"):
+    return set(db_session.execute(select(Event.id).where(Event.service == service)).scalars())
+
+
+class TestApplyRetentionPolicy:
+    """Tests for apply_retention_policy function"""
+
+    def test_keeps_latest_per_key_per_bucket(self, db_session):
+        """Test that old pings are thinned to the last one per bus per minute"""
+        _ping(db_session, 42, OLD + timedelta(seconds=5))
+        last = _ping(db_session, 42, OLD + timedelta(seconds=50))
+        other_bus = _ping(db_session, 7, OLD + timedelta(seconds=10))
+        next_minute = _ping(db_session, 42, OLD + timedelta(seconds=65))
+
+        deleted = apply_retention_policy(db_session, "transport", POLICY, now=NOW, batch_size=2)
+
+        assert deleted == 1
+        assert _remaining(db_session) == {last.id, other_bus.id, next_minute.id}
+
+    def test_imported_history_is_bucketed_by_timestamp(self, db_session):
+        """Test that readings written in one batch are thinned by reading time, not by created_at"""
+        minutes = [_ping(db_session, 42, OLD, timestamp=OLD - timedelta(minutes=m)) for m in range(1, 121)]
+        # Within one minute the latest reading survives, whatever order the rows were written in.
+        same_minute = [_ping(db_session, 42, OLD, timestamp=OLD + timedelta(seconds=s)) for s in (40, 10, 50, 20)]
+
+        deleted = apply_retention_policy(db_session, "transport", POLICY, now=NOW, batch_size=50)
+
+        assert deleted == 3
+        assert _remaining(db_session) == {event.id for event in minutes} | {same_minute[2].id}
+
+    def test_future_readings_are_kept(self, db_session):
+        """Test that an old row whose reading time is not yet past the cutoff is left alone"""
+        early = _ping(db_session, 42, OLD, timestamp=NOW - timedelta(seconds=5))
+        late = _ping(db_session, 42, OLD, timestamp=NOW - timedelta(seconds=1))
+
+        assert apply_retention_policy(db_session, "transport", POLICY, now=NOW) == 0
+        assert _remaining(db_session) == {early.id, late.id}
+
+    def test_recent_events_keep_full_resolution(self, db_session):
+        """Test that events younger than raw_days are untouched"""
+        recent = NOW - timedelta(days=1)
+        pings = [_ping(db_session, 42, recent + timedelta(seconds=s)) for s in (1, 2, 3)]
+
+        assert apply_retention_policy(db_session, "transport", POLICY, now=NOW) == 0
+        assert _remaining(db_session) == {ping.id for ping in pings}
+
+    def test_events_with_derived_events_are_kept(self, db_session):
+        """Test that an event with derived events survives downsampling"""
+        parent = _ping(db_session, 42, OLD + timedelta(seconds=1))
+        db_session.add(Event(service="security", payload={}, source_event_id=parent.id, created_at=NOW))
+        db_session.commit()
+        last = _ping(db_session, 42, OLD + timedelta(seconds=2))
+
+        apply_retention_policy(db_session, "transport", POLICY, now=NOW)
+
+        assert _remaining(db_session) == {parent.id, last.id}
+
+    def test_policy_without_downsampling_deletes(self, db_session):
+        """Test that old events are deleted when the policy does not downsample"""
+        _ping(db_session, 42, OLD, service="parking")
+        kept = _ping(db_session, 42, NOW, service="parking")
+
+        deleted = apply_retention_policy(db_session, "parking", RetentionPolicy(raw_days=3), now=NOW, batch_size=1)
+
+        assert deleted == 1
+        assert _remaining(db_session, "parking") == {kept.id}
+
+    def test_watermark_skips_processed_range(self, db_session):
+        """Test that a later run starts where the previous one finished"""
+        apply_retention_policy(db_session, "transport", POLICY, now=NOW)
+        watermark = db_session.get(EventRetentionWatermark, "transport")
+        assert watermark.processed_until.replace(tzinfo=timezone.utc) == NOW - timedelta(days=3)
+
+        # Rows below the watermark, e.g. backfilled late, are not revisited.
+        pings = [_ping(db_session, 42, OLD + timedelta(seconds=s)) for s in (1, 2)]
+        assert apply_retention_policy(db_session, "transport", POLICY, now=NOW) == 0
+        assert _remaining(db_session) == {ping.id for ping in pings}
+
+    def test_other_services_untouched(self, db_session):
+        """Test that only the policy's service is thinned"""
+        energy = [_ping(db_session, 42, OLD + timedelta(seconds=s), service="energy") for s in (1, 2)]
+
+        apply_retention_policy(db_session, "transport", POLICY, now=NOW)
+
+        assert _remaining(db_session, "energy") == {event.id for event in energy}
+
+
+class TestRetentionPolicies:
+    """Tests for the configured retention policies"""
+
+    def test_transport_is_downsampled_per_bus(self):
+        """Test that transport pings are kept per bus per minute"""
+        assert RETENTION_POLICIES["transport"] == RetentionPolicy(raw_days=3, downsample_seconds=60, key_field="bus_id")
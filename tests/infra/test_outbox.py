@@ -2,11 +2,20 @@
 Tests for outbox functionality
 """
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, Mock
 
 from app.infra.outbox.enqueue import enqueue_notification, topic_for_service
+from app.domain.events.types import Priority
+from app.infra.outbox.worker import (
+    backoff_delay,
+    fetch_due_messages,
+    lane_quotas,
+    parse_lane_weights,
+    process_batch,
+)
 from app.infra.persistence.models.outbox import OutboxMessage
+from app.infra.persistence.models.outbox_dead_letter import OutboxDeadLetter
 
 
 class TestTopicForService:
@@ -38,6 +47,7 @@ class TestEnqueueNotification:
         assert msg.attempts == 0
         assert msg.published_at is None
         assert isinstance(msg.created_at, datetime)
+        assert msg.next_attempt_at == msg.created_at
 
     def test_enqueue_notification_persists_to_db(self, db_session):
         """Test that enqueue_notification persists message to database"""
@@ -68,6 +78,18 @@ class TestEnqueueNotification:
             msg = enqueue_notification(db_session, service, {"test": "data"})
             assert msg.topic == f"event.{service}"
 
+    def test_enqueue_notification_defaults_to_normal_priority(self, db_session):
+        """Test that messages go to the normal lane unless told otherwise"""
+        msg = enqueue_notification(db_session, "energy", {"test": "data"})
+
+        assert msg.priority == Priority.NORMAL
+
+    def test_enqueue_notification_with_priority(self, db_session):
+        """Test that the requested priority is stored on the message"""
+        msg = enqueue_notification(db_session, "transport", {"test": "data"}, Priority.HIGH)
+
+        assert msg.priority == Priority.HIGH
+
     def test_enqueue_notification_with_complex_payload(self, db_session):
         """Test enqueue_notification with complex payload structure"""
         complex_payload = {
@@ -85,3 +107,221 @@ class TestEnqueueNotification:
         
         assert msg.payload == complex_payload
         assert msg.payload["nested"]["data"] == [1, 2, 3]
+
+
+def _pending_message(db_session, topic="event.energy", next_attempt_at=None, created_at=None, attempts=0, priority=Priority.NORMAL):
+    now = datetime.now(timezone.utc)
+    msg = OutboxMessage(
+        topic=topic,
+        payload={"topic": topic},
+        priority=int(priority),
+        status="pending",
+        attempts=attempts,
+        next_attempt_at=next_attempt_at or now,
+        created_at=created_at or now,
+    )
+    db_session.add(msg)
+    db_session.commit()
+    return msg
+
+
+class TestBackoffDelay:
+    """Tests for backoff_delay function"""
+
+    def test_backoff_grows_exponentially(self):
+        """Test that the delay window doubles with each attempt"""
+        no_jitter = lambda: 0.0
+        delays = [backoff_delay(n, base=2.0, cap=1000.0, rng=no_jitter) for n in (1, 2, 3, 4)]
+
+        assert delays == [timedelta(seconds=s) for s in (1.0, 2.0, 4.0, 8.0)]
+
+    def test_backoff_is_capped(self):
+        """Test that the delay never exceeds the cap"""
+        full_jitter = lambda: 1.0
+
+        assert backoff_delay(30, base=2.0, cap=60.0, rng=full_jitter) == timedelta(seconds=60.0)
+
+    def test_backoff_jitter_stays_within_window(self):
+        """Test that jitter keeps the delay between half and the full window"""
+        for _ in range(50):
+            delay = backoff_delay(3, base=2.0, cap=1000.0)
+            assert timedelta(seconds=4.0) <= delay <= timedelta(seconds=8.0)
+
+
+class TestLaneWeights:
+    """Tests for parse_lane_weights and lane_quotas functions"""
+
+    def test_parse_lane_weights(self):
+        """Test that lane names map to priorities and missing lanes get no weight"""
+        assert parse_lane_weights("high=6, normal=3") == {
+            Priority.HIGH: 6,
+            Priority.NORMAL: 3,
+            Priority.LOW: 0,
+        }
+
+    def test_parse_lane_weights_rejects_unknown_lane(self):
+        """Test that unknown lane names are rejected"""
+        with pytest.raises(ValueError):
+            parse_lane_weights("urgent=1")
+
+    def test_parse_lane_weights_requires_a_positive_weight(self):
+        """Test that all-zero weights are rejected"""
+        with pytest.raises(ValueError):
+            parse_lane_weights("high=0")
+
+    def test_quotas_follow_weights(self):
+        """Test that the batch is split in proportion to the weights"""
+        weights = {Priority.HIGH: 6, Priority.NORMAL: 3, Priority.LOW: 1}
+
+        assert lane_quotas(20, weights) == {Priority.HIGH: 12, Priority.NORMAL: 6, Priority.LOW: 2}
+
+    def test_quotas_never_starve_a_weighted_lane(self):
+        """Test that a small weight still gets a slot and quotas add up to the limit"""
+        weights = {Priority.HIGH: 100, Priority.NORMAL: 1, Priority.LOW: 1}
+
+        quotas = lane_quotas(10, weights)
+
+        assert quotas[Priority.NORMAL] >= 1
+        assert quotas[Priority.LOW] >= 1
+        assert sum(quotas.values()) == 10
+
+
+class TestFetchDueMessages:
+    """Tests for fetch_due_messages function"""
+
+    def test_skips_messages_scheduled_in_the_future(self, db_session):
+        """Test that messages waiting for a retry are not fetched"""
+        now = datetime.now(timezone.utc)
+        due = _pending_message(db_session, next_attempt_at=now - timedelta(seconds=1))
+        _pending_message(db_session, next_attempt_at=now + timedelta(minutes=5))
+
+        msgs = fetch_due_messages(db_session, now)
+
+        assert [m.id for m in msgs] == [due.id]
+
+    def test_orders_by_next_attempt_then_created_at(self, db_session):
+        """Test that the oldest due messages are fetched first"""
+        now = datetime.now(timezone.utc)
+        later = _pending_message(db_session, next_attempt_at=now - timedelta(seconds=1))
+        earlier = _pending_message(db_session, next_attempt_at=now - timedelta(seconds=10))
+
+        msgs = fetch_due_messages(db_session, now)
+
+        assert [m.id for m in msgs] == [earlier.id, later.id]
+
+    def test_fetches_high_priority_first(self, db_session):
+        """Test that high-priority messages come before older normal ones"""
+        now = datetime.now(timezone.utc)
+        normal = _pending_message(db_session, next_attempt_at=now - timedelta(minutes=5))
+        high = _pending_message(db_session, next_attempt_at=now, priority=Priority.HIGH)
+
+        msgs = fetch_due_messages(db_session, now)
+
+        assert [m.id for m in msgs] == [high.id, normal.id]
+
+    def test_lower_lanes_get_their_share_under_backlog(self, db_session):
+        """Test that a high-priority backlog does not starve lower lanes"""
+        now = datetime.now(timezone.utc)
+        for _ in range(10):
+            _pending_message(db_session, next_attempt_at=now, priority=Priority.HIGH)
+        low = _pending_message(db_session, next_attempt_at=now - timedelta(minutes=5), priority=Priority.LOW)
+        weights = {Priority.HIGH: 3, Priority.NORMAL: 0, Priority.LOW: 1}
+
+        msgs = fetch_due_messages(db_session, now, limit=4, weights=weights)
+
+        assert len(msgs) == 4
+        assert msgs[-1].id == low.id
+
+    def test_unused_share_goes_to_other_lanes(self, db_session):
+        """Test that slots an empty lane cannot use are filled from the others"""
+        now = datetime.now(timezone.utc)
+        for _ in range(5):
+            _pending_message(db_session, next_attempt_at=now, priority=Priority.LOW)
+        weights = {Priority.HIGH: 6, Priority.NORMAL: 3, Priority.LOW: 1}
+
+        msgs = fetch_due_messages(db_session, now, limit=4, weights=weights)
+
+        assert len(msgs) == 4
+        assert all(m.priority == Priority.LOW for m in msgs)
+
+    def test_skips_non_pending_messages(self, db_session):
+        """Test that sent and failed messages are not fetched"""
+        msg = _pending_message(db_session)
+        msg.status = "sent"
+        db_session.commit()
+
+        assert fetch_due_messages(db_session, datetime.now(timezone.utc)) == []
+
+
+class TestProcessBatch:
+    """Tests for process_batch function"""
+
+    @patch('app.infra.outbox.worker.publish')
+    def test_successful_publish_marks_sent(self, mock_publish, db_session):
+        """Test that published messages are marked as sent"""
+        msg = _pending_message(db_session)
+
+        processed = process_batch(db_session)
+
+        assert processed == 1
+        assert msg.status == "sent"
+        assert msg.published_at is not None
+        mock_publish.assert_called_once_with(msg.topic, msg.payload)
+
+    @patch('app.infra.outbox.worker.publish')
+    def test_failed_publish_schedules_retry(self, mock_publish, db_session):
+        """Test that a failed publish pushes next_attempt_at into the future"""
+        mock_publish.side_effect = RuntimeError("sink down")
+        now = datetime.now(timezone.utc)
+        msg = _pending_message(db_session, next_attempt_at=now)
+
+        process_batch(db_session, now=now)
+
+        assert msg.status == "pending"
+        assert msg.attempts == 1
+        assert fetch_due_messages(db_session, now) == []
+
+    @patch('app.infra.outbox.worker.publish')
+    def test_failed_publish_records_last_error(self, mock_publish, db_session):
+        """Test that the error of a failed publish is kept on the message"""
+        mock_publish.side_effect = RuntimeError("sink down")
+        msg = _pending_message(db_session)
+
+        process_batch(db_session)
+
+        assert "sink down" in msg.last_error
+
+    @patch('app.infra.outbox.worker.MAX_ATTEMPTS', 3)
+    @patch('app.infra.outbox.worker.publish')
+    def test_failed_publish_dead_letters_after_max_attempts(self, mock_publish, db_session):
+        """Test that the last allowed failure moves the message to the dead-letter table"""
+        mock_publish.side_effect = RuntimeError("sink down")
+        msg_id = _pending_message(db_session, attempts=2).id
+
+        process_batch(db_session)
+        db_session.expunge_all()
+
+        assert db_session.get(OutboxMessage, msg_id) is None
+        dead = db_session.get(OutboxDeadLetter, msg_id)
+        assert dead.attempts == 3
+        assert "sink down" in dead.last_error
+        assert dead.dead_lettered_at is not None
+
+    @patch('app.infra.outbox.worker.publish')
+    def test_failing_message_does_not_block_healthy_ones(self, mock_publish, db_session):
+        """Test that a retried message no longer sits at the head of the batch"""
+        now = datetime.now(timezone.utc)
+        broken = _pending_message(db_session, topic="event.broken", next_attempt_at=now, created_at=now - timedelta(minutes=1))
+
+        def publish(topic, payload):
+            if topic == "event.broken":
+                raise RuntimeError("sink down")
+
+        mock_publish.side_effect = publish
+
+        process_batch(db_session, now=now)
+        healthy = _pending_message(db_session, topic="event.healthy", next_attempt_at=now)
+        process_batch(db_session, now=now + timedelta(milliseconds=1))
+
+        assert healthy.status == "sent"
+        assert broken.attempts == 1
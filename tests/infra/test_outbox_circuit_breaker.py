@@ -0,0 +1,212 @@
+"""
+Tests for per-topic circuit breakers in the outbox worker
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+from app.infra.outbox.circuit_breaker import BreakerState, CircuitBreaker, CircuitBreakerRegistry
+from app.infra.outbox.metrics import MetricsRegistry
+from app.infra.outbox.worker import process_batch
+from app.infra.persistence.models.outbox import OutboxMessage
+
+
+NOW = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def _breaker(**kwargs):
+    options = {"failure_threshold": 3, "reset_timeout": timedelta(seconds=30), "half_open_max_calls": 1}
+    options.update(kwargs)
+    return CircuitBreaker("event.security", **options)
+
+
+def _message(db_session, topic):
+    msg = OutboxMessage(
+        topic=topic,
+        payload={"topic": topic},
+        status="pending",
+        attempts=0,
+        next_attempt_at=NOW - timedelta(seconds=1),
+        created_at=NOW - timedelta(seconds=1),
+    )
+    db_session.add(msg)
+    db_session.commit()
+    return msg
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker"""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that reaching the failure threshold opens the breaker"""
+        breaker = _breaker()
+        for _ in range(3):
+            breaker.record_failure(NOW)
+
+        assert breaker.current_state(NOW) == BreakerState.OPEN
+        assert not breaker.allow_request(NOW)
+
+    def test_success_resets_failure_count(self):
+        """Test that a success in between keeps the breaker closed"""
+        breaker = _breaker()
+        breaker.record_failure(NOW)
+        breaker.record_failure(NOW)
+        breaker.record_success(NOW)
+        breaker.record_failure(NOW)
+
+        assert breaker.current_state(NOW) == BreakerState.CLOSED
+
+    def test_goes_half_open_after_reset_timeout(self):
+        """Test that the breaker lets a limited number of probes through after the timeout"""
+        breaker = _breaker(failure_threshold=1)
+        breaker.record_failure(NOW)
+        later = NOW + timedelta(seconds=30)
+
+        assert breaker.current_state(later) == BreakerState.HALF_OPEN
+        assert breaker.allow_request(later)
+        assert not breaker.allow_request(later)
+
+    def test_successful_probe_closes(self):
+        """Test that a successful half-open probe closes the breaker"""
+        breaker = _breaker(failure_threshold=1)
+        breaker.record_failure(NOW)
+        later = NOW + timedelta(seconds=30)
+        breaker.allow_request(later)
+
+        breaker.record_success(later)
+
+        assert breaker.current_state(later) == BreakerState.CLOSED
+        assert breaker.allow_request(later)
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed half-open probe re-opens the breaker for another timeout"""
+        breaker = _breaker(failure_threshold=1)
+        breaker.record_failure(NOW)
+        later = NOW + timedelta(seconds=30)
+        breaker.allow_request(later)
+
+        breaker.record_failure(later)
+
+        assert breaker.current_state(later + timedelta(seconds=29)) == BreakerState.OPEN
+
+    def test_reports_transitions(self):
+        """Test that every state change is reported to the listener"""
+        listener = Mock()
+        breaker = _breaker(failure_threshold=1, on_transition=listener)
+
+        breaker.record_failure(NOW)
+        breaker.current_state(NOW + timedelta(seconds=30))
+        breaker.record_success(NOW + timedelta(seconds=30))
+
+        assert [call.args for call in listener.call_args_list] == [
+            ("event.security", BreakerState.CLOSED, BreakerState.OPEN),
+            ("event.security", BreakerState.OPEN, BreakerState.HALF_OPEN),
+            ("event.security", BreakerState.HALF_OPEN, BreakerState.CLOSED),
+        ]
+
+
+class TestCircuitBreakerRegistry:
+    """Tests for CircuitBreakerRegistry"""
+
+    def test_keeps_one_breaker_per_topic(self):
+        """Test that breakers are created once per topic"""
+        registry = CircuitBreakerRegistry()
+
+        assert registry.get("event.security") is registry.get("event.security")
+        assert registry.get("event.security") is not registry.get("event.transport")
+
+    def test_open_topics(self):
+        """Test that only topics with an open breaker are reported"""
+        registry = CircuitBreakerRegistry(failure_threshold=1)
+        registry.get("event.transport")
+        registry.get("event.security").record_failure(NOW)
+
+        assert registry.open_topics(NOW) == ["event.security"]
+
+
+class TestWorkerCircuitBreakers:
+    """Tests for circuit breakers inside process_batch"""
+
+    @patch('app.infra.outbox.worker.publish')
+    def test_open_topic_is_skipped_and_healthy_topics_flow(self, mock_publish, db_session):
+        """Test that a broken topic stops being published while others continue"""
+        def publish(topic, payload):
+            if topic == "event.security":
+                raise RuntimeError("sink down")
+
+        mock_publish.side_effect = publish
+        breakers = CircuitBreakerRegistry(failure_threshold=2, reset_timeout=timedelta(minutes=1))
+        broken = [_message(db_session, "event.security") for _ in range(4)]
+        healthy = _message(db_session, "event.transport")
+
+        process_batch(db_session, now=NOW, breakers=breakers)
+
+        assert healthy.status == "sent"
+        assert sorted(msg.attempts for msg in broken) == [0, 0, 1, 1]
+        assert breakers.open_topics(NOW) == ["event.security"]
+
+        mock_publish.reset_mock()
+        process_batch(db_session, now=NOW + timedelta(seconds=1), breakers=breakers)
+
+        mock_publish.assert_not_called()
+
+    @patch('app.infra.outbox.worker.publish')
+    def test_successful_half_open_probe_resumes_topic(self, mock_publish, db_session):
+        """Test that after the reset timeout a successful probe closes the breaker and the topic drains"""
+        breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout=timedelta(seconds=30))
+        breakers.get("event.security").record_failure(NOW)
+        for _ in range(3):
+            _message(db_session, "event.security")
+
+        process_batch(db_session, now=NOW + timedelta(seconds=30), breakers=breakers)
+
+        assert mock_publish.call_count == 3
+        assert breakers.get("event.security").state == BreakerState.CLOSED
+
+    @patch('app.infra.outbox.worker.publish')
+    def test_failed_half_open_probe_stops_topic_again(self, mock_publish, db_session):
+        """Test that only one probe is spent when the sink is still down"""
+        mock_publish.side_effect = RuntimeError("sink down")
+        breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout=timedelta(seconds=30))
+        breakers.get("event.security").record_failure(NOW)
+        for _ in range(3):
+            _message(db_session, "event.security")
+
+        process_batch(db_session, now=NOW + timedelta(seconds=30), breakers=breakers)
+
+        assert mock_publish.call_count == 1
+        assert breakers.get("event.security").state == BreakerState.OPEN
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry"""
+
+    def test_renders_prometheus_text(self):
+        """Test that counters and gauges render in the Prometheus text format"""
+        registry = MetricsRegistry()
+        registry.inc("outbox_circuit_breaker_transitions_total", topic="event.security", from_state="closed", to_state="open")
+        registry.set("outbox_circuit_breaker_state", 1, topic="event.security", state="open")
+
+        text = registry.render()
+
+        assert "# TYPE outbox_circuit_breaker_state gauge" in text
+        assert 'outbox_circuit_breaker_state{state="open",topic="event.security"} 1' in text
+        assert "# TYPE outbox_circuit_breaker_transitions_total counter" in text
+        assert 'outbox_circuit_breaker_transitions_total{from_state="closed",to_state="open",topic="event.security"} 1' in text
+
+    def test_escapes_label_values(self):
+        """Test that backslashes, quotes and newlines in label values are escaped"""
+        registry = MetricsRegistry()
+        registry.inc("outbox_messages_published_total", topic='event.a\\b"c\nd')
+
+        text = registry.render()
+
+        assert text.splitlines()[1] == 'outbox_messages_published_total{topic="event.a\\\\b\\"c\\nd"} 1'
+
+    def test_counters_accumulate(self):
+        """Test that counters add up per label set"""
+        registry = MetricsRegistry()
+        registry.inc("outbox_messages_published_total", topic="event.energy")
+        registry.inc("outbox_messages_published_total", topic="event.energy")
+
+        assert registry.value("outbox_messages_published_total", topic="event.energy") == 2
@@ -0,0 +1,138 @@
+"""
+Tests for outbox coalescing
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from sqlalchemy import select
+
+from app.domain.events.types import Priority
+from app.infra.outbox.coalescing import coalesce_messages, outgoing_payload
+from app.infra.outbox.worker import fetch_due_messages, process_batch
+from app.infra.persistence.models.outbox import OutboxMessage
+
+
+NOW = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def _message(db_session, dedup_key, age, topic="event.security", payload=None, priority=Priority.NORMAL, next_attempt_at=None):
+    msg = OutboxMessage(
+        topic=topic,
+        payload=payload or {"age": age.total_seconds()},
+        priority=int(priority),
+        dedup_key=dedup_key,
+        coalesced_count=1,
+        status="pending",
+        attempts=0,
+        next_attempt_at=next_attempt_at or NOW - age,
+        created_at=NOW - age,
+    )
+    db_session.add(msg)
+    db_session.commit()
+    return msg
+
+
+def _statuses(db_session):
+    return {
+        msg.id: msg.status
+        for msg in db_session.execute(select(OutboxMessage)).scalars().all()
+    }
+
+
+class TestCoalesceMessages:
+    """Tests for coalesce_messages function"""
+
+    def test_collapses_duplicates_into_latest_message(self, db_session):
+        """Test that duplicates collapse into the newest message with a count"""
+        oldest = _message(db_session, "critical_energy_usage_downtown", timedelta(minutes=3))
+        middle = _message(db_session, "critical_energy_usage_downtown", timedelta(minutes=2))
+        latest = _message(db_session, "critical_energy_usage_downtown", timedelta(minutes=1))
+
+        batch = coalesce_messages(db_session, [oldest, middle, latest], NOW)
+
+        assert [m.id for m in batch] == [latest.id]
+        assert latest.coalesced_count == 3
+        assert _statuses(db_session) == {
+            oldest.id: "coalesced",
+            middle.id: "coalesced",
+            latest.id: "pending",
+        }
+
+    def test_includes_duplicates_outside_the_batch(self, db_session):
+        """Test that due duplicates not fetched in the batch are coalesced too"""
+        in_batch = _message(db_session, "key", timedelta(minutes=3))
+        newer = _message(db_session, "key", timedelta(minutes=1))
+
+        batch = coalesce_messages(db_session, [in_batch], NOW)
+
+        assert [m.id for m in batch] == [newer.id]
+        assert newer.coalesced_count == 2
+
+    def test_ignores_messages_not_yet_due(self, db_session):
+        """Test that duplicates waiting for a retry are left alone"""
+        due = _message(db_session, "key", timedelta(minutes=3))
+        waiting = _message(db_session, "key", timedelta(minutes=1), next_attempt_at=NOW + timedelta(minutes=5))
+
+        batch = coalesce_messages(db_session, [due], NOW)
+
+        assert [m.id for m in batch] == [due.id]
+        assert _statuses(db_session)[waiting.id] == "pending"
+
+    def test_keys_are_scoped_by_topic(self, db_session):
+        """Test that the same key on different topics is not coalesced"""
+        security = _message(db_session, "health_emergency_1", timedelta(minutes=2), topic="event.security")
+        transport = _message(db_session, "health_emergency_1", timedelta(minutes=1), topic="event.transport")
+
+        batch = coalesce_messages(db_session, [security, transport], NOW)
+
+        assert [m.id for m in batch] == [security.id, transport.id]
+
+    def test_messages_without_key_are_kept(self, db_session):
+        """Test that messages without a dedup key are never coalesced"""
+        first = _message(db_session, None, timedelta(minutes=2))
+        second = _message(db_session, None, timedelta(minutes=1))
+
+        assert coalesce_messages(db_session, [first, second], NOW) == [first, second]
+
+    def test_survivor_takes_most_urgent_priority(self, db_session):
+        """Test that the survivor inherits the highest priority of its group"""
+        urgent = _message(db_session, "key", timedelta(minutes=2), priority=Priority.HIGH)
+        latest = _message(db_session, "key", timedelta(minutes=1), priority=Priority.LOW)
+
+        coalesce_messages(db_session, [urgent, latest], NOW)
+
+        assert latest.priority == Priority.HIGH
+
+
+class TestOutgoingPayload:
+    """Tests for outgoing_payload function"""
+
+    def test_single_message_payload_is_unchanged(self):
+        """Test that uncoalesced messages are published as-is"""
+        msg = OutboxMessage(payload={"alert": "possible_risk"}, coalesced_count=1)
+
+        assert outgoing_payload(msg) == {"alert": "possible_risk"}
+
+    def test_coalesced_payload_carries_count(self):
+        """Test that coalesced messages are published with their count"""
+        msg = OutboxMessage(payload={"alert": "possible_risk"}, coalesced_count=4)
+
+        assert outgoing_payload(msg) == {"alert": "possible_risk", "coalesced_count": 4}
+
+
+class TestWorkerCoalescing:
+    """Tests for coalescing inside process_batch"""
+
+    @patch('app.infra.outbox.worker.publish')
+    def test_publishes_one_message_per_key(self, mock_publish, db_session):
+        """Test that a burst of duplicates is published once with the latest payload"""
+        for minutes in (5, 4, 3, 2, 1):
+            _message(db_session, "critical_energy_usage_downtown", timedelta(minutes=minutes), payload={"energy": 600 + minutes})
+
+        process_batch(db_session, now=NOW)
+
+        mock_publish.assert_called_once_with(
+            "event.security", {"energy": 601, "coalesced_count": 5}
+        )
+        assert fetch_due_messages(db_session, NOW) == []
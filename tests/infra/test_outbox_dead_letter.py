@@ -0,0 +1,131 @@
+"""
+Tests for outbox dead-lettering and replay
+"""
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.infra.outbox.dead_letter import (
+    count_dead_letters,
+    dead_letter_messages,
+    replay_dead_letters,
+)
+from app.infra.persistence.models.outbox import OutboxMessage
+from app.infra.persistence.models.outbox_dead_letter import OutboxDeadLetter
+
+
+NOW = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def _dead_letter(db_session, topic="event.security", dead_lettered_at=NOW):
+    dead = OutboxDeadLetter(
+        id=uuid.uuid4(),
+        topic=topic,
+        payload={"topic": topic},
+        attempts=5,
+        last_error="RuntimeError('sink down')",
+        created_at=dead_lettered_at - timedelta(minutes=5),
+        last_attempt_at=dead_lettered_at,
+        dead_lettered_at=dead_lettered_at,
+    )
+    db_session.add(dead)
+    db_session.commit()
+    return dead.id
+
+
+def _pending_ids(db_session):
+    return set(
+        db_session.execute(select(OutboxMessage.id).where(OutboxMessage.status == "pending")).scalars().all()
+    )
+
+
+def _dead_letter_ids(db_session):
+    return set(db_session.execute(select(OutboxDeadLetter.id)).scalars().all())
+
+
+class TestDeadLetterMessages:
+    """Tests for dead_letter_messages function"""
+
+    def test_moves_messages_to_dead_letter_table(self, db_session):
+        """Test that messages are copied to the dead-letter table and removed from the outbox"""
+        msg = OutboxMessage(topic="event.energy", payload={"energy": 600.0}, status="pending", attempts=5)
+        db_session.add(msg)
+        db_session.commit()
+        msg.last_error = "ValueError('bad')"
+
+        moved = dead_letter_messages(db_session, [msg.id], NOW)
+        db_session.commit()
+
+        assert moved == 1
+        assert _dead_letter_ids(db_session) == {msg.id}
+        assert db_session.execute(select(OutboxMessage)).scalars().all() == []
+        dead = db_session.get(OutboxDeadLetter, msg.id)
+        assert dead.payload == {"energy": 600.0}
+        assert dead.last_error == "ValueError('bad')"
+
+    def test_no_ids_is_a_noop(self, db_session):
+        """Test that an empty id list does nothing"""
+        assert dead_letter_messages(db_session, [], NOW) == 0
+
+
+class TestReplayDeadLetters:
+    """Tests for replay_dead_letters function"""
+
+    def test_replays_all_messages_as_pending(self, db_session):
+        """Test that replayed messages return to the outbox as fresh pending messages"""
+        dead_id = _dead_letter(db_session)
+
+        replayed = replay_dead_letters(db_session, now=NOW)
+
+        assert replayed == 1
+        assert _dead_letter_ids(db_session) == set()
+        msg = db_session.get(OutboxMessage, dead_id)
+        assert msg.status == "pending"
+        assert msg.attempts == 0
+        assert msg.last_error is None
+        assert msg.payload == {"topic": "event.security"}
+
+    def test_filters_by_topic(self, db_session):
+        """Test that only the requested topic is replayed"""
+        security = _dead_letter(db_session, topic="event.security")
+        transport = _dead_letter(db_session, topic="event.transport")
+
+        replay_dead_letters(db_session, topic="event.security", now=NOW)
+
+        assert _pending_ids(db_session) == {security}
+        assert _dead_letter_ids(db_session) == {transport}
+
+    def test_filters_by_time_range(self, db_session):
+        """Test that only messages dead-lettered inside the range are replayed"""
+        before = _dead_letter(db_session, dead_lettered_at=NOW - timedelta(hours=2))
+        inside = _dead_letter(db_session, dead_lettered_at=NOW - timedelta(minutes=30))
+        after = _dead_letter(db_session, dead_lettered_at=NOW + timedelta(hours=1))
+
+        replay_dead_letters(
+            db_session,
+            since=NOW - timedelta(hours=1),
+            until=NOW,
+            now=NOW,
+        )
+
+        assert _pending_ids(db_session) == {inside}
+        assert _dead_letter_ids(db_session) == {before, after}
+
+    def test_replays_in_chunks(self, db_session):
+        """Test that all matching messages are replayed across several chunks"""
+        ids = {_dead_letter(db_session) for _ in range(5)}
+
+        replayed = replay_dead_letters(db_session, chunk_size=2, now=NOW)
+
+        assert replayed == 5
+        assert _pending_ids(db_session) == ids
+
+    def test_count_dead_letters(self, db_session):
+        """Test counting matching dead-lettered messages"""
+        _dead_letter(db_session, topic="event.security")
+        _dead_letter(db_session, topic="event.transport")
+
+        assert count_dead_letters(db_session) == 2
+        assert count_dead_letters(db_session, topic="event.transport") == 1
@@ -0,0 +1,108 @@
+"""
+Tests for the post-commit outbox relay
+"""
+import pytest
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from app.infra.outbox.circuit_breaker import CircuitBreakerRegistry
+from app.infra.outbox.enqueue import enqueue_notification
+from app.infra.outbox.relay import OutboxRelay, relay_messages
+from app.infra.persistence.models.outbox import OutboxMessage
+
+
+def _committed_message(db_session, service="energy"):
+    msg = enqueue_notification(db_session, service, {"service": service}, delay=timedelta(seconds=5))
+    db_session.commit()
+    return msg.id
+
+
+class TestRelayMessages:
+    """Tests for relay_messages function"""
+
+    @patch('app.infra.outbox.relay.publish')
+    def test_publishes_and_marks_sent(self, mock_publish, db_session):
+        """Test that relayed messages are published and marked sent in bulk"""
+        ids = [_committed_message(db_session, "energy"), _committed_message(db_session, "health")]
+
+        sent = relay_messages(ids, session_factory=lambda: db_session)
+
+        assert sent == 2
+        assert mock_publish.call_count == 2
+        for msg_id in ids:
+            msg = db_session.get(OutboxMessage, msg_id)
+            assert msg.status == "sent"
+            assert msg.published_at is not None
+
+    @patch('app.infra.outbox.relay.publish')
+    def test_failed_publish_is_left_for_the_worker(self, mock_publish, db_session):
+        """Test that a failed relay leaves the message pending without consuming an attempt"""
+        mock_publish.side_effect = RuntimeError("sink down")
+        msg_id = _committed_message(db_session)
+
+        sent = relay_messages([msg_id], session_factory=lambda: db_session, breakers=None)
+
+        msg = db_session.get(OutboxMessage, msg_id)
+        assert sent == 0
+        assert msg.status == "pending"
+        assert msg.attempts == 0
+
+    @patch('app.infra.outbox.relay.publish')
+    def test_publishes_coalesced_count(self, mock_publish, db_session):
+        """Test that the relay sends the same payload the worker would"""
+        msg_id = _committed_message(db_session)
+        db_session.get(OutboxMessage, msg_id).coalesced_count = 3
+        db_session.commit()
+
+        relay_messages([msg_id], session_factory=lambda: db_session)
+
+        mock_publish.assert_called_once_with("event.energy", {"service": "energy", "coalesced_count": 3})
+
+    @patch('app.infra.outbox.relay.publish')
+    def test_open_breaker_leaves_messages_for_the_worker(self, mock_publish, db_session):
+        """Test that once a topic's breaker opens the relay stops publishing to it"""
+        mock_publish.side_effect = RuntimeError("sink down")
+        breakers = CircuitBreakerRegistry(failure_threshold=1)
+        first, second = _committed_message(db_session), _committed_message(db_session)
+
+        relay_messages([first], session_factory=lambda: db_session, breakers=breakers)
+        relay_messages([second], session_factory=lambda: db_session, breakers=breakers)
+
+        assert mock_publish.call_count == 1
+        assert db_session.get(OutboxMessage, second).status == "pending"
+
+    @patch('app.infra.outbox.relay.publish')
+    def test_skips_messages_already_sent(self, mock_publish, db_session):
+        """Test that messages delivered by the worker are not published twice"""
+        msg_id = _committed_message(db_session)
+        db_session.get(OutboxMessage, msg_id).status = "sent"
+        db_session.commit()
+
+        sent = relay_messages([msg_id], session_factory=lambda: db_session)
+
+        assert sent == 0
+        mock_publish.assert_not_called()
+
+
+class TestOutboxRelay:
+    """Tests for OutboxRelay"""
+
+    def test_flush_schedules_tracked_ids(self):
+        """Test that tracked ids are handed to the scheduler once"""
+        schedule = Mock()
+        relay = OutboxRelay(schedule)
+        relay.track("a")
+        relay.track("b")
+
+        relay.flush()
+        relay.flush()
+
+        schedule.assert_called_once_with(relay_messages, ["a", "b"])
+
+    def test_flush_without_messages_schedules_nothing(self):
+        """Test that ingests without notifications do not schedule a relay"""
+        schedule = Mock()
+
+        OutboxRelay(schedule).flush()
+
+        schedule.assert_not_called()
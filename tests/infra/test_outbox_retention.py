@@ -0,0 +1,122 @@
+"""
+Tests for outbox retention archiving
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.infra.outbox.retention import (
+    RetentionPolicy,
+    archive_expired_messages,
+    parse_topic_retention,
+)
+from app.infra.persistence.models.outbox import OutboxMessage
+from app.infra.persistence.models.outbox_archive import OutboxArchivedMessage
+
+
+def _message(db_session, topic, status, age):
+    now = datetime.now(timezone.utc)
+    msg = OutboxMessage(
+        topic=topic,
+        payload={"topic": topic},
+        status=status,
+        attempts=0,
+        next_attempt_at=now - age,
+        created_at=now - age,
+    )
+    db_session.add(msg)
+    db_session.commit()
+    return msg.id
+
+
+def _remaining_ids(db_session):
+    return set(db_session.execute(select(OutboxMessage.id)).scalars().all())
+
+
+def _archived_ids(db_session):
+    return set(db_session.execute(select(OutboxArchivedMessage.id)).scalars().all())
+
+
+class TestParseTopicRetention:
+    """Tests for parse_topic_retention function"""
+
+    def test_parses_overrides(self):
+        """Test that topic=days pairs are parsed into timedeltas"""
+        result = parse_topic_retention("event.transport=1, event.security=0.5")
+
+        assert result == {
+            "event.transport": timedelta(days=1),
+            "event.security": timedelta(hours=12),
+        }
+
+    def test_empty_spec(self):
+        """Test that an empty spec yields no overrides"""
+        assert parse_topic_retention("") == {}
+
+    def test_invalid_spec_raises(self):
+        """Test that entries without '=' are rejected"""
+        with pytest.raises(ValueError):
+            parse_topic_retention("event.transport")
+
+
+class TestArchiveExpiredMessages:
+    """Tests for archive_expired_messages function"""
+
+    def test_moves_expired_terminal_messages(self, db_session):
+        """Test that old sent and failed messages are moved to the archive"""
+        sent = _message(db_session, "event.energy", "sent", timedelta(days=10))
+        failed = _message(db_session, "event.energy", "failed", timedelta(days=10))
+        recent = _message(db_session, "event.energy", "sent", timedelta(hours=1))
+
+        archived = archive_expired_messages(db_session, RetentionPolicy(default=timedelta(days=7)))
+
+        assert archived == 2
+        assert _remaining_ids(db_session) == {recent}
+        assert _archived_ids(db_session) == {sent, failed}
+
+    def test_never_archives_pending_messages(self, db_session):
+        """Test that pending messages stay in the hot table regardless of age"""
+        pending = _message(db_session, "event.energy", "pending", timedelta(days=30))
+
+        archive_expired_messages(db_session, RetentionPolicy(default=timedelta(days=7)))
+
+        assert _remaining_ids(db_session) == {pending}
+
+    def test_applies_per_topic_retention(self, db_session):
+        """Test that topic overrides replace the default retention"""
+        transport = _message(db_session, "event.transport", "sent", timedelta(days=2))
+        security = _message(db_session, "event.security", "sent", timedelta(days=2))
+        policy = RetentionPolicy(
+            default=timedelta(days=7),
+            per_topic={"event.transport": timedelta(days=1)},
+        )
+
+        archive_expired_messages(db_session, policy)
+
+        assert _archived_ids(db_session) == {transport}
+        assert _remaining_ids(db_session) == {security}
+
+    def test_archives_in_chunks(self, db_session):
+        """Test that all expired rows are archived across several chunks"""
+        ids = {_message(db_session, "event.energy", "sent", timedelta(days=10)) for _ in range(7)}
+
+        archived = archive_expired_messages(
+            db_session, RetentionPolicy(default=timedelta(days=7)), chunk_size=3
+        )
+
+        assert archived == 7
+        assert _archived_ids(db_session) == ids
+        assert _remaining_ids(db_session) == set()
+
+    def test_archive_keeps_message_contents(self, db_session):
+        """Test that archived rows keep the original columns"""
+        msg_id = _message(db_session, "event.energy", "sent", timedelta(days=10))
+
+        archive_expired_messages(db_session, RetentionPolicy(default=timedelta(days=7)))
+
+        archived = db_session.get(OutboxArchivedMessage, msg_id)
+        assert archived.topic == "event.energy"
+        assert archived.payload == {"topic": "event.energy"}
+        assert archived.status == "sent"
+        assert archived.archived_at is not None
@@ -0,0 +1,183 @@
+"""
+Tests for the multi-process outbox supervisor and worker sharding
+"""
+import uuid
+import pytest
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+
+from app.infra.outbox.supervisor import Supervisor, build_shards
+from app.infra.outbox.worker import WorkerShard, fetch_due_messages, process_batch
+from app.infra.persistence.models.outbox import OutboxMessage
+
+
+NOW = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def _message(db_session, topic, message_id=None):
+    msg = OutboxMessage(
+        id=message_id or uuid.uuid4(),
+        topic=topic,
+        payload={"topic": topic},
+        status="pending",
+        attempts=0,
+        next_attempt_at=NOW - timedelta(seconds=1),
+        created_at=NOW - timedelta(seconds=1),
+    )
+    db_session.add(msg)
+    db_session.commit()
+    return msg
+
+
+class FakeProcess:
+    def __init__(self, shard, stubborn=False):
+        self.shard = shard
+        self.name = f"outbox-worker-{shard.index}"
+        self.alive = True
+        self.stubborn = stubborn
+        self.exitcode = None
+        self.terminated = False
+        self.killed = False
+
+    def is_alive(self):
+        return self.alive
+
+    def terminate(self):
+        self.terminated = True
+        if not self.stubborn:
+            self.alive = False
+            self.exitcode = 0
+
+    def kill(self):
+        self.killed = True
+        self.alive = False
+
+    def join(self, timeout=None):
+        pass
+
+
+class TestBuildShards:
+    """Tests for build_shards"""
+
+    def test_hash_shards_by_worker_count(self):
+        """Test that without topic groups each worker gets one hash partition"""
+        shards = build_shards(3)
+
+        assert shards == [WorkerShard(0, 3), WorkerShard(1, 3), WorkerShard(2, 3)]
+
+    def test_topic_groups_get_one_worker_each(self):
+        """Test that each topic group gets a worker and the remaining workers share the other topics"""
+        shards = build_shards(4, "event.transport; event.security, event.health")
+
+        listed = ("event.transport", "event.security", "event.health")
+        assert shards == [
+            WorkerShard(0, 1, ("event.transport",)),
+            WorkerShard(1, 1, ("event.security", "event.health")),
+            WorkerShard(2, 2, excluded_topics=listed, partition=0),
+            WorkerShard(3, 2, excluded_topics=listed, partition=1),
+        ]
+
+    def test_topic_groups_always_have_a_catch_all_worker(self):
+        """Test that unlisted topics get a worker even when every worker has a group"""
+        shards = build_shards(1, "event.transport;event.security")
+
+        assert len(shards) == 3
+        assert shards[-1] == WorkerShard(2, 1, excluded_topics=("event.transport", "event.security"), partition=0)
+
+    def test_rejects_invalid_worker_count(self):
+        """Test that a worker count outside the hash range is rejected"""
+        with pytest.raises(ValueError):
+            build_shards(0)
+
+
+class TestWorkerShard:
+    """Tests for WorkerShard filtering in fetch_due_messages"""
+
+    def test_hash_shards_partition_messages(self, db_session):
+        """Test that every message belongs to exactly one hash shard"""
+        ids = [uuid.UUID(f"{prefix:02x}" + "0" * 30) for prefix in (0x00, 0x01, 0x02, 0x03, 0xff)]
+        for message_id in ids:
+            _message(db_session, "event.energy", message_id)
+
+        shards = build_shards(2)
+        fetched = [
+            {msg.id for msg in fetch_due_messages(db_session, NOW, limit=10, shard=shard)}
+            for shard in shards
+        ]
+
+        assert fetched[0] == {ids[0], ids[2]}
+        assert fetched[1] == {ids[1], ids[3], ids[4]}
+
+    def test_topic_shard_only_fetches_its_topics(self, db_session):
+        """Test that a topic shard ignores messages for other topics"""
+        _message(db_session, "event.energy")
+        security = _message(db_session, "event.security")
+
+        shard = WorkerShard(index=0, count=2, topics=("event.security",))
+        msgs = fetch_due_messages(db_session, NOW, limit=10, shard=shard)
+
+        assert [msg.id for msg in msgs] == [security.id]
+
+    @patch('app.infra.outbox.worker.publish')
+    def test_unlisted_topic_is_published_by_catch_all_shard(self, mock_publish, db_session):
+        """Test that a topic missing from every group is published by a catch-all worker"""
+        _message(db_session, "event.transport")
+        parking = _message(db_session, "event.parking")
+
+        for shard in build_shards(3, "event.transport")[1:]:
+            process_batch(db_session, now=NOW, shard=shard)
+
+        published = [call.args[0] for call in mock_publish.call_args_list]
+        assert published == ["event.parking"]
+        db_session.refresh(parking)
+        assert parking.status == "sent"
+
+
+class TestSupervisor:
+    """Tests for Supervisor"""
+
+    def test_restarts_crashed_worker(self):
+        """Test that a worker that exited is replaced with a new process for the same shard"""
+        spawned = []
+
+        def spawn(shard):
+            spawned.append(FakeProcess(shard))
+            return spawned[-1]
+
+        supervisor = Supervisor(build_shards(2), spawn=spawn)
+        supervisor.start()
+        spawned[1].alive = False
+        spawned[1].exitcode = 1
+        supervisor.check_children()
+
+        assert len(spawned) == 3
+        assert spawned[2].shard == WorkerShard(1, 2)
+        assert supervisor.restarts == 1
+
+    def test_shutdown_terminates_workers_without_restarting(self):
+        """Test that shutdown sends SIGTERM to every worker and does not restart them"""
+        spawned = []
+
+        def spawn(shard):
+            spawned.append(FakeProcess(shard))
+            return spawned[-1]
+
+        supervisor = Supervisor(build_shards(2), spawn=spawn)
+        supervisor.start()
+        supervisor.shutdown()
+        supervisor.check_children()
+
+        assert len(spawned) == 2
+        assert all(process.terminated and not process.killed for process in spawned)
+
+    def test_shutdown_kills_workers_past_timeout(self):
+        """Test that workers still running after the shutdown timeout are killed"""
+        supervisor = Supervisor(
+            build_shards(1),
+            spawn=lambda shard: FakeProcess(shard, stubborn=True),
+            shutdown_timeout=0,
+        )
+        supervisor.start()
+        supervisor.shutdown()
+
+        assert supervisor._children[0].killed
@@ -0,0 +1,108 @@
+"""
+Tests for events partition management
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+from app.infra.persistence.partitions import (
+    Partition,
+    PartitionPolicy,
+    maintain_partitions,
+    partition_name,
+    plan_partitions,
+)
+
+
+NOW = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)  # a Thursday
+
+
+def _day(day):
+    return datetime(2026, 1, day, tzinfo=timezone.utc)
+
+
+class TestPlanPartitions:
+    """Tests for plan_partitions function"""
+
+    def test_creates_partitions_up_to_premake_horizon(self):
+        """Test that missing daily partitions are planned from the newest existing one"""
+        existing = [Partition("events_legacy", None, _day(14)), Partition("events_p20260114", _day(14), _day(15))]
+
+        to_create, to_expire = plan_partitions(existing, PartitionPolicy(premake=2), NOW)
+
+        assert [p.name for p in to_create] == ["events_p20260115", "events_p20260116", "events_p20260117"]
+        assert to_create[0].start == _day(15)
+        assert to_create[-1].end == _day(18)
+        assert to_expire == []
+
+    def test_nothing_to_create_when_horizon_is_covered(self):
+        """Test that existing future partitions are left alone"""
+        existing = [Partition("events_p20260115", _day(15), _day(20))]
+
+        to_create, _ = plan_partitions(existing, PartitionPolicy(premake=2), NOW)
+
+        assert to_create == []
+
+    def test_weekly_partitions_bridge_from_daily_boundary(self):
+        """Test that switching to weekly partitions mid-week does not overlap existing ranges"""
+        existing = [Partition("events_p20260115", _day(15), _day(16))]
+
+        to_create, _ = plan_partitions(existing, PartitionPolicy(interval="week", premake=1), NOW)
+
+        assert [(p.start, p.end) for p in to_create] == [(_day(16), _day(19)), (_day(19), _day(26))]
+
+    def test_expires_partitions_past_retention(self):
+        """Test that only partitions entirely older than the retention are expired"""
+        existing = [
+            Partition("events_legacy", None, _day(10)),
+            Partition("events_p20260110", _day(10), _day(11)),
+            Partition("events_p20260111", _day(11), _day(12)),
+        ]
+        policy = PartitionPolicy(premake=0, retention=timedelta(days=4, hours=12))
+
+        _, to_expire = plan_partitions(existing, policy, NOW)
+
+        assert [p.name for p in to_expire] == ["events_legacy", "events_p20260110"]
+
+    def test_invalid_policy_rejected(self):
+        """Test that unknown intervals and expire actions are rejected"""
+        with pytest.raises(ValueError):
+            PartitionPolicy(interval="month")
+        with pytest.raises(ValueError):
+            PartitionPolicy(expire_action="archive")
+
+
+class TestMaintainPartitions:
+    """Tests for maintain_partitions DDL"""
+
+    def _run(self, stray):
+        connection = Mock()
+        connection.exec_driver_sql.return_value.scalar.return_value = stray
+        db = Mock()
+        db.connection.return_value = connection
+        existing = [Partition("events_p20260115", _day(15), _day(16))]
+        with patch("app.infra.persistence.partitions.list_partitions", return_value=existing):
+            maintain_partitions(db, PartitionPolicy(premake=1), NOW)
+        return [call.args[0] for call in connection.exec_driver_sql.call_args_list]
+
+    def test_creates_default_partition(self):
+        """Test that a default partition is ensured so inserts never miss a partition"""
+        statements = self._run(stray=False)
+
+        assert statements[0] == 'CREATE TABLE IF NOT EXISTS "events_default" PARTITION OF events DEFAULT'
+        assert not any("DETACH" in sql for sql in statements)
+
+    def test_moves_rows_out_of_default_partition(self):
+        """Test that rows caught by the default partition are moved into the new partition"""
+        statements = self._run(stray=True)
+
+        detach = statements.index('ALTER TABLE events DETACH PARTITION "events_default"')
+        assert statements[detach + 1].startswith('CREATE TABLE IF NOT EXISTS "events_p20260116"')
+        assert statements[detach + 2].startswith('WITH moved AS (DELETE FROM "events_default"')
+        assert statements[detach + 3] == 'ALTER TABLE events ATTACH PARTITION "events_default" DEFAULT'
+
+
+def test_partition_name_uses_start_date():
+    """Test that partitions are named after their start date"""
+    assert partition_name(_day(12), "week") == "events_w20260112"
+    assert partition_name(_day(15), "day") == "events_p20260115"
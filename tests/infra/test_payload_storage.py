@@ -0,0 +1,61 @@
+"""
+Tests for compact event payload storage
+"""
+import pytest
+from unittest.mock import patch
+
+from app.infra.persistence.payload_storage import compact_payloads
+
+
+class TestCompactPayloads:
+    """Tests for compact_payloads function"""
+
+    def test_drops_raw_payload_when_normalization_only_added_nulls(self):
+        """Test that a valid payload is stored once, without the schema's null defaults"""
+        raw = {"energy": 600.0, "neighborhood": "downtown"}
+        normalized = {"energy": 600.0, "neighborhood": "downtown", "unused": None}
+
+        assert compact_payloads(raw, normalized) == (None, raw)
+
+    def test_keeps_raw_payload_when_values_were_coerced(self):
+        """Test that both copies are kept when normalization changed a value"""
+        raw = {"patient_id": "123", "alert": "emergency"}
+        normalized = {"patient_id": 123, "alert": "emergency", "location": None}
+
+        payload, normalized_payload = compact_payloads(raw, normalized)
+
+        assert payload == raw
+        assert normalized_payload == {"patient_id": 123, "alert": "emergency"}
+
+    def test_int_and_float_are_not_treated_as_equal(self):
+        """Test that 600 and 600.0 count as different so the raw payload round-trips exactly"""
+        payload, _ = compact_payloads({"energy": 600}, {"energy": 600.0})
+
+        assert payload == {"energy": 600}
+
+    def test_explicit_nulls_in_raw_payload_are_kept(self):
+        """Test that a null sent by the client is not dropped"""
+        raw = {"alert": None}
+
+        assert compact_payloads(raw, {"alert": None, "camera_trigger": None}) == (None, raw)
+
+    def test_key_order_does_not_matter(self):
+        """Test that a reordered but equal payload is stored once"""
+        assert compact_payloads({"b": 1, "a": 2}, {"a": 2, "b": 1})[0] is None
+
+    def test_integer_beyond_64_bits(self):
+        """Test that payloads orjson cannot encode are still compared"""
+        raw = {"reading": 2**70}
+
+        assert compact_payloads(raw, {"reading": 2**70, "unit": None}) == (None, raw)
+        assert compact_payloads(raw, {"reading": 2**70 + 1})[0] == raw
+
+    def test_events_without_normalized_payload_are_unchanged(self):
+        """Test that derived events keep their payload"""
+        assert compact_payloads({"alert": "x"}, None) == ({"alert": "x"}, None)
+
+    def test_disabled(self):
+        """Test that both copies are stored as-is when compact storage is off"""
+        normalized = {"energy": 1.0, "neighborhood": None}
+        with patch("app.infra.persistence.payload_storage.COMPACT_STORAGE", False):
+            assert compact_payloads({"energy": 1.0}, normalized) == ({"energy": 1.0}, normalized)
@@ -2,8 +2,9 @@
 Tests for repository classes
 """
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
+from app.infra.persistence.repositories.entity_state_repo import EntityStateRepository
 from app.infra.persistence.repositories.event_repo import EventRepository
 from app.infra.persistence.repositories.outbox_repo import OutboxRepository
 from app.infra.persistence.models.event import Event
@@ -70,3 +71,81 @@ class TestOutboxRepository:
         assert msg in db_session
         # Verify flush was called (message should have ID)
         assert msg.id is not None
+
+
+class TestEventRepositoryQueries:
+    """Tests for EventRepository read queries"""
+
+    def test_find_with_derived_loads_base_and_children(self, db_session):
+        """Test that a dedupe lookup returns the base event and its derived events"""
+        base = Event(service="energy", timestamp=datetime.now(timezone.utc), payload={}, deduplication_key="k")
+        db_session.add(base)
+        db_session.flush()
+        derived = Event(service="security", timestamp=datetime.now(timezone.utc), payload={},
+                        source_event_id=base.id, deduplication_key="k")
+        other = Event(service="energy", timestamp=datetime.now(timezone.utc), payload={}, deduplication_key="other")
+        db_session.add_all([derived, other])
+        db_session.commit()
+
+        found, children = EventRepository(db_session).find_with_derived("k")
+
+        assert found.id == base.id
+        assert [child.id for child in children] == [derived.id]
+
+    def test_find_with_derived_missing_key(self, db_session):
+        """Test that an unknown dedupe key finds nothing"""
+        assert EventRepository(db_session).find_with_derived("missing") == (None, [])
+
+    def test_lineage_walks_all_levels(self, db_session):
+        """Test that the recursive query returns the whole tree with depths"""
+        root = Event(service="health", timestamp=datetime.now(timezone.utc), payload={"alert": "emergency"})
+        db_session.add(root)
+        db_session.flush()
+        child = Event(service="transport", timestamp=datetime.now(timezone.utc), payload={}, source_event_id=root.id)
+        db_session.add(child)
+        db_session.flush()
+        grandchild = Event(service="security", timestamp=datetime.now(timezone.utc), payload={}, source_event_id=child.id)
+        unrelated = Event(service="energy", timestamp=datetime.now(timezone.utc), payload={})
+        db_session.add_all([grandchild, unrelated])
+        db_session.commit()
+
+        rows = EventRepository(db_session).lineage(root.id, max_depth=10)
+
+        assert [(row.id, row.depth) for row in rows] == [(root.id, 0), (child.id, 1), (grandchild.id, 2)]
+        assert rows[0].payload == {"alert": "emergency"}
+
+    def test_lineage_respects_max_depth(self, db_session):
+        """Test that levels below max_depth are not returned"""
+        root = Event(service="health", timestamp=datetime.now(timezone.utc), payload={})
+        db_session.add(root)
+        db_session.flush()
+        db_session.add(Event(service="transport", timestamp=datetime.now(timezone.utc), payload={}, source_event_id=root.id))
+        db_session.commit()
+
+        rows = EventRepository(db_session).lineage(root.id, max_depth=0)
+
+        assert [row.id for row in rows] == [root.id]
+
+
+class TestEntityStateRepository:
+    """Tests for EntityStateRepository"""
+
+    def test_older_state_does_not_overwrite_newer(self, db_session):
+        """Test that an out-of-order reading leaves the newer state in place"""
+        repo = EntityStateRepository(db_session)
+        now = datetime.now(timezone.utc)
+        repo.upsert("transport", "7", {"lat": 2.0}, now)
+        repo.upsert("transport", "7", {"lat": 1.0}, now - timedelta(seconds=10))
+        db_session.commit()
+
+        assert repo.get("transport", "7").payload == {"lat": 2.0}
+
+    def test_newer_state_overwrites(self, db_session):
+        """Test that a newer reading replaces the stored state"""
+        repo = EntityStateRepository(db_session)
+        now = datetime.now(timezone.utc)
+        repo.upsert("transport", "7", {"lat": 1.0}, now)
+        repo.upsert("transport", "7", {"lat": 2.0}, now + timedelta(seconds=10))
+        db_session.commit()
+
+        assert repo.get("transport", "7").payload == {"lat": 2.0}